@@ -0,0 +1,148 @@
+"""Logging benchmark of pyDocStr.
+
+Document a synthetic package (with the static analysis) with the logger at the level 'warning', then at the level 'debug'
+with the logs written by the logging calls and with the logs written by a listener thread (`pyDocStr.set_queue_logging`).
+The logs are written in the null device (a buffered stream, like a file or a pipe), then in a slow stream which blocks
+each write like a terminal. The overhead of the debug level and the cost by record of the queue in the slow stream
+compared to the records written by the logging calls are compared to the thresholds of 'thresholds.json'
+(in the null device, the queue costs more: the command line only uses it for a terminal).
+
+usage: python benchmarks/bench_logging.py [--modules MODULES] [--repeat REPEAT] [--output OUTPUT]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+from bench_scaling import ROOT_PATH, THRESHOLDS_PATH, create_package
+
+MODES = ['warning', 'debug', 'debug-queue', 'debug-slow', 'debug-queue-slow']
+SLOW_WRITE = 50e-6  # the time of a write in the slow stream (in seconds), the order of a write in a terminal
+
+
+class _SlowStream:
+	# a stream which blocks each write (the GIL is released like in a write to a terminal)
+	def write(self, text: str):
+		time.sleep(SLOW_WRITE)
+
+	def flush(self):
+		pass
+
+
+class _CountFilter(logging.Filter):
+	# count the records which pass the level of logger
+	def __init__(self):
+		super().__init__()
+		self.count = 0
+
+	def filter(self, record):
+		self.count += 1
+		return True
+
+
+def run_mode(mode: str, package_path: str, output_path: str) -> tuple:
+	"""Document the package with a logging mode.
+
+	Parameters
+	----------
+	mode : str
+		'warning', 'debug', 'debug-queue', 'debug-slow' or 'debug-queue-slow'
+	package_path : str
+		The path of package
+	output_path : str
+		The folder where the package documented is written (removed before the run)
+
+	Returns
+	-------
+	duration : float
+		The duration of the documentation, in seconds
+	nb_records : int
+		The number of records written
+	"""
+	import pyDocStr
+
+	shutil.rmtree(output_path, ignore_errors=True)
+	pyDocStr.set_level_logger('warning' if mode == 'warning' else 'debug')
+	counter = _CountFilter()
+	pyDocStr._logger.addFilter(counter)
+	null_stream = pyDocStr.pyDocStr._handler.setStream(_SlowStream()) if mode.endswith('-slow') else None
+	if 'queue' in mode:
+		pyDocStr.set_queue_logging()
+	try:
+		start = time.perf_counter()
+		pyDocStr.create_docstrings_from_package(package_path, new_package_path=output_path, subpackages=True, static=True)
+		if 'queue' in mode:
+			pyDocStr.set_queue_logging(False)  # the records of queue are written
+		duration = time.perf_counter() - start
+	finally:
+		pyDocStr.set_queue_logging(False)
+		pyDocStr._logger.removeFilter(counter)
+		if null_stream is not None:
+			pyDocStr.pyDocStr._handler.setStream(null_stream)
+	return duration, counter.count
+
+
+def create_parser():
+	parser = argparse.ArgumentParser(description="Logging benchmark of pyDocStr.")
+	parser.add_argument('--modules', default=500, type=int,
+						help="The number of modules of the synthetic package.")
+	parser.add_argument('--repeat', default=3, type=int,
+						help="The number of runs of each mode (the fastest run is kept).")
+	parser.add_argument('--output', default=None, type=str,
+						help="path of a json file where the results are saved.")
+	return parser
+
+
+if __name__ == "__main__":
+	args = create_parser().parse_args()
+	sys.path.insert(0, ROOT_PATH)
+	import pyDocStr
+
+	with open(THRESHOLDS_PATH, 'r') as f:
+		thresholds = json.load(f)['logging']
+
+	folder = tempfile.mkdtemp(prefix='pydocstr_bench_')
+	null_stream = open(os.devnull, 'w')
+	stream = pyDocStr.pyDocStr._handler.setStream(null_stream)
+	results = {}
+	try:
+		name, _, _ = create_package(folder, args.modules)
+		for _ in range(args.repeat):  # the modes are interleaved, so a slow period of the machine doesn't favour a mode
+			for mode in MODES:
+				duration, nb_records = run_mode(mode, os.path.join(folder, name), os.path.join(folder, 'output'))
+				result = results.setdefault(mode, {'duration': duration, 'records': nb_records})
+				result['duration'] = min(result['duration'], duration)
+	finally:
+		pyDocStr.pyDocStr._handler.setStream(stream)
+		null_stream.close()
+		shutil.rmtree(folder, ignore_errors=True)
+
+	failures = []
+	base = results['warning']['duration']
+	for mode, result in results.items():
+		result['overhead'] = result['duration'] / base - 1
+		extra_records = result['records'] - results['warning']['records']
+		result['us_per_record'] = (result['duration'] - base) / extra_records * 1e6 if extra_records > 0 else None
+		print(f"{mode:>16}: {result['duration']:7.3f} s | {result['records']:7} records | overhead {result['overhead']:6.1%}"
+				+ (f" | {result['us_per_record']:6.1f} us/record" if result['us_per_record'] is not None else ""))
+	if results['debug']['overhead'] > thresholds['max_debug_overhead']:
+		failures.append(f"logging: the overhead of the debug level is {results['debug']['overhead']:.1%} > {thresholds['max_debug_overhead']:.0%}")
+	# the cost by record of the queue compared to the records written by the logging calls in the same stream
+	for direct, queue in (('debug', 'debug-queue'), ('debug-slow', 'debug-queue-slow')):
+		results[queue]['ratio_to_direct'] = results[queue]['us_per_record'] / results[direct]['us_per_record']
+		print(f"{queue:>16}: {results[queue]['ratio_to_direct']:.2f} x the cost by record of '{direct}'")
+	if results['debug-queue-slow']['ratio_to_direct'] > thresholds['max_queue_ratio']:
+		failures.append(f"logging: a record of 'debug-queue-slow' costs {results['debug-queue-slow']['ratio_to_direct']:.2f} x "
+						f"a record of 'debug-slow' > {thresholds['max_queue_ratio']}")
+
+	if args.output is not None:
+		with open(args.output, 'w') as f:
+			json.dump(results, f, indent=2)
+
+	for failure in failures:
+		print(f"FAIL: {failure}")
+	sys.exit(1 if failures else 0)
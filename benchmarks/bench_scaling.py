@@ -0,0 +1,329 @@
+"""Scaling benchmark of pyDocStr.
+
+Run `create_docstrings_from_package` on synthetic packages (10, 100, 1k and 10k modules)
+and the stages of `create_docstrings_from_module` on single files (1k, 10k and 100k lines).
+The throughput (symbols/sec, MB/sec), the peak memory and the scaling exponent of each stage
+are compared to the thresholds of 'thresholds.json'.
+
+A scaling exponent is computed between the two largest sizes: log(t2 / t1) / log(n2 / n1).
+It's close to 1 for a linear stage and close to 2 for a quadratic stage. The stages without side effects (render, positions,
+write, remove_decorators) are timed with the best of several calls, one call is too noisy to compare the exponents.
+
+usage: python benchmarks/bench_scaling.py [--quick] [--cases {package,file} ...] [--output OUTPUT]
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+try:
+	import resource
+except ImportError:  # Windows
+	resource = None
+	import tracemalloc
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thresholds.json')
+
+SIZES = {
+	'package': [10, 100, 1000, 10000],  # number of modules
+	'file': [1000, 10000, 100000],  # number of lines
+}
+QUICK_SIZES = {
+	'package': [10, 100, 1000],
+	'file': [1000, 10000, 30000],
+}
+MIN_TIME_EXPONENT = 0.05  # the exponent is not checked for a stage faster than this time (in seconds)
+REPEATS = 5  # the stages without side effects are timed with the best of REPEATS calls (one call is too noisy for the exponents)
+
+FUNCTION_TEMPLATE = '''
+@to_document(description="Function {i}.")
+def function_{i}(a: int, b: Dict[str, List[int]], c: str = "c") -> List[int]:
+	result = [a]
+	for value in b.get(c, []):
+		result.append(value)
+	return result
+
+'''
+CLASS_TEMPLATE = '''
+@to_document(description="Class {i}.")
+class Class{i}:
+	attribute = {i}
+
+	@to_document(description="Method of class {i}.")
+	def method_{i}(self, a: int, b: Tuple[int, int] = (0, 0)) -> int:
+		return a + b[0]
+
+'''
+HEADER = 'from typing import Dict, List, Tuple\n\nfrom pyDocStr import to_document\n\n'
+FUNCTIONS_BY_MODULE = 4
+
+
+def _module_code(nb_functions: int) -> str:
+	# return the code of a synthetic module and its number of symbols to document
+	code = [HEADER]
+	for i in range(nb_functions):
+		code.append(FUNCTION_TEMPLATE.format(i=i))
+	code.append(CLASS_TEMPLATE.format(i=0))
+	return ''.join(code)
+
+
+def create_package(folder: str, nb_modules: int) -> tuple:
+	"""Create a synthetic package with 'nb_modules' modules in subpackages of 100 modules.
+
+	Parameters
+	----------
+	folder : str
+		The folder where the package is created
+	nb_modules : int
+		The number of modules
+
+	Returns
+	-------
+	name : str
+		The name of the package
+	nb_symbols : int
+		The number of symbols to document
+	size : int
+		The size of python files in bytes
+	"""
+	name = f'bench_package_{nb_modules}'
+	package_path = os.path.join(folder, name)
+	module_code = _module_code(FUNCTIONS_BY_MODULE)
+	subpackages = [list(range(start, min(start + 100, nb_modules))) for start in range(0, nb_modules, 100)]
+	size = 0
+	for index, modules in enumerate(subpackages):
+		subpackage_path = os.path.join(package_path, f'sub_{index}')
+		os.makedirs(subpackage_path)
+		for module in modules:
+			with open(os.path.join(subpackage_path, f'module_{module}.py'), 'w') as f:
+				size += f.write(module_code)
+		with open(os.path.join(subpackage_path, '__init__.py'), 'w') as f:
+			size += f.write(''.join(f'from . import module_{module}\n' for module in modules))
+	with open(os.path.join(package_path, '__init__.py'), 'w') as f:
+		size += f.write(''.join(f'from . import sub_{index}\n' for index in range(len(subpackages))))
+	return name, nb_modules * (FUNCTIONS_BY_MODULE + 2), size
+
+
+def create_file(folder: str, nb_lines: int) -> tuple:
+	"""Create a synthetic module with about 'nb_lines' lines.
+
+	Parameters
+	----------
+	folder : str
+		The folder where the module is created
+	nb_lines : int
+		The number of lines
+
+	Returns
+	-------
+	path : str
+		The path of module
+	nb_symbols : int
+		The number of symbols to document
+	size : int
+		The size of the file in bytes
+	"""
+	nb_functions = nb_lines // FUNCTION_TEMPLATE.count('\n')
+	path = os.path.join(folder, f'bench_file_{nb_lines}.py')
+	with open(path, 'w') as f:
+		size = f.write(_module_code(nb_functions))
+	return path, nb_functions + 2, size
+
+
+def _timer(stages: dict, name: str, func, *args, repeats: int = 1, **kwargs):
+	# call func and add its duration in stages, the best duration of 'repeats' calls (for a function without side effects)
+	best = None
+	for _ in range(repeats):
+		start = time.perf_counter()
+		result = func(*args, **kwargs)
+		duration = time.perf_counter() - start
+		best = duration if best is None else min(best, duration)
+	stages[name] = stages.get(name, 0.) + best
+	return result
+
+
+def run_case(case: str, size: int) -> dict:
+	"""Run a case of benchmark in the current process.
+
+	Parameters
+	----------
+	case : str
+		The case to run: 'package' or 'file'
+	size : int
+		The number of modules for 'package' or the number of lines for 'file'
+
+	Returns
+	-------
+	result : dict
+		The durations of stages (in seconds), the number of symbols, the size (in bytes) and the peak memory (in MB).
+		The peak memory is the peak resident set size of the process (or the peak of tracemalloc on Windows).
+	"""
+	sys.path.insert(0, ROOT_PATH)
+	import pyDocStr
+	from pyDocStr.pyDocStr import build_docstrings
+	from inspect import getsource
+
+	pyDocStr.set_level_logger('error')
+	folder = tempfile.mkdtemp(prefix='pydocstr_bench_')
+	stages = {}
+	try:
+		if resource is None:
+			tracemalloc.start()
+		if case == 'package':
+			name, nb_symbols, nb_bytes = create_package(folder, size)
+			sys.path.insert(0, folder)
+			package = _timer(stages, 'import', __import__, name)
+			_timer(stages, 'document', pyDocStr.create_docstrings_from_package, package,
+					new_package_path=os.path.join(folder, 'output'), subpackages=True)
+		else:
+			path, nb_symbols, nb_bytes = create_file(folder, size)
+			formatter = pyDocStr.get_formatter('numpy')
+			_, module = _timer(stages, 'import', build_docstrings._safe_import_module, path)
+			list_func, list_class = _timer(stages, 'members', build_docstrings._get_members_to_document, module)
+			source_code = _timer(stages, 'source', getsource, module)
+			methods = [method for class_ in list_class for method in class_.methods_to_document]
+			_timer(stages, 'render', build_docstrings.build_docstrings, list_func + list_class + methods, formatter, repeats=REPEATS)
+
+			def find_positions():
+				build_docstrings._scanner._last_scanner = None  # each call scans the source code (the scanner of last source is reused)
+				return [build_docstrings.get_function_positions(func.name, source_code) for func in list_func + methods]
+			positions = _timer(stages, 'positions', find_positions, repeats=REPEATS)
+			docstrings = [(build_docstrings.get_docstring_start(pos[1], source_code), '"""Docstring."""\n') for pos in positions]
+			new_source_code = _timer(stages, 'write', build_docstrings.write_docstrings, docstrings, source_code, repeats=REPEATS)
+			_timer(stages, 'remove_decorators', build_docstrings._remove_decorators, new_source_code, repeats=REPEATS)
+		if resource is None:
+			peak = tracemalloc.get_traced_memory()[1] / 2**20
+			tracemalloc.stop()
+		else:
+			peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == 'darwin' else 2**10)
+	finally:
+		shutil.rmtree(folder, ignore_errors=True)
+
+	total = sum(stages.values())
+	return {
+		'case': case,
+		'size': size,
+		'stages': stages,
+		'total': total,
+		'symbols': nb_symbols,
+		'bytes': nb_bytes,
+		'symbols_per_sec': nb_symbols / total,
+		'mb_per_sec': nb_bytes / 2**20 / total,
+		'peak_memory_mb': peak,
+	}
+
+
+def run_case_subprocess(case: str, size: int) -> dict:
+	# run a case in a new interpreter to not share imported modules and memory between cases
+	output = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-case', case, str(size)],
+							check=True, stdout=subprocess.PIPE, text=True).stdout
+	return json.loads(output.strip().splitlines()[-1])
+
+
+def scaling_exponent(small: float, large: float, small_size: int, large_size: int) -> float:
+	"""Return the scaling exponent between two durations: 1 for a linear stage, 2 for a quadratic stage.
+
+	Parameters
+	----------
+	small : float
+		The duration for the smallest size
+	large : float
+		The duration for the largest size
+	small_size : int
+		The smallest size
+	large_size : int
+		The largest size
+
+	Returns
+	-------
+	exponent : float
+		The exponent, None if the duration for the largest size is too short to be significant.
+	"""
+	if large < MIN_TIME_EXPONENT or small <= 0:
+		return None
+	return math.log(large / small) / math.log(large_size / small_size)
+
+
+def check_results(case: str, results: list, thresholds: dict) -> list:
+	"""Compare the results of a case with the thresholds.
+
+	Parameters
+	----------
+	case : str
+		The case: 'package' or 'file'
+	results : list
+		The results of 'run_case' sorted by size
+	thresholds : dict
+		The thresholds of the case
+
+	Returns
+	-------
+	failures : List[str]
+		A message for each threshold exceeded
+	"""
+	failures = []
+	small, large = results[-2], results[-1]
+	for stage, duration in large['stages'].items():
+		exponent = scaling_exponent(small['stages'][stage], duration, small['size'], large['size'])
+		large.setdefault('exponents', {})[stage] = exponent
+		max_exponent = thresholds['max_exponent'].get(stage, thresholds['max_exponent']['default'])
+		if exponent is not None and exponent > max_exponent:
+			failures.append(f"{case}: the stage '{stage}' scales with an exponent {exponent:.2f} > {max_exponent}")
+	for result in results:
+		for key in ('symbols_per_sec', 'mb_per_sec'):
+			if result[key] < thresholds[f'min_{key}']:
+				failures.append(f"{case} ({result['size']}): {key} = {result[key]:.1f} < {thresholds[f'min_{key}']}")
+		max_memory = thresholds['max_peak_memory_mb_per_mb'] * result['bytes'] / 2**20 + thresholds['base_peak_memory_mb']
+		if result['peak_memory_mb'] > max_memory:
+			failures.append(f"{case} ({result['size']}): peak memory = {result['peak_memory_mb']:.1f} MB > {max_memory:.1f} MB")
+	return failures
+
+
+def create_parser():
+	parser = argparse.ArgumentParser(description="Scaling benchmark of pyDocStr.")
+	parser.add_argument('--quick', action='store_true',
+						help="Use smaller sizes (the thresholds of exponents are less reliable).")
+	parser.add_argument('--cases', nargs='+', choices=['package', 'file'], default=['package', 'file'],
+						help="The cases to run.")
+	parser.add_argument('--output', default=None, type=str,
+						help="path of a json file where the results are saved.")
+	parser.add_argument('--run-case', nargs=2, default=None, metavar=('CASE', 'SIZE'),
+						help=argparse.SUPPRESS)
+	return parser
+
+
+if __name__ == "__main__":
+	args = create_parser().parse_args()
+	if args.run_case is not None:
+		print(json.dumps(run_case(args.run_case[0], int(args.run_case[1]))))
+		sys.exit(0)
+
+	with open(THRESHOLDS_PATH, 'r') as f:
+		thresholds = json.load(f)
+
+	sizes = QUICK_SIZES if args.quick else SIZES
+	all_results, failures = {}, []
+	for case in args.cases:
+		results = []
+		for size in sizes[case]:
+			result = run_case_subprocess(case, size)
+			results.append(result)
+			print(f"{case:>7} {size:>7}: {result['total']:8.3f} s | {result['symbols_per_sec']:10.1f} symbols/s"
+					f" | {result['mb_per_sec']:7.2f} MB/s | peak {result['peak_memory_mb']:8.1f} MB")
+		failures.extend(check_results(case, results, thresholds[case]))
+		for stage, exponent in results[-1]['exponents'].items():
+			print(f"{case:>7} exponent of '{stage}': {'-' if exponent is None else format(exponent, '.2f')}")
+		all_results[case] = results
+
+	if args.output is not None:
+		with open(args.output, 'w') as f:
+			json.dump(all_results, f, indent=2)
+
+	for failure in failures:
+		print(f"FAIL: {failure}")
+	sys.exit(1 if failures else 0)
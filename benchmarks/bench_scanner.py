@@ -0,0 +1,228 @@
+"""Benchmark of the signature scanner on adversarial files.
+
+Each kind of file is generated with several sizes (in MB), the signatures of all its functions and class are searched
+with the scanner and the duration must grow linearly with the size. The kinds of files:
+ * prefixes: thousands of functions whose names share a prefix ('f', 'f_1', 'f_12'...)
+ * signatures: multi-line signatures with defaults which contain parentheses, colons, strings and lambdas, and 'async def'
+ * strings: large docstrings and comments full of fake signatures ('def f(' in a string)
+ * unclosed: lines 'def f(' in comments, with many ')' not followed by ':' (the worst case of a backtracking regex)
+
+The positions found for the smallest size are checked with the `ast` module.
+The previous regex search is timed on a part of the functions of the smallest size, to compare.
+
+usage: python benchmarks/bench_scanner.py [--quick] [--repeat REPEAT] [--kinds {prefixes,signatures,strings,unclosed} ...] [--output OUTPUT]
+"""
+import re
+import sys
+import ast
+import json
+import time
+import argparse
+
+from bench_scaling import ROOT_PATH, THRESHOLDS_PATH, scaling_exponent
+
+SIZES = [1, 2, 4, 8]  # MB
+QUICK_SIZES = [0.5, 1, 2]
+KINDS = ['prefixes', 'signatures', 'strings', 'unclosed']
+LEGACY_LOOKUPS = 20  # the number of functions searched with the previous regex
+
+SIGNATURE_TEMPLATE = '''
+@to_document(description="Function {i}: (a) [b] {{c}}.")
+async def function_{i}(
+		a: Dict[str, Tuple[int, int]] = {{'key:{i}': (1, 2)}},
+		b: Callable[[int], int] = lambda x: (x, ')')[0],  # a comment with ':' and ')'
+		c: str = "def fake_{i}(x): pass",
+		*args,
+		d: int = (1 if True else 2),
+		**kwargs) -> Dict[str, List[Tuple[int, ...]]]:
+	return {{}}
+
+class Class_{i}(Base[int], metaclass=Meta, option=(1, ":")):
+	def method(self, x=')', y=":"): return x
+
+'''
+STRING_TEMPLATE = '''
+def function_{i}(a, b):
+	"""Docstring with fake signatures:
+	def function_{i}(a, b):
+	def other(x) -> int:
+	class Fake_{i}(object):
+	"""
+	return 'def function_{i}(a, b):'  # def function_{i}(a, b):
+
+'''
+UNCLOSED_TEMPLATE = '''
+# def function_{i}( ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) ) )
+x_{i} = [(1), (2), (3), (4), (5), (6), (7), (8), (9), (10), (11), (12), (13), (14), (15), (16)]
+def function_{i}(a, b=(1, 2)) -> Tuple[int, int]:
+	return a, b
+
+'''
+
+
+def _prefixes_code(index: int) -> str:
+	# functions whose names are prefixes of the next ones, the last one is documented
+	return ''.join(f'def f{"_" + str(index) if index else ""}{"x" * level}(a, b=({level}, "):")):\n\treturn a\n\n'
+					for level in range(5))
+
+
+def create_source(kind: str, size_mb: float) -> tuple:
+	"""Create an adversarial source code.
+
+	Parameters
+	----------
+	kind : str
+		'prefixes', 'signatures', 'strings' or 'unclosed'
+	size_mb : float
+		The size of source code, in MB
+
+	Returns
+	-------
+	source_code : str
+		The source code
+	functions : List[str]
+		The names of functions
+	class : List[str]
+		The names of class
+	"""
+	code, size, index = [], 0, 0
+	functions, class_ = [], []
+	while size < size_mb * 2**20:
+		if kind == 'prefixes':
+			part = _prefixes_code(index)
+			functions.append(f'f_{index}xxxx' if index else 'fxxxx')
+		elif kind == 'signatures':
+			part = SIGNATURE_TEMPLATE.format(i=index)
+			functions.append(f'function_{index}')
+			class_.append(f'Class_{index}')
+		elif kind == 'strings':
+			part = STRING_TEMPLATE.format(i=index)
+			functions.append(f'function_{index}')
+		else:
+			part = UNCLOSED_TEMPLATE.format(i=index)
+			functions.append(f'function_{index}')
+		code.append(part)
+		size += len(part)
+		index += 1
+	return ''.join(code), functions, class_
+
+
+def legacy_positions(func_name: str, source_code: str) -> tuple:
+	# the previous search of a function signature, with a regex
+	r = r'def\s+{name}\s*\(.*?\)\s*[-, >]*[a-z, A-Z, \[, \], \,]*\:'.format(name=func_name)
+	result = re.search(r, source_code, re.MULTILINE | re.DOTALL)
+	return result.span() if result is not None else None
+
+
+def check_positions(source_code: str, positions: dict) -> list:
+	"""Compare the positions found by the scanner with the positions of the `ast` module.
+
+	Parameters
+	----------
+	source_code : str
+		The source code
+	positions : Dict[str, Tuple[int, int]]
+		The positions found for each name
+
+	Returns
+	-------
+	errors : List[str]
+		A message for each wrong position
+	"""
+	from pyDocStr.pyDocStr.analysis import SourceIndex
+	tree = ast.parse(source_code)
+	index = SourceIndex(source_code, tree=tree)
+	expected = {}
+	for node in ast.walk(tree):
+		if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+			expected.setdefault(node.name, index._signature_positions(node))
+	return [f"'{name}': {position} != {expected.get(name)}" for name, position in positions.items() if expected.get(name) != position]
+
+
+def run_kind(kind: str, sizes: list, repeat: int = 3) -> dict:
+	"""Run the scanner on the files of a kind.
+
+	Parameters
+	----------
+	kind : str
+		The kind of files
+	sizes : List[float]
+		The sizes of files, in MB
+	OPTIONAL[repeat] : int
+		The number of scans of each file (the fastest scan is kept)
+		Default: 3
+
+	Returns
+	-------
+	result : dict
+		The duration of each size, the MB/sec, the errors of positions and the duration of a lookup with the previous regex
+	"""
+	from pyDocStr.pyDocStr.utils._scanner import SignatureScanner
+
+	result = {'kind': kind, 'sizes': sizes, 'durations': [], 'mb_per_sec': [], 'errors': []}
+	for size in sizes:
+		source_code, functions, class_ = create_source(kind, size)
+		durations = []
+		for _ in range(repeat):
+			start = time.perf_counter()
+			scanner = SignatureScanner(source_code)
+			positions = {name: scanner.function_positions(name) for name in functions}
+			positions.update({name: scanner.class_positions(name) for name in class_})
+			durations.append(time.perf_counter() - start)
+		duration = min(durations)
+		result['durations'].append(duration)
+		result['mb_per_sec'].append(len(source_code) / 2**20 / duration)
+		if size == sizes[0]:
+			result['errors'] = check_positions(source_code, positions)
+			start = time.perf_counter()
+			for name in functions[-LEGACY_LOOKUPS:]:
+				legacy_positions(name, source_code)
+			result['legacy_lookup_sec'] = (time.perf_counter() - start) / len(functions[-LEGACY_LOOKUPS:])
+			result['lookups'] = len(functions) + len(class_)
+	result['exponent'] = scaling_exponent(result['durations'][-2], result['durations'][-1], sizes[-2], sizes[-1])
+	return result
+
+
+def create_parser():
+	parser = argparse.ArgumentParser(description="Benchmark of the signature scanner on adversarial files.")
+	parser.add_argument('--quick', action='store_true',
+						help="Use smaller sizes.")
+	parser.add_argument('--repeat', default=3, type=int,
+						help="The number of scans of each file (the fastest scan is kept).")
+	parser.add_argument('--kinds', nargs='+', choices=KINDS, default=KINDS,
+						help="The kinds of files.")
+	parser.add_argument('--output', default=None, type=str,
+						help="path of a json file where the results are saved.")
+	return parser
+
+
+if __name__ == "__main__":
+	args = create_parser().parse_args()
+	sys.path.insert(0, ROOT_PATH)
+
+	with open(THRESHOLDS_PATH, 'r') as f:
+		thresholds = json.load(f)['scanner']
+
+	sizes = QUICK_SIZES if args.quick else SIZES
+	results, failures = {}, []
+	for kind in args.kinds:
+		result = run_kind(kind, sizes, args.repeat)
+		results[kind] = result
+		for size, duration, mb_per_sec in zip(sizes, result['durations'], result['mb_per_sec']):
+			print(f"{kind:>10} {size:>4} MB: {duration:7.3f} s | {mb_per_sec:7.2f} MB/s")
+		print(f"{kind:>10} exponent: {'-' if result['exponent'] is None else format(result['exponent'], '.2f')}"
+				f" | previous regex: {result['legacy_lookup_sec'] * 1e3:.1f} ms/lookup"
+				f" (~{result['legacy_lookup_sec'] * result['lookups']:.0f} s for the {result['lookups']} lookups of {sizes[0]} MB)")
+		if result['exponent'] is not None and result['exponent'] > thresholds['max_exponent']:
+			failures.append(f"scanner: '{kind}' scales with an exponent {result['exponent']:.2f} > {thresholds['max_exponent']}")
+		if min(result['mb_per_sec']) < thresholds['min_mb_per_sec']:
+			failures.append(f"scanner: '{kind}' {min(result['mb_per_sec']):.2f} MB/s < {thresholds['min_mb_per_sec']}")
+		failures.extend(f"scanner: '{kind}' wrong position of {error}" for error in result['errors'])
+
+	if args.output is not None:
+		with open(args.output, 'w') as f:
+			json.dump(results, f, indent=2)
+
+	for failure in failures:
+		print(f"FAIL: {failure}")
+	sys.exit(1 if failures else 0)
@@ -1,2 +1,2 @@
 from .pyDocStr import *
-from .pyDocStr import _logger
\ No newline at end of file
+from .pyDocStr import _logger, _formatter_from_config_path, _get_formatter, __version__
\ No newline at end of file
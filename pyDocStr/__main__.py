@@ -1,11 +1,11 @@
 """usage:  [-h] [-p [PACKAGE]] [--no-sub] [--decorator-name [DECORATOR_NAME]] [-o [OUTPUT]] [--formatter {simple,numpy}] [--config-formatter [CONFIG_FORMATTER]]
         [--level-logger {debug,info,warning,error}]
-        [file]
+        [file ...]
 
 A package to generate a complete documentation in your python files.
 
 positional arguments:
-  file                  path of python file to document.
+  file                  paths of python files or folders to document.
 
 optional arguments:
   -h, --help            show this help message and exit
@@ -25,9 +25,11 @@ optional arguments:
 """
 import sys
 import os
+import copy
 import traceback
 import argparse
 import json
+from contextlib import nullcontext
 try:
 	from yaml import YAMLError
 except ModuleNotFoundError:
@@ -42,30 +44,210 @@ DESCRIPTION = "A package to generate a complete documentation in your python fil
 
 def create_parser():
 	parser = argparse.ArgumentParser(description=DESCRIPTION)
-	parser.add_argument('file', nargs='?', default=None,
-						help='path of python file to document.',
+	parser.add_argument('file', nargs='*', default=[],
+						help="paths of python files or folders to document. The files are documented in one process (a pre-commit hook can pass all its files).",
 						type=str)
 	parser.add_argument('-p', '--package', nargs='?', default=None,
 						help="path of a package to document. If this argument is used, a script to document is created.",
 						type=str)
+	parser.add_argument('--manifest', nargs='?', default=None,
+						help="path of a manifest file which lists the roots to document (packages, folders or python files of a monorepo), one by line. The roots are added to the paths and documented in one run: with --workers, all their files share one pool of workers and the largest files are imported first.",
+						type=str)
 	parser.add_argument('--no-sub', action="store_true",
 						help="If you wan't document subdirectories of directory passed to --directory argument  or subpackage of package passed to --package argument.")
+	parser.add_argument('--include', action='append', default=None,
+						help="A glob pattern of python files to document, relative to the package folder ('sub/*.py'). Can be repeated.")
+	parser.add_argument('--exclude', action='append', default=None,
+						help="A glob pattern of python files or folders to not document, relative to the package folder ('tests'). Can be repeated.")
 	parser.add_argument('--decorator-name', nargs='?', default='to_document',
 						help="The decorator name use for 'to_document' decorator.")
 	parser.add_argument('-o', '--output', nargs='?', default=None,
 						help="The output path, if not specify, the files are overwrite. The output must be a folder if --directory argument is passed else a file.",
 						type=str)
+	parser.add_argument('--also-output', nargs=2, action='append', default=None, metavar=('FORMATTER', 'OUTPUT'),
+						help="With --package, write also the package documented with FORMATTER ('simple', 'numpy' or the path of a config file) in the folder OUTPUT. The package is analysed once for all outputs. Can be repeated.")
+	parser.add_argument('--link-mode', choices=['auto', 'reflink', 'hardlink', 'copy'], default='auto',
+						help="How the files of package are created in the output folder before the documented files are written: 'auto' uses a reflink (copy-on-write) if the file system supports it, else a hardlink, else a copy.")
+	parser.add_argument('--sink', nargs='?', default=None,
+						help="path of a patch ('.patch', '.diff'), an archive ('.zip', '.tar', '.tar.gz'...) or a json file where all documented files are saved. If specified, --output is not used.",
+						type=str)
 	parser.add_argument('--formatter',  choices=['simple', 'numpy'], default='simple',
 						help="The formatter to use if 'config' parameters is not specified.",
 						type=str)
 	parser.add_argument('--config-formatter', nargs='?', default=None,
 						help='path of a config file for formatter.',
 						type=str)
+	parser.add_argument('--check', action="store_true",
+						help="Don't write the files, only list the files which would be documented. The exit code is 1 if there are files to document.")
+	parser.add_argument('--index', nargs='?', default=None,
+						help="path of a symbol index (JSON-lines). The files which didn't change since the index was written are not analysed again (with --static), the index is updated at the end.",
+						type=str)
+	parser.add_argument('--journal', nargs='?', default=None,
+						help="path of a checkpoint journal. If the run is interrupted, the next run with the same journal doesn't document again the files already documented. The journal is removed at the end of a run without failures.",
+						type=str)
+	parser.add_argument('--cache', nargs='?', default=None,
+						help="path of a folder where the documented files are cached by their content and the settings (formatter, decorator name, analysis, version of pyDocStr). A file already documented by any run is copied from the cache. Only used with --static. Default: the cache of [tool.pydocstr], else the environment variable PYDOCSTR_CACHE_DIR.",
+						type=str)
+	parser.add_argument('--refresh-bytecode', action="store_true",
+						help="Compile the files written in their '__pycache__' folder right after the run, in parallel (the first import doesn't compile them again).")
+	parser.add_argument('--profile', nargs='?', default=None,
+						help="path of a json file where the result of each file and the import time of each module (nested imports included) are saved.",
+						type=str)
+	parser.add_argument('--memprofile', action="store_true",
+						help="Trace the memory allocated by each stage (import, members, render...) and each file with tracemalloc (slow). The peak and the top allocation sites of each stage are printed and saved in the profile (--profile). Not used by the script of --package.")
+	parser.add_argument('--progress', action="store_true",
+						help="Write the live progress of run on stderr: the files done, the files/s, the estimated time left and the failures so far. Not used by the script of --package.")
+	parser.add_argument('--static', action="store_true",
+						help="Analyse the python files without importing them. With --package, the package is documented directly (no script is created).")
+	parser.add_argument('--workers', default=None, type=int,
+						help="Import the python files in a pool of WORKERS processes. With --package, the package is documented directly (no script is created). 0 to import them in the pyDocStr process, even if the workers of [tool.pydocstr] are set.")
+	parser.add_argument('--timeout', default=60., type=float,
+						help="The maximum duration of the import of a python file in a worker, in seconds.")
+	parser.add_argument('--max-memory', default=None, type=int,
+						help="The maximum memory of a worker, in MB.")
+	parser.add_argument('--max-modules', default=100, type=int,
+						help="The number of python files imported by a worker before it is replaced.")
+	parser.add_argument('--pyproject', nargs='?', default=None,
+						help="path of a pyproject.toml whose section [tool.pydocstr] gives the default of options (formatter, config-formatter, decorator-name, workers, cache, index, include, exclude). Default: the pyproject.toml of the paths or of their parent folders.",
+						type=str)
+	parser.add_argument('--no-pyproject', action="store_true",
+						help="Don't read the section [tool.pydocstr] of pyproject.toml.")
 	parser.add_argument('--level-logger', choices=['debug', 'info', 'warning', 'error'],
 						default='info', help="The logger level.")
 	return parser
 
 
+def create_serve_parser():
+	parser = argparse.ArgumentParser(prog='python -m pyDocStr serve',
+									description="Run a JSON-RPC server over stdin/stdout (one message by line) to document buffers, files and packages.")
+	parser.add_argument('--decorator-name', nargs='?', default='to_document',
+						help="The default decorator name use for 'to_document' decorator.")
+	parser.add_argument('--formatter',  choices=['simple', 'numpy'], default='simple',
+						help="The default formatter to use if 'config' parameters is not specified.",
+						type=str)
+	parser.add_argument('--config-formatter', nargs='?', default=None,
+						help='path of a config file for the default formatter.',
+						type=str)
+	parser.add_argument('--pyproject', nargs='?', default=None,
+						help="path of a pyproject.toml whose section [tool.pydocstr] gives the default of options (formatter, config-formatter, decorator-name, workers, cache, index, include, exclude). Default: the pyproject.toml of the paths or of their parent folders.",
+						type=str)
+	parser.add_argument('--no-pyproject', action="store_true",
+						help="Don't read the section [tool.pydocstr] of pyproject.toml.")
+	parser.add_argument('--level-logger', choices=['debug', 'info', 'warning', 'error'],
+						default='error', help="The logger level (logs are written in stderr).")
+	return parser
+
+
+def create_stats_parser():
+	parser = argparse.ArgumentParser(prog='python -m pyDocStr stats',
+									description="Count the decorators 'to_document' of python files with a raw byte search (the files are not imported nor parsed).")
+	parser.add_argument('path', help="path of a python file or of a package folder.", type=str)
+	parser.add_argument('--no-sub', action="store_true",
+						help="If you wan't count the decorators in the subpackages.")
+	parser.add_argument('--include', action='append', default=None,
+						help="A glob pattern of python files to count, relative to the package folder. Can be repeated.")
+	parser.add_argument('--exclude', action='append', default=None,
+						help="A glob pattern of python files or folders to not count, relative to the package folder. Can be repeated.")
+	parser.add_argument('--decorator-name', nargs='?', default='to_document',
+						help="The decorator name use for 'to_document' decorator.")
+	parser.add_argument('--all', action="store_true",
+						help="Show the files without decorator too.")
+	parser.add_argument('--json', action="store_true",
+						help="Print the counts in json: {path: count}.")
+	parser.add_argument('--pyproject', nargs='?', default=None,
+						help="path of a pyproject.toml whose section [tool.pydocstr] gives the default of options (formatter, config-formatter, decorator-name, workers, cache, index, include, exclude). Default: the pyproject.toml of the paths or of their parent folders.",
+						type=str)
+	parser.add_argument('--no-pyproject', action="store_true",
+						help="Don't read the section [tool.pydocstr] of pyproject.toml.")
+	return parser
+
+
+def print_stats(args):
+	# print the number of markers of each file found with the prefilter
+	if os.path.isdir(args.path):
+		root = os.path.abspath(args.path)
+		paths = pyDocStr.discover_modules(root, not args.no_sub, args.include, args.exclude)
+	else:
+		root = os.path.dirname(os.path.abspath(args.path))
+		paths = [os.path.abspath(args.path)]
+	stats = {os.path.relpath(path, root): count for path, count in pyDocStr.marker_stats(paths, args.decorator_name).items()
+				if args.all or count > 0}
+	if args.json:
+		print(json.dumps(stats, indent=2))
+		return
+	for path, count in stats.items():
+		print(f"{count:>6}  {path}")
+	nb_files_with_markers = sum(1 for count in stats.values() if count > 0)
+	print(f"{sum(stats.values())} decorators '{args.decorator_name}' in {nb_files_with_markers}/{len(paths)} python files")
+
+
+def apply_project_config(parser, args, start: str, argv: list = None):
+	# the settings of [tool.pydocstr] in pyproject.toml (read once by run) replace the options which were not passed in 'argv'
+	# (the arguments parsed, sys.argv[1:] if None), exit if it can't be read
+	if args.no_pyproject:
+		return
+	try:
+		config = pyDocStr.load_config(args.pyproject, start)
+	except (OSError, ValueError) as e:
+		pyDocStr._logger.error(str(e))
+		sys.exit(1)
+	for name, value in config.apply(vars(args), explicit_options(parser, args, argv)).items():
+		setattr(args, name, value)
+
+
+def explicit_options(parser, args, argv: list = None) -> set:
+	# the names of the options passed in 'argv', even with their default value ('--formatter simple'): the arguments are parsed
+	# again by a copy of the parser without defaults (argparse.SUPPRESS), so only the options passed are in its namespace
+	# (an 'append' option of the copy starts from an empty list)
+	parser = copy.deepcopy(parser)
+	for action in parser._actions:
+		action.default = argparse.SUPPRESS
+	return set(vars(parser.parse_args(argv))).intersection(vars(args))
+
+
+def project_start(args) -> str:
+	# the folder where the search of pyproject.toml starts: the package, the manifest or the common folder of files
+	if args.package is not None:
+		return os.path.abspath(args.package)
+	if args.manifest is not None:
+		return os.path.dirname(os.path.abspath(args.manifest))
+	if args.file:
+		return os.path.commonpath([os.path.abspath(path) for path in args.file])
+	return os.getcwd()
+
+
+def print_summary(summary, root: str, statuses: tuple = ('documented', 'failed')):
+	# print the status of each file with one of 'statuses', then the counts of summary
+	for result in summary.results:
+		if result.status in statuses:
+			path = os.path.relpath(result.path, root)
+			print(f"{result.status:>10}  {path}" + (f"  ({result.error})" if result.error is not None else ""))
+	print(summary)
+	if len(summary.imports) > 0:
+		print(summary.imports)
+	if len(summary.memory) > 0:
+		print(summary.memory)
+
+
+def write_profile(summary, path: str):
+	# save the summary of run, the import time of modules and the memory of stages in a json file
+	if path is None:
+		return
+	with open(path, 'w', encoding='utf-8') as f:
+		json.dump(summary.to_dict(), f, indent=2)
+	pyDocStr._logger.info(f"The profile of run was saved in '{path}'")
+
+
+def get_formatter_from_args(args):
+	# return the formatter specified by the arguments, exit if the config file can't be read
+	if args.config_formatter is None:
+		return pyDocStr.get_formatter(args.formatter)
+	formatter = pyDocStr._formatter_from_config_path(args.config_formatter)
+	if formatter is None:
+		sys.exit(1)
+	return formatter
+
+
 def get_code_to_document_package():
 	return """
 import pyDocStr
@@ -81,7 +263,15 @@ pyDocStr.build_docstrings_package(
 									subpackages={subpackages},
 									remove_decorator={remove_decorator},
 									decorator_name={decorator_name},
-									level_logger={level_logger}
+									level_logger={level_logger},
+									sink={sink},
+									include={include},
+									exclude={exclude},
+									link_mode={link_mode},
+									journal={journal},
+									outputs={outputs},
+									bytecode={bytecode},
+									pyproject=None
 								)
 """
 
@@ -91,39 +281,144 @@ def _get_str(str_: str) -> str:
 
 
 if __name__ == "__main__":
+	if sys.argv[1:2] == ['serve']:
+		serve_parser = create_serve_parser()
+		args = serve_parser.parse_args(sys.argv[2:])
+		pyDocStr.set_level_logger(args.level_logger)
+		apply_project_config(serve_parser, args, os.getcwd(), sys.argv[2:])
+		pyDocStr.serve(formatter=get_formatter_from_args(args), decorator_name=args.decorator_name)
+		sys.exit(0)
+
+	if sys.argv[1:2] == ['stats']:
+		stats_parser = create_stats_parser()
+		args = stats_parser.parse_args(sys.argv[2:])
+		if not os.path.exists(args.path):
+			pyDocStr._logger.error(f'The path was not found: {args.path}')
+			sys.exit(1)
+		apply_project_config(stats_parser, args, args.path, sys.argv[2:])
+		print_stats(args)
+		sys.exit(0)
+
 	parser = create_parser()
 	args = parser.parse_args()
 
 	pyDocStr.set_level_logger(args.level_logger)
-	if args.config_formatter is None:
-		formatter = pyDocStr.get_formatter(args.formatter)
-	else:
-		formatter = pyDocStr._formatter_from_config_path(args.config_formatter)
-		if formatter is None:
-			sys.exit(1)
+	pyDocStr.set_queue_logging('auto')
+	apply_project_config(parser, args, project_start(args))
+	if args.cache is None:
+		args.cache = os.environ.get('PYDOCSTR_CACHE_DIR')
+	formatter = get_formatter_from_args(args)
 
 	pyDocStr._logger.debug("debug mode - information on parameters")
 	pyDocStr._logger.debug("-"*20)
 	pyDocStr._logger.debug(f'current path: {os.getcwd()}')
-	pyDocStr._logger.debug(f'file path: {args.file}')
+	pyDocStr._logger.debug(f'file paths: {args.file}')
 	pyDocStr._logger.debug(f'package path: {args.package}')
+	pyDocStr._logger.debug(f'manifest: {args.manifest}')
 	pyDocStr._logger.debug(f'no-sub: {args.no_sub}')
+	pyDocStr._logger.debug(f'include: {args.include}')
+	pyDocStr._logger.debug(f'exclude: {args.exclude}')
 	pyDocStr._logger.debug(f'decorator-name: {args.decorator_name}')
 	pyDocStr._logger.debug(f'formatter: {args.formatter}')
 	pyDocStr._logger.debug(f'output: {args.output}')
+	pyDocStr._logger.debug(f'also-output: {args.also_output}')
+	pyDocStr._logger.debug(f'link-mode: {args.link_mode}')
+	pyDocStr._logger.debug(f'sink: {args.sink}')
+	pyDocStr._logger.debug(f'check: {args.check}')
+	pyDocStr._logger.debug(f'index: {args.index}')
+	pyDocStr._logger.debug(f'journal: {args.journal}')
+	pyDocStr._logger.debug(f'cache: {args.cache}')
+	pyDocStr._logger.debug(f'refresh-bytecode: {args.refresh_bytecode}')
+	pyDocStr._logger.debug(f'profile: {args.profile}')
+	pyDocStr._logger.debug(f'memprofile: {args.memprofile}')
+	pyDocStr._logger.debug(f'progress: {args.progress}')
+	pyDocStr._logger.debug(f'static: {args.static}')
+	pyDocStr._logger.debug(f'pyproject: {args.pyproject} (ignored: {args.no_pyproject})')
+	pyDocStr._logger.debug(f'workers: {args.workers}')
 	pyDocStr._logger.debug(f'config-formatter file: {args.config_formatter}')
 	pyDocStr._logger.debug("-"*20)
 
-	if args.package is None and args.file is not None:
-		if os.path.exists(args.file):
+	if args.manifest is not None:
+		if not os.path.isfile(args.manifest):
+			pyDocStr._logger.error(f'The manifest was not found: {args.manifest}')
+			sys.exit(1)
+		if args.package is not None:
+			pyDocStr._logger.error("--manifest can't be used with --package")
+			sys.exit(1)
+		roots = pyDocStr.read_manifest(args.manifest)
+		pyDocStr._logger.info(f"{len(roots)} roots were read in the manifest '{args.manifest}'")
+		args.file = list(dict.fromkeys(args.file + roots))
+	progress = pyDocStr.Progress() if args.progress else None
+
+	pool = None
+	if args.workers and not args.static:
+		pool = pyDocStr.ImportWorkerPool(args.workers, timeout=args.timeout, max_memory=args.max_memory, max_modules=args.max_modules)
+
+	cache = pyDocStr.get_cache(args.cache)
+
+	def open_outputs(root: str):
+		# return the sink (a check sink with --check) and the symbol index specified by the arguments
+		if args.check:
+			sink = pyDocStr.CheckSink(root)
+		else:
+			sink = pyDocStr.get_sink(args.sink) if args.sink is not None else None
+		symbol_index = None
+		if args.index is not None:
+			symbol_index = pyDocStr.load_index(args.index, root, args.decorator_name, 'static' if args.static else 'import')
+		return sink, symbol_index
+
+	def close_outputs(sink, symbol_index, failed: bool = False):
+		# close the outputs and exit, with the code 1 if a file failed or if --check found files to document
+		if sink is not None:
+			sink.close()
+		if pool is not None:
+			pool.close()
+		if symbol_index is not None:
+			symbol_index.save()
+		if args.check:
+			for path in sink.changed:
+				print(f"would document {path}")
+			print(f"{len(sink.changed)} files would be documented")
+			sys.exit(1 if sink.changed or failed else 0)
+		sys.exit(1 if failed else 0)
+
+	if args.package is None and len(args.file) == 1 and not os.path.isdir(args.file[0]):
+		file = args.file[0]
+		if os.path.exists(file):
 			if args.output is not None and os.path.isdir(args.output):
 				pyDocStr._logger.error(f"output argument must be a file, not a directory: '{args.output}'")
 				sys.exit(1)
-			pyDocStr.create_docstrings_from_module(args.file, formatter=formatter, new_path=args.output, decorator_name=args.decorator_name)
+			sink, symbol_index = open_outputs(os.path.dirname(os.path.abspath(file)))
+			summary = pyDocStr.RunSummary()
+			with summary.imports.recording(), summary.memory.recording() if args.memprofile else nullcontext():
+				result = pyDocStr.create_docstrings_from_module(file, formatter=formatter, new_path=args.output, decorator_name=args.decorator_name,
+																sink=sink, static=args.static, pool=pool, symbol_index=symbol_index,
+																bytecode=args.refresh_bytecode, cache=cache)
+			summary.add(result)
+			if len(summary.memory) > 0:
+				print(summary.memory)
+			write_profile(summary, args.profile)
+			close_outputs(sink, symbol_index, failed=result.status == 'failed')
 
 		else:
-			pyDocStr._logger.error(f'The python file was not found: {args.file}')
+			pyDocStr._logger.error(f'The python file was not found: {file}')
+			sys.exit(1)
+
+	elif args.package is None and args.file:
+		# several files or folders: documented in this process, the files are overwritten (or added to the sink)
+		if args.output is not None or args.also_output is not None:
+			pyDocStr._logger.error("--output and --also-output can't be used with several files or a folder, use --package or --sink")
 			sys.exit(1)
+		root = os.path.commonpath([os.path.abspath(path) if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+									for path in args.file])
+		sink, symbol_index = open_outputs(root)
+		summary = pyDocStr.create_docstrings_from_files(args.file, formatter, subpackages=not args.no_sub, decorator_name=args.decorator_name,
+														sink=sink, static=args.static, pool=pool, include=args.include, exclude=args.exclude,
+														symbol_index=symbol_index, bytecode=args.refresh_bytecode, cache=cache, memprofile=args.memprofile,
+														progress=progress)
+		print_summary(summary, root, ('failed',) if args.check else ('documented', 'failed'))
+		write_profile(summary, args.profile)
+		close_outputs(sink, symbol_index, failed=len(summary.failed) > 0)
 
 	elif args.package is not None:
 		if os.path.exists(args.package):
@@ -131,6 +426,40 @@ if __name__ == "__main__":
 				pyDocStr._logger.error(f"output argument must be a directory, not a file: '{args.output}'")
 				sys.exit(1)
 
+			outputs = None
+			if args.also_output is not None and (args.sink is not None or args.check):
+				pyDocStr._logger.error("--also-output can't be used with --sink or --check")
+				sys.exit(1)
+			if args.also_output is not None and args.output is None:
+				pyDocStr._logger.error("--also-output needs --output: the package documented with the first formatter must be written in another folder")
+				sys.exit(1)
+			if args.also_output is not None:
+				# the first output is the formatter and the output of the other arguments
+				outputs = [(args.config_formatter or args.formatter, args.output)] + [tuple(output) for output in args.also_output]
+
+			if args.static or pool is not None or args.check or args.index is not None:
+				sink, symbol_index = open_outputs(os.path.abspath(args.package))
+				if outputs is not None:
+					outputs = [(pyDocStr._get_formatter(formatter), output) for formatter, output in outputs]
+					if any(formatter is None for formatter, _ in outputs):
+						sys.exit(1)
+				summary = pyDocStr.create_docstrings_from_package(args.package, formatter, args.output, subpackages=not args.no_sub,
+																decorator_name=args.decorator_name, sink=sink, static=args.static, pool=pool,
+																include=args.include, exclude=args.exclude, symbol_index=symbol_index,
+																link_mode=args.link_mode, journal=args.journal, outputs=outputs,
+																bytecode=args.refresh_bytecode, cache=cache, memprofile=args.memprofile,
+																progress=progress)
+				if summary is not None:
+					print_summary(summary, os.path.abspath(args.package), statuses=())
+					write_profile(summary, args.profile)
+				close_outputs(sink, symbol_index, failed=summary is None or len(summary.failed) > 0)
+
+			if args.memprofile:
+				pyDocStr._logger.warning("--memprofile is not used by the script which documents the package, use --static or --workers to profile the memory")
+			if args.progress:
+				pyDocStr._logger.warning("--progress is not used by the script which documents the package, use --static or --workers to see the progress")
+			if args.cache is not None:
+				pyDocStr._logger.info("The cache is not used by the script which documents the package: it's only used with --static")
 			package = args.package.replace('\\', '/').rstrip('/')
 			package_name = package.split('/')[-1]
 			code = get_code_to_document_package()
@@ -141,6 +470,13 @@ if __name__ == "__main__":
 				subpackages=not args.no_sub,
 				decorator_name=_get_str(args.decorator_name),
 				level_logger=_get_str(args.level_logger),
+				sink=_get_str(args.sink) if args.sink is not None else None,
+				include=args.include,
+				exclude=args.exclude,
+				link_mode=_get_str(args.link_mode),
+				journal=_get_str(args.journal) if args.journal is not None else None,
+				outputs=outputs,
+				bytecode=args.refresh_bytecode,
 				remove_decorator=True,
 				config_formatter=_get_str(args.config_formatter) if args.config_formatter is not None else None)
 
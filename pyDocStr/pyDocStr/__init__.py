@@ -1,5 +1,15 @@
 import os
+import json
+import traceback
+import contextlib
 import logging as _logging
+try:
+	from yaml import YAMLError
+except ModuleNotFoundError:
+	class YAMLError(Exception):
+		pass
+
+__version__ = '1.1.0'
 
 from . import utils
 from .documented import FunctionToDocument, ClassToDocument
@@ -17,7 +27,19 @@ _logger.addHandler(_handler)
 _logger.setLevel(_logging.DEBUG)
 
 
-from .build_docstrings import create_docstrings_from_module, create_docstrings_from_package
+from .build_docstrings import create_docstrings_from_module, create_docstrings_from_package, create_docstrings_from_source, create_docstrings_from_files, iter_documented
+from .sinks import OutputSink, PatchSink, ArchiveSink, JsonSink, CheckSink, MemorySink, get_sink
+from .analysis import SourceIndex, index_source
+from .server import Server, serve
+from .workers import ImportWorkerPool, WorkerError
+from .discovery import discover_modules, read_manifest, PathMatcher
+from .prefilter import count_markers, has_marker, filter_modules, marker_stats
+from .symbol_index import SymbolIndex, load_index
+from .journal import FileResult, RunSummary, Journal
+from .bytecode import refresh_bytecode
+from .result_cache import ResultCache, get_cache
+from .progress import Progress
+from .config import ProjectConfig, load_config, find_pyproject
 
 
 def set_level_logger(levelname: str):
@@ -39,6 +61,26 @@ def set_level_logger(levelname: str):
 	_logger.setLevel(levels[levelname])
 
 
+def set_queue_logging(enabled=True):
+	"""A function to write the logs in a listener thread: the logging calls put the records in a queue
+	and don't wait for the stream. The logs of import workers are always written by the main process.
+
+	Parameters
+	----------
+	OPTIONAL[enabled] : Union[bool, str]
+		If True, the logs are written by a listener thread, else they are written by the logging calls.
+		If 'auto', the listener thread is only used if it's faster: the level is 'info' or 'debug' and the logs
+		are written in a terminal (the logging calls are faster with a file or a pipe).
+		Default: True
+	"""
+	if enabled == 'auto':
+		enabled = utils._log_utils.queue_logging_pays_off(_logger)
+	if enabled:
+		utils._log_utils.start_queue_logging(_logger)
+	else:
+		utils._log_utils.stop_queue_logging(_logger)
+
+
 def get_formatter(name: str):
 	"""A function to get an existing formatter with the name.
 
@@ -96,15 +138,50 @@ def _formatter_from_config_path(config_path: str):
 	return None
 
 
+def _get_formatter(formatter):
+	# return the formatter of a name ('simple', 'numpy'), of a config file or the formatter itself, None if the config file can't be read
+	if isinstance(formatter, utils.BaseFormatter):
+		return formatter
+	if isinstance(formatter, str) and formatter.lower() in ('simple', 'numpy'):
+		return get_formatter(formatter)
+	if isinstance(formatter, str):
+		return _formatter_from_config_path(formatter)
+	raise ValueError(f"'formatter' must be an instance of 'str' or of 'BaseFormatter', not '{type(formatter)}'")
+
+
+def _project_settings(values: dict, pyproject: str, start: str) -> dict:
+	# return the arguments of a function with the settings of project ('pyproject.toml') for the arguments not specified (None),
+	# then the default of 'formatter' and 'decorator_name'
+	if pyproject is not None:
+		config = load_config(None if pyproject == 'auto' else pyproject, start)
+		values = config.apply(values, {name for name, value in values.items() if value is not None})
+	if values['formatter'] is None:
+		values['formatter'] = utils.Formatter.simple_format()
+	if values['decorator_name'] is None:
+		values['decorator_name'] = 'to_document'
+	return values
+
+
 def build_docstrings_package(
 								package,
-								formatter = utils.Formatter.simple_format(),
+								formatter = None,
 								config_formatter: str = None,
 								new_package_path: str = None,
 								subpackages: bool = False,
 								remove_decorator: bool = True,
-								decorator_name: str = 'to_document',
+								decorator_name: str = None,
 								level_logger: str = 'info',
+								sink = None,
+								include: list = None,
+								exclude: list = None,
+								link_mode: str = 'auto',
+								journal: str = None,
+								outputs: list = None,
+								bytecode: bool = False,
+								cache = None,
+								static: bool = False,
+								workers: int = None,
+								pyproject: str = 'auto',
 							):
 	"""Build all docstring for a package.
 
@@ -112,8 +189,9 @@ def build_docstrings_package(
 	----------
 	package : module
 		The package to document
-	OPTIONAL[formatter] : Union[str, Formatter]
+	OPTIONAL[formatter] : Union[str, BaseFormatter]
 		The formatter name or the formatter to use. Use if config_formatter is not used.
+		If None, the formatter of the project, else the 'simple' formatter.
 		Default: None
 	OPTIONAL[config_formatter] : str
 		The path of config file for the formatter. This file must be a json file or a yaml file.
@@ -128,26 +206,206 @@ def build_docstrings_package(
 		If True, the decorators 'to_document' are removed.
 		Default: True
 	OPTIONAL[decorator_name] : str
-		The name use for decorator 'to_document'.
-		Default: 'to_document'
+		The name use for decorator 'to_document'. If None, the decorator name of the project, else 'to_document'.
+		Default: None
 	OPTIONAL[level_logger] : str
 		The level of logger. Choices: 'debug', 'info', 'warning', 'error'
 		Default: 'info'
+	OPTIONAL[sink] : Union[str, OutputSink]
+		The path of a patch, an archive or a json file, or the sink, where all documented files are saved.
+		If specified, 'new_package_path' is not used.
+		Default: None
+	OPTIONAL[include] : List[str]
+		The glob patterns of python files to document, relative to the package folder. If None, all python files are documented.
+		Default: None
+	OPTIONAL[exclude] : List[str]
+		The glob patterns of python files or folders to not document, relative to the package folder.
+		Default: None
+	OPTIONAL[link_mode] : str
+		How the files are created in 'new_package_path': 'auto', 'reflink', 'hardlink' or 'copy'.
+		Default: 'auto'
+	OPTIONAL[journal] : str
+		The path of a checkpoint journal to resume an interrupted run (not used with a sink).
+		Default: None
+	OPTIONAL[outputs] : List[Tuple[Union[str, BaseFormatter], str]]
+		The pairs (formatter, new package path) to write the package documented with several formatters from one analysis.
+		The formatter is a formatter name, the path of a config file or a formatter. If specified, 'formatter', 'config_formatter'
+		and 'new_package_path' are not used.
+		Default: None
+	OPTIONAL[bytecode] : bool
+		If True, the bytecode ('__pycache__') of the files written is refreshed right after the run, in parallel.
+		Default: False
+	OPTIONAL[cache] : Union[str, ResultCache]
+		The folder of a cache of documented files or the cache, shared by the runs of all checkouts:
+		the files documented before with the same content and settings are copied from the cache (only with 'static').
+		Default: None
+	OPTIONAL[static] : bool
+		If True, the python files of the package are analysed without importing them (the cache is only used with the static analysis).
+		Default: False
+	OPTIONAL[workers] : int
+		If specified, the python files are imported in a pool of 'workers' processes instead of the current process.
+		If None, the workers of the project. 0 to import them in the current process, even if the project sets workers.
+		Default: None
+	OPTIONAL[pyproject] : str
+		The path of a 'pyproject.toml' whose section '[tool.pydocstr]' gives the formatter, the decorator name, the workers,
+		the cache and the include/exclude patterns which are None. 'auto' to search it from the package folder, None to not read it.
+		Default: 'auto'
 
 	Returns
 	-------
-	None
+	summary : RunSummary
+		The result of each file
 	"""
 
+	set_level_logger(level_logger)
+	settings = _project_settings(
+		dict(formatter=formatter, config_formatter=config_formatter, decorator_name=decorator_name, workers=workers, cache=cache,
+			include=include, exclude=exclude),
+		pyproject, package if isinstance(package, str) else package.__file__)
+	formatter, config_formatter, decorator_name, workers, cache, include, exclude = (
+		settings[name] for name in ('formatter', 'config_formatter', 'decorator_name', 'workers', 'cache', 'include', 'exclude'))
+
 	if config_formatter is None and isinstance(formatter, str):
 		formatter = get_formatter(formatter)
 	elif config_formatter is not None:
 		formatter = _formatter_from_config_path(config_formatter)
 		if formatter is None:
 			return
-	elif not isinstance(formatter, utils.Formatter):
-		raise ValueError(f"'formatter' must be an instance of 'str' or of 'Formatter', not '{type(formatter)}'")
+	elif not isinstance(formatter, utils.BaseFormatter):
+		raise ValueError(f"'formatter' must be an instance of 'str' or of 'BaseFormatter', not '{type(formatter)}'")
+
+	if outputs is not None:
+		outputs = [(_get_formatter(formatter), new_path) for formatter, new_path in outputs]
+		if any(formatter is None for formatter, _ in outputs):
+			return
+
+	if isinstance(cache, str):
+		cache = get_cache(cache)
+	pool = ImportWorkerPool(workers) if workers and not static else None
+	try:
+		with get_sink(sink) if isinstance(sink, str) else contextlib.nullcontext(sink) as sink:
+			return create_docstrings_from_package(package, formatter, new_package_path, subpackages=subpackages,
+												remove_decorator=remove_decorator, decorator_name=decorator_name, sink=sink, static=static,
+												pool=pool, include=include, exclude=exclude, link_mode=link_mode, journal=journal,
+												outputs=outputs, bytecode=bytecode, cache=cache)
+	finally:
+		if pool is not None:
+			pool.close()
+
+
+def build_docstrings_roots(
+								roots: list = None,
+								manifest: str = None,
+								formatter = None,
+								config_formatter: str = None,
+								subpackages: bool = True,
+								remove_decorator: bool = True,
+								decorator_name: str = None,
+								level_logger: str = 'info',
+								sink = None,
+								include: list = None,
+								exclude: list = None,
+								static: bool = False,
+								workers: int = None,
+								bytecode: bool = False,
+								cache = None,
+								progress: bool = True,
+								pyproject: str = 'auto',
+							):
+	"""Build all docstrings of several roots (the packages of a monorepo) in one run.
+	The python files of all roots are documented together: with workers, they share one pool and the largest files are imported first.
+	The files are overwritten (or added to the sink).
+
+	Parameters
+	----------
+	OPTIONAL[roots] : List[str]
+		The paths of packages, folders or python files to document.
+		Default: None
+	OPTIONAL[manifest] : str
+		The path of a manifest file which lists the roots, one by line (relative to the folder of manifest).
+		Its roots are added to 'roots'.
+		Default: None
+	OPTIONAL[formatter] : Union[str, BaseFormatter]
+		The formatter name or the formatter to use. Use if config_formatter is not used.
+		If None, the formatter of the project, else the 'simple' formatter.
+		Default: None
+	OPTIONAL[config_formatter] : str
+		The path of config file for the formatter. This file must be a json file or a yaml file.
+		Default: None
+	OPTIONAL[subpackages] : bool
+		If True, the subpackages of roots are documented.
+		Default: True
+	OPTIONAL[remove_decorator] : bool
+		If True, the decorators 'to_document' are removed.
+		Default: True
+	OPTIONAL[decorator_name] : str
+		The name use for decorator 'to_document'. If None, the decorator name of the project, else 'to_document'.
+		Default: None
+	OPTIONAL[level_logger] : str
+		The level of logger. Choices: 'debug', 'info', 'warning', 'error'
+		Default: 'info'
+	OPTIONAL[sink] : Union[str, OutputSink]
+		The path of a patch, an archive or a json file, or the sink, where all documented files are saved.
+		Default: None
+	OPTIONAL[include] : List[str]
+		The glob patterns of python files to document, relative to each root. If None, all python files are documented.
+		Default: None
+	OPTIONAL[exclude] : List[str]
+		The glob patterns of python files or folders to not document, relative to each root.
+		Default: None
+	OPTIONAL[static] : bool
+		If True, the python files are analysed without importing them.
+		Default: False
+	OPTIONAL[workers] : int
+		If specified (and 'static' is False), the python files are imported in one pool of 'workers' processes shared by all roots.
+		If None, the workers of the project. 0 to import them in the current process, even if the project sets workers.
+		Default: None
+	OPTIONAL[bytecode] : bool
+		If True, the bytecode ('__pycache__') of the files written is refreshed right after the run, in parallel.
+		Default: False
+	OPTIONAL[cache] : Union[str, ResultCache]
+		The folder of a cache of documented files or the cache, shared by the runs of all checkouts (only with 'static').
+		Default: None
+	OPTIONAL[progress] : bool
+		If True, the progress of run (files/s, estimated time left, failures so far) is written on stderr.
+		Default: True
+	OPTIONAL[pyproject] : str
+		The path of a 'pyproject.toml' whose section '[tool.pydocstr]' gives the formatter, the decorator name, the workers,
+		the cache and the include/exclude patterns which are None. 'auto' to search it from the common folder of roots,
+		None to not read it.
+		Default: 'auto'
+
+	Returns
+	-------
+	summary : RunSummary
+		The result of each file (a root not found is a failed file)
+	"""
 
 	set_level_logger(level_logger)
-	return create_docstrings_from_package(package, formatter, new_package_path, subpackages=subpackages,
-										remove_decorator=remove_decorator, decorator_name=decorator_name)
\ No newline at end of file
+	roots = list(roots or [])
+	if manifest is not None:
+		roots.extend(read_manifest(manifest))
+	if not roots:
+		raise ValueError("No root to document: 'roots' and 'manifest' are empty")
+
+	settings = _project_settings(
+		dict(formatter=formatter, config_formatter=config_formatter, decorator_name=decorator_name, workers=workers, cache=cache,
+			include=include, exclude=exclude),
+		pyproject, os.path.commonpath([os.path.abspath(root) for root in roots]))
+	formatter, config_formatter, decorator_name, workers, cache, include, exclude = (
+		settings[name] for name in ('formatter', 'config_formatter', 'decorator_name', 'workers', 'cache', 'include', 'exclude'))
+	formatter = _get_formatter(config_formatter if config_formatter is not None else formatter)
+	if formatter is None:
+		return
+	if isinstance(cache, str):
+		cache = get_cache(cache)
+	pool = ImportWorkerPool(workers) if workers and not static else None
+	progress = Progress() if progress else None
+	try:
+		with get_sink(sink) if isinstance(sink, str) else contextlib.nullcontext(sink) as sink:
+			return create_docstrings_from_files(roots, formatter, subpackages=subpackages, remove_decorator=remove_decorator,
+												decorator_name=decorator_name, sink=sink, static=static, pool=pool, include=include,
+												exclude=exclude, bytecode=bytecode, cache=cache, progress=progress)
+	finally:
+		if pool is not None:
+			pool.close()
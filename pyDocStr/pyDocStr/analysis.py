@@ -0,0 +1,303 @@
+"""Static analysis of source code to find the functions and class to document without importing the module."""
+import ast
+from inspect import _empty
+
+from .documented import FunctionToDocument, ClassToDocument
+from .utils.annotations import _source_segment
+from .utils._body import analyse_body
+
+
+PROPERTY_DECORATORS = ('property', 'cached_property', 'setter', 'getter', 'deleter')
+
+
+def _decorator_id(decorator) -> str:
+	# return the name of a decorator: '@name', '@module.name' or '@name(...)' -> 'name'
+	func = decorator.func if isinstance(decorator, ast.Call) else decorator
+	if isinstance(func, ast.Name):
+		return func.id
+	elif isinstance(func, ast.Attribute):
+		return func.attr
+	return None
+
+
+def _get_decorator(node, decorator_name: str):
+	# return the decorator 'decorator_name' of a node, None if the node is not decorated with it
+	for decorator in node.decorator_list:
+		if _decorator_id(decorator) == decorator_name:
+			return decorator
+	return None
+
+
+def _literal(node, default=None):
+	# return the value of a literal node, 'default' if the node is not a literal
+	try:
+		return ast.literal_eval(node)
+	except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+		return default
+
+
+def _decorator_kwargs(decorator) -> dict:
+	# return the literal arguments of the decorator call: {'description': ..., other keywords}
+	if not isinstance(decorator, ast.Call):
+		return {}
+	kwargs = {}
+	if len(decorator.args) > 0 and isinstance(_literal(decorator.args[0]), str):
+		kwargs['description'] = _literal(decorator.args[0])
+	for keyword in decorator.keywords:
+		value = _literal(keyword.value, _empty)
+		if keyword.arg is not None and value is not _empty:
+			kwargs[keyword.arg] = value
+	return kwargs
+
+
+def _node_end(node) -> tuple:
+	return node.end_lineno, node.end_col_offset
+
+
+class StaticFunctionToDocument(FunctionToDocument):
+	"""A function to document found with the static analysis of source code, the function is not imported.
+	The attributes are the same as FunctionToDocument, 'obj' is None.
+
+	Attributes
+	----------
+	qualname : str
+		The qualified name of function ('Class.method' for a method).
+	signature_positions : Tuple[int, int]
+		The start position of signature and the position of ':' at the end of signature.
+	"""
+
+	def __init__(self, node, index, qualname: str, depth: int = 0, description: str = "", name_return: str = None, **kwargs):
+		self.obj = None
+		self.name = node.name
+		self.qualname = qualname
+		self.description = description
+		self.parameters = index._get_parameters(node.args)
+		self._set_body_fields(index.segment(node.returns) if node.returns is not None else None,
+								analyse_body(node, index.segment), name_return)
+		self.nb_base_tab = depth + 1
+		self.signature_positions = index._signature_positions(node)
+
+
+class StaticClassToDocument(ClassToDocument):
+	"""A class to document found with the static analysis of source code, the class is not imported.
+	The attributes are the same as ClassToDocument, 'obj' is None.
+	The attributes and methods are only those defined in the class body (not inherited).
+
+	Attributes
+	----------
+	qualname : str
+		The qualified name of class.
+	signature_positions : Tuple[int, int]
+		The start position of signature and the position of ':' at the end of signature.
+	"""
+
+	def __init__(self, node, index, qualname: str, depth: int = 0, description: str = "", **kwargs):
+		self.obj = None
+		self.name = node.name
+		self.qualname = qualname
+		self.description = description
+		self.nb_base_tab = depth + 1
+		self.signature_positions = index._signature_positions(node)
+		self.methods_to_document = []
+		self.public_methods, self.protected_methods = {}, {}
+		attributes = set()
+		for child in node.body:
+			if isinstance(child, ast.Assign):
+				attributes.update(target.id for target in child.targets if isinstance(target, ast.Name))
+			elif isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
+				attributes.add(child.target.id)
+			elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+				if any(_decorator_id(decorator) in PROPERTY_DECORATORS for decorator in child.decorator_list):
+					attributes.add(child.name)
+					continue
+				decorator = _get_decorator(child, index.decorator_name)
+				if decorator is not None:
+					self.methods_to_document.append(StaticFunctionToDocument(child, index, f'{qualname}.{child.name}',
+																			depth + 1, **_decorator_kwargs(decorator)))
+				if not child.name.startswith('__'):
+					type_default = (index.segment(child.returns) if child.returns is not None else _empty, _empty)
+					if not child.name.startswith('_'):
+						self.public_methods[child.name] = type_default
+					else:
+						self.protected_methods[child.name] = type_default
+		self.attributes = {name: (_empty, _empty) for name in sorted(attributes) if not name.startswith('__')}
+		self.public_methods = dict(sorted(self.public_methods.items()))
+		self.protected_methods = dict(sorted(self.protected_methods.items()))
+
+
+class SourceIndex:
+	"""The index of a source code, built with one parse of the source code.
+	It contains the functions and class to document and the positions of all functions and class.
+
+	Attributes
+	----------
+	source_code : str
+		The source code indexed.
+	decorator_name : str
+		The name of decorator 'to_document'.
+	list_func : List[StaticFunctionToDocument]
+		The functions to document.
+	list_class : List[StaticClassToDocument]
+		The class to document (with their methods to document).
+	positions : Dict[str, Tuple[int, int]]
+		The start position of signature and the position of ':' at the end of signature
+		of all functions and class, with their qualified name in key.
+	spans : Dict[str, Tuple[int, int]]
+		The start and end positions of all functions and class (with the decorators), with their qualified name in key.
+
+	Public methods
+	--------------
+	symbols : List[Union[StaticFunctionToDocument, StaticClassToDocument]]
+		Return all symbols to document.
+	offset : int
+		Return the position in source code of a line and a column of the ast.
+	segment : str
+		Return the source text of a node.
+	"""
+
+	def __init__(self, source_code: str, decorator_name: str = 'to_document', tree=None):
+		self.source_code = source_code
+		self.decorator_name = decorator_name
+		self._lines = source_code.split('\n')
+		self._line_starts = [0]
+		for line in self._lines[:-1]:
+			self._line_starts.append(self._line_starts[-1] + len(line) + 1)
+
+		self.list_func, self.list_class = [], []
+		self.positions, self.spans = {}, {}
+		tree = ast.parse(source_code) if tree is None else tree
+		self._index_body(tree.body, prefix='', depth=0, module_level=True)
+
+	def _index_body(self, body: list, prefix: str, depth: int, module_level: bool = False):
+		# index the functions and class of a body, the symbols to document are only searched at module level
+		for node in body:
+			if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+				qualname = prefix + node.name
+				start = node.decorator_list[0] if len(node.decorator_list) > 0 else node
+				self.positions.setdefault(qualname, self._signature_positions(node))
+				self.spans.setdefault(qualname, (self.offset(start.lineno, 0), self.offset(node.end_lineno, node.end_col_offset)))
+
+				decorator = _get_decorator(node, self.decorator_name) if module_level else None
+				if decorator is not None and isinstance(node, ast.ClassDef):
+					self.list_class.append(StaticClassToDocument(node, self, qualname, depth, **_decorator_kwargs(decorator)))
+				elif decorator is not None:
+					self.list_func.append(StaticFunctionToDocument(node, self, qualname, depth, **_decorator_kwargs(decorator)))
+
+				if isinstance(node, ast.ClassDef):
+					self._index_body(node.body, f'{qualname}.', depth + 1)
+				else:
+					self._index_body(node.body, f'{qualname}.<locals>.', depth + 1)
+			elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith, ast.For, ast.AsyncFor, ast.While)):
+				for child_body in (getattr(node, 'body', []), getattr(node, 'orelse', []), getattr(node, 'finalbody', [])):
+					self._index_body(child_body, prefix, depth, module_level)
+				for handler in getattr(node, 'handlers', []):
+					self._index_body(handler.body, prefix, depth, module_level)
+
+	def offset(self, lineno: int, col_offset: int) -> int:
+		"""Return the position in source code of a line and a column of the ast.
+
+		Parameters
+		----------
+		lineno : int
+			The line number (starts at 1)
+		col_offset : int
+			The column, in bytes (utf-8)
+
+		Returns
+		-------
+		offset : int
+			The position in source code
+		"""
+		line = self._lines[lineno - 1]
+		if not line.isascii():
+			col_offset = len(line.encode()[:col_offset].decode())
+		return self._line_starts[lineno - 1] + col_offset
+
+	def segment(self, node) -> str:
+		"""Return the source text of a node.
+
+		Parameters
+		----------
+		node : ast.AST
+			The node
+
+		Returns
+		-------
+		segment : str
+			The source text of the node
+		"""
+		return _source_segment(self._lines, node)
+
+	def symbols(self) -> list:
+		"""Return all symbols to document: the functions, the class and their methods to document.
+
+		Returns
+		-------
+		symbols : List[Union[StaticFunctionToDocument, StaticClassToDocument]]
+			The symbols to document
+		"""
+		symbols = list(self.list_func)
+		for class_ in self.list_class:
+			symbols.append(class_)
+			symbols.extend(class_.methods_to_document)
+		return symbols
+
+	def _get_parameters(self, args) -> dict:
+		# return the parameters {name: (annotation source text, default)} of a function like FunctionToDocument
+		# the default is the value of a literal or the source text
+		positional = args.posonlyargs + args.args
+		defaults = [_empty] * (len(positional) - len(args.defaults)) + args.defaults
+		parameters = list(zip(positional, defaults))
+		if args.vararg is not None:
+			parameters.append((args.vararg, _empty))
+		parameters.extend((arg, _empty if default is None else default) for arg, default in zip(args.kwonlyargs, args.kw_defaults))
+		if args.kwarg is not None:
+			parameters.append((args.kwarg, _empty))
+		return {arg.arg: (self.segment(arg.annotation) if arg.annotation is not None else _empty,
+							default if default is _empty else _literal(default, self.segment(default)))
+				for arg, default in parameters if arg.arg != 'self'}
+
+	def _signature_positions(self, node) -> tuple:
+		# return the start position of the signature and the position of ':' at the end of signature
+		# the search of ':' starts after the last element of signature, there is no string between this element and ':'
+		if isinstance(node, ast.ClassDef):
+			elements = node.bases + [keyword.value for keyword in node.keywords]
+		else:
+			args = node.args
+			elements = args.posonlyargs + args.args + args.kwonlyargs + args.defaults
+			elements += [node for node in [args.vararg, args.kwarg, node.returns] + args.kw_defaults if node is not None]
+		elements += getattr(node, 'type_params', [])
+		start = self.offset(node.lineno, node.col_offset)
+		search_start = self.offset(*max(map(_node_end, elements))) if len(elements) > 0 else start
+		return start, _find_colon(self.source_code, search_start)
+
+
+def _find_colon(source_code: str, start: int) -> int:
+	# return the position of the first ':' after 'start' which is not in a comment
+	while True:
+		colon = source_code.find(':', start)
+		comment = source_code.find('#', start, colon) if colon != -1 else -1
+		if comment == -1:
+			return colon
+		start = source_code.find('\n', comment)
+		if start == -1:
+			return -1
+
+
+def index_source(source_code: str, decorator_name: str = 'to_document') -> SourceIndex:
+	"""A function to index a source code.
+
+	Parameters
+	----------
+	source_code : str
+		The source code to index
+	OPTIONAL[decorator_name] : str
+		The name of decorator 'to_document'
+		Default: 'to_document'
+
+	Returns
+	-------
+	index : SourceIndex
+		The index of source code
+	"""
+	return SourceIndex(source_code, decorator_name)
@@ -1,13 +1,24 @@
 """Module to generate Functions documentation string."""
 import os
+import stat
 import traceback
+from time import perf_counter
+from contextlib import nullcontext
 from inspect import getsource, getmembers, isfunction, signature, _empty, ismodule
-from distutils.dir_util import copy_tree, DistutilsFileError
 import re
-from distutils.dir_util import copy_tree
 
 from .documented import FunctionToDocument, ClassToDocument
-from .utils import Formatter, _modules_utils
+from .utils import BaseFormatter, Formatter, _modules_utils, _fs_utils, _scanner, _import_timer, _source_io, _memory_profile
+from .sinks import OutputSink, MemorySink, diff_lines
+from .analysis import SourceIndex
+from .workers import ImportWorkerPool, WorkerError
+from .discovery import discover_modules, PathMatcher
+from .prefilter import filter_modules
+from .symbol_index import SymbolIndex, source_hash
+from .journal import FileResult, RunSummary, Journal
+from .bytecode import refresh_bytecode
+from .result_cache import ResultCache, _formatter_key
+from .progress import Progress
 from . import _logger
 
 
@@ -27,10 +38,11 @@ def get_function_positions(func_name: str, source_code: str) -> tuple:
 		The start and end positions of the class
 	"""
 	_logger.debug(f"get the function positions of '{func_name}'...")
-	r = r'def\s+{name}\s*\(.*?\)\s*[-, >]*[a-z, A-Z, \[, \], \,]*\:'.format(name=func_name)
-	result = re.search(r, source_code, re.MULTILINE | re.DOTALL)
-	_logger.debug(f"list result for '{func_name}': {re.findall(r, source_code)}")
-	return result.span()
+	# the source code is scanned once (in linear time) for all functions and class
+	positions = _scanner.get_scanner(source_code).function_positions(func_name)
+	if positions is None:
+		raise ValueError(f"The signature of function '{func_name}' was not found in the source code")
+	return positions
 
 
 def get_class_positions(class_name: str, source_code: str) -> tuple:
@@ -49,8 +61,10 @@ def get_class_positions(class_name: str, source_code: str) -> tuple:
 		The start and end positions of the class
 	"""
 	_logger.debug(f"get the class positions of '{class_name}'...")
-	r = r'class\s+{name}.*?\s*:'.format(name=class_name)
-	return re.search(r, source_code, re.MULTILINE | re.DOTALL).span()
+	positions = _scanner.get_scanner(source_code).class_positions(class_name)
+	if positions is None:
+		raise ValueError(f"The signature of class '{class_name}' was not found in the source code")
+	return positions
 
 
 def get_docstring_start(end_signature: int, source_code: str) -> int:
@@ -93,14 +107,39 @@ def write_docstring(docstring: str, source_code: str, start: int) -> str:
 	return source_code
 
 
-def build_function_docstring(func_to_doc: FunctionToDocument, formatter: Formatter) -> str:
+def write_docstrings(docstrings: list, source_code: str) -> str:
+	"""Add all docstrings in the text of source file in one pass.
+	
+	Parameters
+	----------
+	docstrings : List[Tuple[int, str]]
+		The list of docstrings to insert with their start position in 'source_code'
+	source_code : str
+		The source code where add the docstrings
+	
+	Returns
+	-------
+	source_code : str
+		The new source code with docstrings
+	"""
+	_logger.debug(f"Add {len(docstrings)} docstrings to the source code...")
+	parts, end = [], 0
+	for start, docstring in sorted(docstrings, key=lambda item: item[0]):
+		parts.append(source_code[end:start])
+		parts.append(docstring)
+		end = start
+	parts.append(source_code[end:])
+	return ''.join(parts)
+
+
+def build_function_docstring(func_to_doc: FunctionToDocument, formatter: BaseFormatter) -> str:
 	"""A function to build the docstring of a functi
 	
 	Parameters
 	----------
 	func_to_doc : FunctionToDocument
 		The function to document
-	formatter : Formatter
+	formatter : BaseFormatter
 		The formatter to use
 	
 	Returns
@@ -111,20 +150,17 @@ def build_function_docstring(func_to_doc: FunctionToDocument, formatter: Formatt
 	_logger.debug(f"Build function docstring for '{func_to_doc.name}'...")
 	return formatter.format_docstring(nb_base_tab=func_to_doc.nb_base_tab,
 										description=func_to_doc.description,
-										fields={
-													'Parameters': func_to_doc.parameters,
-													'Returns': func_to_doc.returns
-												})
+										fields=func_to_doc.get_docstring_fields())
 
 
-def build_class_docstring(class_to_doc: ClassToDocument, formatter: Formatter) -> str:
+def build_class_docstring(class_to_doc: ClassToDocument, formatter: BaseFormatter) -> str:
 	"""A function to build the docstring of a class
 	
 	Parameters
 	----------
 	class_to_doc : ClassToDocument
 		The class to document
-	formatter : Formatter
+	formatter : BaseFormatter
 		The formatter to use
 	
 	Returns
@@ -135,11 +171,31 @@ def build_class_docstring(class_to_doc: ClassToDocument, formatter: Formatter) -
 	_logger.debug(f"Build class docstring for '{class_to_doc.name}'...")
 	return formatter.format_docstring(nb_base_tab=class_to_doc.nb_base_tab,
 										description=class_to_doc.description,
-										fields={
-													'Attributes': class_to_doc.attributes,
-													'Public methods': class_to_doc.public_methods,
-													'Protected methods': class_to_doc.protected_methods,
-												})
+										fields=class_to_doc.get_docstring_fields())
+
+
+def build_docstrings(symbols: list, formatter: BaseFormatter) -> list:
+	"""A function to build the docstrings of all symbols of a module.
+	If the formatter implements 'format_many', all docstrings are built with one call,
+	else each docstring is built with 'format_docstring'.
+	
+	Parameters
+	----------
+	symbols : List[Union[FunctionToDocument, ClassToDocument]]
+		The functions and class to document
+	formatter : BaseFormatter
+		The formatter to use
+	
+	Returns
+	-------
+	docstrings : List[str]
+		The docstrings of symbols, in the same order
+	"""
+	_logger.debug(f"Build {len(symbols)} docstrings...")
+	if hasattr(formatter, 'format_many'):
+		return list(formatter.format_many(symbols))
+	return [build_class_docstring(symbol, formatter) if isinstance(symbol, ClassToDocument) else build_function_docstring(symbol, formatter)
+			for symbol in symbols]
 
 
 def _remove_decorators(source_code: str, decorator_name: str = "to_document") -> str:
@@ -163,7 +219,129 @@ def _remove_decorators(source_code: str, decorator_name: str = "to_document") ->
 	return re.sub(r, "", source_code)
 
 
-def create_functions_docstrings(list_functions: list, source_code: str, formatter: Formatter) -> str:
+def get_signature_positions(symbols: list, source_code: str) -> list:
+	"""A function to get the signature positions of all symbols of a list.
+	
+	Parameters
+	----------
+	symbols : List[Union[FunctionToDocument, ClassToDocument]]
+		The functions and class to document
+	source_code : str
+		The source code
+	
+	Returns
+	-------
+	positions : List[Tuple[int, int]]
+		The start position of signature and the position of ':' at the end of signature of each symbol
+
+	Notes
+	-----
+	The methods of a class follow their class in 'symbols' (see `_with_methods`), a method is only searched in its class.
+	"""
+	scanner = _scanner.get_scanner(source_code)
+	positions, class_, methods = [], None, set()
+	for symbol in symbols:
+		if isinstance(symbol, ClassToDocument):
+			class_, methods = symbol, {id(method) for method in symbol.methods_to_document}
+		if hasattr(symbol, 'signature_positions'):  # symbol found with the static analysis or loaded from an index
+			positions.append(symbol.signature_positions)
+		elif isinstance(symbol, ClassToDocument):
+			positions.append(_find_positions(scanner, 'class', symbol, source_code))
+		else:
+			positions.append(_find_positions(scanner, 'def', symbol, source_code, class_ if id(symbol) in methods else None))
+	return positions
+
+
+def _find_positions(scanner: _scanner.SignatureScanner, kind: str, symbol, source_code: str, class_: ClassToDocument = None) -> tuple:
+	# return the signature positions of a symbol with its qualified name, a method is searched in the headers of its class.
+	# if the qualified name is not in the source code (function created by another function...), the first header with the name is used
+	qualnames = [getattr(symbol, 'qualname', symbol.name)]
+	if class_ is not None:
+		qualnames.append(f"{getattr(class_, 'qualname', class_.name)}.{symbol.name}")
+	for qualname in qualnames:
+		positions = scanner.positions(kind, qualname)
+		if positions is not None:
+			return positions
+	if kind == 'class':
+		return get_class_positions(symbol.name, source_code)
+	return get_function_positions(symbol.name, source_code)
+
+
+def get_docstrings(symbols: list, source_code: str, formatter: BaseFormatter, positions: list = None) -> list:
+	"""A function to build the docstrings of all symbols of a list with their start position.
+	
+	Parameters
+	----------
+	symbols : List[Union[FunctionToDocument, ClassToDocument]]
+		The functions and class to document
+	source_code : str
+		The source code
+	formatter : BaseFormatter
+		The formatter to use
+	OPTIONAL[positions] : List[Tuple[int, int]]
+		The signature positions of symbols, if they were already computed with `get_signature_positions`
+		Default: None
+	
+	Returns
+	-------
+	docstrings : List[Tuple[int, str]]
+		The start position in 'source_code' and the docstring of each symbol
+	"""
+	positions = get_signature_positions(symbols, source_code) if positions is None else positions
+	return [(get_docstring_start(pos[1], source_code), docstring)
+			for pos, docstring in zip(positions, build_docstrings(symbols, formatter))]
+
+
+def _with_methods(list_class: list) -> list:
+	# return the list of class followed by their methods to document
+	symbols = []
+	for class_ in list_class:
+		symbols.append(class_)
+		symbols.extend(class_.methods_to_document)
+	return symbols
+
+
+def get_functions_docstrings(list_functions: list, source_code: str, formatter: BaseFormatter) -> list:
+	"""A function to build the docstrings of all functions of a list with their start position.
+	
+	Parameters
+	----------
+	list_functions : list
+		The list of functions to document
+	source_code : str
+		The source code
+	formatter : BaseFormatter
+		The formatter to use
+	
+	Returns
+	-------
+	docstrings : List[Tuple[int, str]]
+		The start position in 'source_code' and the docstring of each function
+	"""
+	return get_docstrings(list_functions, source_code, formatter)
+
+
+def get_class_docstrings(list_class: list, source_code: str, formatter: BaseFormatter) -> list:
+	"""A function to build the docstrings of all class of a list and of their methods with their start position.
+	
+	Parameters
+	----------
+	list_class : list
+		The list of class to document
+	source_code : str
+		The source code
+	formatter : BaseFormatter
+		The formatter to use
+	
+	Returns
+	-------
+	docstrings : List[Tuple[int, str]]
+		The start position in 'source_code' and the docstring of each class and method
+	"""
+	return get_docstrings(_with_methods(list_class), source_code, formatter)
+
+
+def create_functions_docstrings(list_functions: list, source_code: str, formatter: BaseFormatter) -> str:
 	"""A function to create docstring for all functions of a list.
 	
 	Parameters
@@ -172,7 +350,7 @@ def create_functions_docstrings(list_functions: list, source_code: str, formatte
 		The list of functions to document
 	source_code : str
 		The source code
-	formatter : Formatter
+	formatter : BaseFormatter
 		The formatter to use
 	
 	Returns
@@ -181,15 +359,10 @@ def create_functions_docstrings(list_functions: list, source_code: str, formatte
 		The new source code with docstrings
 	"""
 	_logger.info("Create functions docstrings...")
-	for func in list_functions:
-		_logger.debug(f"Create function docstring of {func.name}")
-		docstring = build_function_docstring(func, formatter)
-		pos = get_function_positions(func.name, source_code)
-		source_code = write_docstring(docstring, source_code, get_docstring_start(pos[1], source_code))
-	return source_code
+	return write_docstrings(get_functions_docstrings(list_functions, source_code, formatter), source_code)
 
 
-def create_class_docstrings(list_class: list, source_code: str, formatter: Formatter):
+def create_class_docstrings(list_class: list, source_code: str, formatter: BaseFormatter):
 	"""A function to create docstring for all class of a list.
 	
 	Parameters
@@ -198,7 +371,7 @@ def create_class_docstrings(list_class: list, source_code: str, formatter: Forma
 		The list of class to document
 	source_code : str
 		The source code
-	formatter : Formatter
+	formatter : BaseFormatter
 		The formatter to use
 
 	Returns
@@ -207,13 +380,7 @@ def create_class_docstrings(list_class: list, source_code: str, formatter: Forma
 		The source code with news docstrings
 	"""
 	_logger.info("Create class docstrings...")
-	for class_ in list_class:
-		_logger.debug(f"Create class docstring of {class_.name}")
-		docstring = build_class_docstring(class_, formatter)
-		pos = get_class_positions(class_.name, source_code)
-		source_code = write_docstring(docstring, source_code, get_docstring_start(pos[1], source_code))
-		source_code = create_functions_docstrings(class_.methods_to_document, source_code, formatter)
-	return source_code
+	return write_docstrings(get_class_docstrings(list_class, source_code, formatter), source_code)
 
 
 def _get_members_to_document(module):
@@ -238,8 +405,8 @@ def _get_members_to_document(module):
 			list_func.append(member[1])
 		elif isinstance(member[1], ClassToDocument) and member[1].obj.__module__ == module.__name__:
 			list_class.append(member[1])
-	_logger.debug(f"list_func = {list_func}")
-	_logger.debug(f"list_class = {list_class}")
+	_logger.debug("list_func = %s", list_func)
+	_logger.debug("list_class = %s", list_class)
 	return list_func, list_class
 
 
@@ -262,7 +429,7 @@ def _safe_import_module(path_or_module):
 		_logger.info(f"Import module from path: '{path_or_module}'...")
 		_logger.debug(f"path_or_module: {path_or_module}")
 		try:
-			return os.path.abspath(path_or_module), _modules_utils._import_from_path(path_or_module)
+			return os.path.abspath(path_or_module), _modules_utils._import_from_file(path_or_module)
 		except ImportError:	
 			_logger.error(f"The module from path '{path_or_module}', was not founded or we can't import this module")
 			_logger.debug(traceback.format_exc())
@@ -277,15 +444,250 @@ def _safe_import_module(path_or_module):
 	raise ValueError(f"'path_or_module' must be an instance of str or a module, not a {type(path_or_module)}")
 
 
-def create_docstrings_from_module(path_or_module, formatter: Formatter = Formatter.simple_format(), new_path: str = None,
-								remove_decorator: bool = True, decorator_name: str = 'to_document'):
+def create_docstrings_from_source(source_code: str, formatter: BaseFormatter = Formatter.simple_format(), remove_decorator: bool = True,
+									decorator_name: str = 'to_document', index: SourceIndex = None) -> str:
+	"""Create all docstrings of functions and class decorated with 'to_document' decorator in a source code.
+	The source code is analysed without importing it.
+	
+	Parameters
+	----------
+	source_code : str
+		The source code to document.
+	OPTIONAL[formatter] : BaseFormatter
+		The formatter to use.
+		Default: The 'simple' formatter. Get with `pyDocStr.utils.Formatter.simple_format()`
+	OPTIONAL[remove_decorator] : bool
+		If True, decorators 'to_document' specify with 'decorator_name' argument are removed.
+		Default: True
+	OPTIONAL[decorator_name] : str
+		The decorator name use for 'to_document'
+		Default: to_document
+	OPTIONAL[index] : SourceIndex
+		The index of source code, if it was already built.
+		Default: None
+	
+	Returns
+	-------
+	source_code : str
+		The new source code with docstrings
+	"""
+	if index is None:
+		_logger.info("Index the source code...")
+		index = SourceIndex(source_code, decorator_name)
+	_logger.debug("list_func = %s", index.list_func)
+	_logger.debug("list_class = %s", index.list_class)
+
+	_logger.info("Create functions and class docstrings...")
+	new_source_code = write_docstrings(get_docstrings(index.symbols(), source_code, formatter), source_code)
+	if remove_decorator:
+		new_source_code = _remove_decorators(new_source_code, decorator_name=decorator_name)
+	return new_source_code
+
+
+def _module_path(path_or_module) -> str:
+	# return the path of python file of a module or of a path (the path of __init__.py for a package)
+	path = os.path.abspath(path_or_module if isinstance(path_or_module, str) else path_or_module.__file__)
+	if os.path.isdir(path):
+		path = os.path.join(path, '__init__.py')
+	return path
+
+
+def _write_new_source_code(path: str, source_code: str, new_source_code: str, new_path: str = None, sink: OutputSink = None) -> str:
+	# write the new source code of a file in the sink or in 'new_path' (the file is overwritten if 'new_path' is None),
+	# return the path of file written (None if nothing was written in a file)
+	written = None
+	if sink is not None:
+		_logger.info(f"Add the new source code with docstring to '{sink.path}'...")
+		sink.write(path, source_code, new_source_code)
+	elif new_path is not None and os.path.abspath(new_path) != path:
+		if new_source_code == source_code and os.path.exists(new_path):
+			_logger.info(f"The file '{new_path}' is not changed.")
+			return None
+		# the file of output tree can be a hardlink of the original file
+		data = _source_io.encode_like(path, source_code, new_source_code)
+		_fs_utils.break_link(new_path)
+		_logger.info(f"Write the new source code with docstring in '{new_path}'...")
+		with open(new_path, 'wb') as f:
+			f.write(data)
+		written = os.path.abspath(new_path)
+	elif new_source_code == source_code:  # the file is not touched (its time and its bytecode stay valid)
+		_logger.info(f"The file '{path}' is not changed.")
+		return None
+	else:
+		# the new source code is encoded with the encoding and the newlines of the file before the file is truncated
+		data = _source_io.encode_like(path, source_code, new_source_code)
+		# the file can be a hardlink of another file (an output tree documented in place): the other file is not written
+		mode = os.stat(path).st_mode
+		linked = _fs_utils.break_link(path)
+		_logger.info(f"Write the new source code with docstring in '{path}'...")
+		with open(path, 'wb') as f:
+			f.write(data)
+		if linked:
+			os.chmod(path, stat.S_IMODE(mode))
+		written = path
+	_logger.info(f"The file '{path}' was documented with success.")
+	return written
+
+
+def _write_outputs(path: str, source_code: str, new_source_codes: list, outputs: list, sink: OutputSink = None,
+					nb_symbols: int = 0) -> FileResult:
+	# write the new source code of each output (formatter, new path) and return the result of file
+	changed, written = False, []
+	for (_, new_path), new_source_code in zip(outputs, new_source_codes):
+		with _memory_profile.stage('output'):
+			written_path = _write_new_source_code(path, source_code, new_source_code, new_path, sink)
+		changed = changed or new_source_code != source_code
+		if written_path is not None:  # its bytecode is stale (the time of file changed)
+			written.append(written_path)
+	return FileResult(path, 'documented' if changed else 'unchanged', nb_symbols, written=written)
+
+
+def _finish_file(path: str, source_code: str, symbols: list, outputs: list, remove_decorator: bool = True,
+					decorator_name: str = 'to_document', sink: OutputSink = None, symbol_index: SymbolIndex = None,
+					cache: ResultCache = None, static: bool = False) -> FileResult:
+	# document the symbols found in a file for each output (formatter, new path) and return the result of file,
+	# the positions of signatures are found once for all outputs
+	with _memory_profile.stage('positions'):
+		positions = get_signature_positions(symbols, source_code)
+	if symbol_index is not None:
+		with _memory_profile.stage('index'):
+			symbol_index.add(path, source_code, symbols, positions)
+	new_source_codes = []
+	for formatter, _ in outputs:
+		new_source_code = _document_symbols(source_code, symbols, formatter, remove_decorator, decorator_name, positions)
+		if cache is not None:
+			with _memory_profile.stage('cache'):
+				cache.put(cache.key(source_code, formatter, decorator_name, remove_decorator, static), new_source_code)
+		new_source_codes.append(new_source_code)
+	return _write_outputs(path, source_code, new_source_codes, outputs, sink, len(symbols))
+
+
+def _static_cache(cache: ResultCache, static: bool) -> ResultCache:
+	# the cache is only used with the static analysis: the documentation of an imported module also depends on the modules
+	# it imports (inherited members, evaluated defaults), which are not in the key of cache
+	if cache is not None and not static:
+		_logger.warning(f"The cache '{cache.path}' is not used: it's only used with the static analysis")
+		return None
+	return cache
+
+
+def _from_cache(path: str, outputs: list, cache: ResultCache, remove_decorator: bool = True, decorator_name: str = 'to_document',
+				static: bool = False) -> tuple:
+	# return the source code of a file and the new source code of each output found in the cache,
+	# None if an output is not in the cache (the file is documented again)
+	try:
+		source_code = _read_source(path)
+	except (OSError, UnicodeDecodeError):
+		return None
+	new_source_codes = []
+	for formatter, _ in outputs:
+		with _memory_profile.stage('cache'):
+			new_source_code = cache.get(cache.key(source_code, formatter, decorator_name, remove_decorator, static))
+		if new_source_code is None:
+			return None
+		new_source_codes.append(new_source_code)
+	_logger.info(f"The file '{path}' is documented with the cache")
+	return source_code, new_source_codes
+
+
+def _analyse_file(path_or_module, decorator_name: str = 'to_document', static: bool = False, pool: ImportWorkerPool = None,
+					symbol_index: SymbolIndex = None, package: tuple = None):
+	# return the path, the source code and the symbols to document of a file (the methods follow their class),
+	# or a failed result if the module can't be imported (a file of 'package' (folder, name) is imported as a submodule of this package)
+	symbols = None
+	if symbol_index is not None:
+		path = _module_path(path_or_module)
+		source_code = _read_source(path)
+		with _memory_profile.stage('index'):
+			symbols = symbol_index.get_symbols(path, source_code)
+		if symbols is not None:
+			_logger.info(f"Start to document the file '{path}' with the symbols of the index")
+
+	if symbols is not None:
+		pass
+	elif static:
+		path = _module_path(path_or_module)
+		_logger.info(f"Start to document the file '{path}' with the static analysis")
+		source_code = _read_source(path) if symbol_index is None else source_code
+		with _memory_profile.stage('analysis'):
+			symbols = SourceIndex(source_code, decorator_name).symbols()
+	elif pool is not None:
+		path = _module_path(path_or_module)
+		_logger.info(f"Start to document the file '{path}' with an import worker")
+		try:
+			with _memory_profile.stage('workers'):
+				list_func, list_class = pool.analyse(path)
+		except WorkerError as e:
+			_logger.error(str(e))
+			return FileResult(path, 'failed', error=str(e))
+		source_code = _read_source(path) if symbol_index is None else source_code
+		symbols = list_func + _with_methods(list_class)
+	else:
+		with _import_timer.importing(_module_path(path_or_module)), _memory_profile.stage('import'):
+			if package is not None:
+				path, module = _module_path(path_or_module), _modules_utils._import_from_package(path_or_module, *package)
+			else:
+				path, module = _safe_import_module(path_or_module)
+		if module is None:
+			return FileResult(path, 'failed', error="The module can't be imported")
+
+		_logger.info(f"Start to document the module '{module.__name__}'")
+		with _memory_profile.stage('members'):
+			list_func, list_class = _get_members_to_document(module)
+			symbols = list_func + _with_methods(list_class)
+
+		_logger.info("Get source code...")
+		# the file is read like with the other analysis ('getsource' adds a final newline)
+		with _memory_profile.stage('source'):
+			source_code = _read_source(path) if symbol_index is None else source_code
+	_logger.debug("symbols = %s", symbols)
+	return path, source_code, symbols
+
+
+def _document_symbols(source_code: str, symbols: list, formatter: BaseFormatter, remove_decorator: bool = True,
+						decorator_name: str = 'to_document', positions: list = None) -> str:
+	# return the new source code with the docstrings of symbols (the methods follow their class)
+	_logger.info("Create functions and class docstrings...")
+	with _memory_profile.stage('render'):
+		docstrings = get_docstrings(symbols, source_code, formatter, positions)
+	with _memory_profile.stage('insert'):
+		new_source_code = write_docstrings(docstrings, source_code)
+	if remove_decorator:
+		with _memory_profile.stage('remove_decorators'):
+			new_source_code = _remove_decorators(new_source_code, decorator_name=decorator_name)
+	return new_source_code
+
+
+def _read_source(path: str) -> str:
+	# the file is decoded with its encoding (BOM or PEP 263 cookie) and its newlines are normalized
+	return _source_io.read_source(path)
+
+
+def _try_file(module_path: str, func, *args) -> FileResult:
+	# document a file with 'func' and measure it, a failure is returned as a failed result and doesn't stop the run
+	start = perf_counter()
+	try:
+		with _memory_profile.file(module_path):
+			result = func(*args)
+	except Exception as e:
+		_logger.error(f"The file '{module_path}' can't be documented: {type(e).__name__}: {e}")
+		_logger.debug(traceback.format_exc())
+		result = FileResult(module_path, 'failed', error=f"{type(e).__name__}: {e}")
+	result.duration = perf_counter() - start
+	return result
+
+
+def create_docstrings_from_module(path_or_module, formatter: BaseFormatter = Formatter.simple_format(), new_path: str = None,
+								remove_decorator: bool = True, decorator_name: str = 'to_document', sink: OutputSink = None,
+								static: bool = False, pool: ImportWorkerPool = None, symbol_index: SymbolIndex = None, bytecode: bool = False,
+								cache: ResultCache = None):
 	"""Create all docstrings of functions and class decorated with 'to_document' decorator for a file.
 	
 	Parameters
 	----------
 	path_or_module : Union[str, module]
 		The path of python file to document or the module to document.
-	OPTIONAL[formatter] : Formatter
+	OPTIONAL[formatter] : BaseFormatter
 		The formatter to use.
 		Default: The 'simple' formatter. Get with `pyDocStr.utils.Formatter.simple_format()`
 	OPTIONAL[new_path] : str
@@ -297,40 +699,65 @@ def create_docstrings_from_module(path_or_module, formatter: Formatter = Formatt
 	OPTIONAL[decorator_name] : str
 		The decorator name use for 'to_document'
 		Default: to_document
+	OPTIONAL[sink] : OutputSink
+		If specified, the new source code is added to this sink instead of being written in a file ('new_path' is not used).
+		Default: None
+	OPTIONAL[static] : bool
+		If True, the source code is analysed without importing the module.
+		Default: False
+	OPTIONAL[pool] : ImportWorkerPool
+		If specified (and 'static' is False), the module is imported in a worker of this pool instead of the current process.
+		Default: None
+	OPTIONAL[symbol_index] : SymbolIndex
+		If specified, the symbols of the file are loaded from this index if the file didn't change,
+		else the file is analysed and its symbols are added to the index.
+		Default: None
+	OPTIONAL[bytecode] : bool
+		If True, the bytecode ('__pycache__') of the file written is refreshed.
+		Default: False
+	OPTIONAL[cache] : ResultCache
+		If specified, the new source code is copied from this cache if a file with the same content was documented
+		with the same settings (the file is not analysed), else the new source code is added to the cache.
+		The cache is only used with the static analysis (an imported module also depends on the modules it imports).
+		Default: None
 
 	Returns
 	-------
-	None
+	result : FileResult
+		The result of file: 'documented', 'unchanged' or 'failed' (if the module can't be imported)
 	"""
-	path, module = _safe_import_module(path_or_module)
+	outputs = [(formatter, new_path)]
+	cache = _static_cache(cache, static)
+	cached = None
+	with _memory_profile.file(_module_path(path_or_module)):
+		if cache is not None and (not isinstance(path_or_module, str) or os.path.exists(path_or_module)):
+			cached = _from_cache(_module_path(path_or_module), outputs, cache, remove_decorator, decorator_name, static)
+		if cached is not None:
+			result = _write_outputs(_module_path(path_or_module), *cached, outputs, sink)
+		else:
+			analysed = _analyse_file(path_or_module, decorator_name, static, pool, symbol_index)
+			if isinstance(analysed, FileResult):
+				return analysed
+			path, source_code, symbols = analysed
+			result = _finish_file(path, source_code, symbols, outputs, remove_decorator, decorator_name, sink, symbol_index, cache, static)
+	if bytecode:
+		refresh_bytecode(result.written, workers=1)
+	return result
 
-	_logger.info(f"Start to document the module '{module.__name__}'")
-	list_func, list_class = _get_members_to_document(module)
-
-	_logger.info("Get source code...")
-	source_code = getsource(module)
-
-	new_source_code = create_functions_docstrings(list_func, source_code, formatter)
-	new_source_code = create_class_docstrings(list_class, new_source_code, formatter)
-	if remove_decorator:
-		new_source_code = _remove_decorators(new_source_code, decorator_name=decorator_name)
 
-	new_path = path if new_path is None else new_path
-	_logger.info(f"Write the new source code with docstring in '{new_path}'...")
-	with open(new_path, 'w') as f:
-		f.write(new_source_code)
-	_logger.info(f"The file '{path}' was documented with success.")
-
-
-def create_docstrings_from_package(path_or_package, formatter: Formatter = Formatter.simple_format(), new_package_path: str = None,
-									subpackages: bool = False, remove_decorator: bool = True, decorator_name: str = 'to_document'):
+def create_docstrings_from_package(path_or_package, formatter: BaseFormatter = Formatter.simple_format(), new_package_path: str = None,
+									subpackages: bool = False, remove_decorator: bool = True, decorator_name: str = 'to_document',
+									sink: OutputSink = None, static: bool = False, pool: ImportWorkerPool = None,
+									include: list = None, exclude: list = None, symbol_index: SymbolIndex = None,
+									link_mode: str = 'auto', journal: str = None, outputs: list = None, bytecode: bool = False,
+									cache: ResultCache = None, memprofile: bool = False, progress: Progress = None):
 	"""Create docstrings for all python files in a package, for functions and class decorated with 'to_document' decorator.
 	
 	Parameters
 	----------
 	path_or_package : Union[str, module]
 		The path of package to document or the package to document.
-	OPTIONAL[formatter] : Formatter
+	OPTIONAL[formatter] : BaseFormatter
 		The formatter to use.
 		Default: The 'simple' formatter. Get with `pyDocStr.utils.Formatter.simple_format()`
 	OPTIONAL[new_package_path] : str
@@ -345,59 +772,421 @@ def create_docstrings_from_package(path_or_package, formatter: Formatter = Forma
 	OPTIONAL[decorator_name] : str
 		The decorator name use for 'to_document'
 		Default: to_document
+	OPTIONAL[sink] : OutputSink
+		If specified, the new files are added to this sink and 'new_package_path' is not used.
+		If the root of sink is None, the paths in the sink are relative to the package folder.
+		Default: None
+	OPTIONAL[static] : bool
+		If True, the python files of the package folder are analysed without importing them.
+		Default: False
+	OPTIONAL[pool] : ImportWorkerPool
+		If specified (and 'static' is False), the python files of the package folder are imported in parallel
+		in the workers of this pool instead of the current process.
+		Default: None
+	OPTIONAL[include] : List[str]
+		The glob patterns of python files to document, relative to the package folder. If None, all python files are documented.
+		Default: None
+	OPTIONAL[exclude] : List[str]
+		The glob patterns of python files or folders to not document, relative to the package folder.
+		Default: None
+	OPTIONAL[symbol_index] : SymbolIndex
+		If specified, the files which didn't change are documented with the symbols of this index (they are not analysed),
+		and the symbols of the other files are added to the index.
+		Default: None
+	OPTIONAL[link_mode] : str
+		How the files are created in 'new_package_path' before the documented files are written: 'reflink' (copy-on-write clone),
+		'hardlink', 'copy', or 'auto' to use a reflink if the file system supports it, else a hardlink, else a copy.
+		Default: 'auto'
+	OPTIONAL[journal] : str
+		The path of a checkpoint journal. The result of each file is appended to the journal, if the run is interrupted,
+		the next run with the same journal skips the files already documented. The journal is removed at the end of a run without failures.
+		It's not used with a sink.
+		Default: None
+	OPTIONAL[outputs] : List[Tuple[BaseFormatter, str]]
+		The pairs (formatter, new package path) to write the package documented with several formatters.
+		The package is discovered and analysed once, only the docstrings are built and written for each output.
+		If specified, 'formatter' and 'new_package_path' are not used. Several outputs must have distinct folders and can't be used with a sink.
+		Default: None
+	OPTIONAL[bytecode] : bool
+		If True, the bytecode ('__pycache__') of the files written is refreshed right after the run, in parallel.
+		Default: False
+	OPTIONAL[cache] : ResultCache
+		If specified, the files documented with the same content and the same settings by a previous run (of any checkout)
+		are copied from this cache (they are not analysed), the new source code of the other files is added to the cache.
+		The cache is only used with the static analysis (an imported module also depends on the modules it imports).
+		Default: None
+	OPTIONAL[memprofile] : bool
+		If True, the memory allocated by each stage and each file is traced with tracemalloc (slow) and saved in 'summary.memory'.
+		Default: False
+	OPTIONAL[progress] : Progress
+		If specified, the progress of run (files/s, estimated time left, failures so far) is reported by this progress.
+		Default: None
 
 	Returns
 	-------
-	None
+	summary : RunSummary
+		The result of each file, None if the package was not found. A failure of a file doesn't stop the run.
 	"""
 
-	def new_path_module(module, package_path: str):
-		# return the new path for a module
-		if new_package_path is not None:
-			module_path = os.path.abspath(module.__file__)
-			print(module.__name__, module_path)
-			base_path = os.path.commonpath([os.path.abspath(package_path), os.path.abspath(module.__file__)])
-			relative_path = module_path[len(base_path):].strip("/") if base_path != module_path else './'
-			if os.path.isdir(relative_path):  # if module is a package
-				relative_path = os.path.join(relative_path, '__init__.py')
-			return os.path.join(new_package_path, relative_path)
-		return None
-
 	if isinstance(path_or_package, str) and not os.path.exists(path_or_package):
 		_logger.error((f"The file {path_or_package} wasn't found"))
-		return
-
-	new_package_path = os.path.abspath(new_package_path)  # safe new path
+		return None
 
-	path, package = _safe_import_module(path_or_package)
-	if package is None:
-		return
+	if outputs is None:
+		outputs = [(formatter, new_package_path)]
+	cache = _static_cache(cache, static)
+	if len(outputs) > 1 and sink is not None:
+		raise ValueError("Several outputs can't be written in a sink")
+	if sink is not None:
+		outputs = [(outputs[0][0], None)]
+	else:
+		outputs = [(formatter, os.path.abspath(new_package_path) if new_package_path is not None else None)  # safe new path
+					for formatter, new_package_path in outputs]
+	output_paths = [new_package_path for _, new_package_path in outputs]
+	if len(outputs) > 1 and (None in output_paths or len(set(output_paths)) != len(output_paths)):
+		raise ValueError(f"Several outputs must have distinct folders: {output_paths}")
 
-	_logger.info(f"Start to document the package: {package.__name__}")
+	package_dir = os.path.dirname(_module_path(path_or_package))
+	package_name = path_or_package.__name__ if ismodule(path_or_package) else os.path.basename(package_dir)
+	_logger.info(f"Start to document the package '{package_name}' ({'static analysis' if static else 'import workers' if pool is not None else 'import'})")
 	_logger.info(f"Document subpackages: {subpackages}")
+	if sink is not None and sink.root is None:
+		sink.root = package_dir
+	module_paths = discover_modules(package_dir, subpackages, include, exclude)
+	_logger.debug("Python files of package '%s':\n%s", package_name, module_paths)
+	_, module_paths = _prefilter(module_paths, decorator_name)  # the files without the decorator are not in the summary
+	for new_package_path in output_paths:
+		if new_package_path is not None:
+			# the files are reflinked or hardlinked, only the documented files are written
+			# (the files of an existing tree are created again if their source changed since the last run)
+			counts = _fs_utils.link_tree(package_dir, new_package_path, link_mode)
+			_logger.info(f"Output tree '{new_package_path}' created: {counts}")
+
+	def file_outputs(module_path: str) -> list:
+		# the pairs (formatter, new path) of a file
+		relative_path = os.path.relpath(module_path, package_dir)
+		return [(formatter, os.path.join(new_package_path, relative_path) if new_package_path is not None else None)
+				for formatter, new_package_path in outputs]
+
+	summary = RunSummary()
+	if journal is not None and sink is not None:
+		_logger.warning("The journal is not used with a sink: the sink is written again by each run.")
+		journal = None
+	elif journal is not None:
+		# the formatter of each output is in the settings (its class and its formats, loaded from a config file or not)
+		journal = Journal(journal, package_dir, {'package_dir': package_dir, 'subpackages': subpackages,
+												'outputs': [[_formatter_key(formatter), new_package_path] for formatter, new_package_path in outputs],
+												'decorator_name': decorator_name, 'remove_decorator': remove_decorator, 'static': static,
+												'include': include, 'exclude': exclude})
+		for module_path in module_paths:
+			if journal.is_done(module_path):
+				summary.add(FileResult(module_path, 'resumed'))
+		module_paths = [module_path for module_path in module_paths if not journal.is_done(module_path)]
+
+	if progress is not None:
+		progress.start(len(module_paths))
+	try:
+		# the import time of modules and the memory of stages
+		with summary.imports.recording(), summary.memory.recording() if memprofile else nullcontext():
+			for result in _document_files(module_paths, file_outputs, remove_decorator, decorator_name, sink, static, pool,
+											symbol_index, cache, (package_dir, package_name)):
+				summary.add(result)
+				if journal is not None:
+					journal.record(result)
+				if progress is not None:
+					progress.update(result)
+	except BaseException:
+		if journal is not None:
+			journal.close()
+		raise
+	finally:
+		if progress is not None:
+			progress.close()
+	if journal is not None:
+		journal.close(summary)
+	if bytecode:
+		refresh_bytecode(summary.written, workers=pool.nb_workers if pool is not None else None)
+	if cache is not None:
+		_logger.info(str(cache))
+
+	for result in summary.failed:
+		_logger.warning(f"Failed: '{result.path}': {result.error}")
+	_logger.info(f"package '{package_name}' was documented: {summary}")
+	return summary
+
+
+def _expand_paths(paths: list, subpackages: bool = True, include: list = None, exclude: list = None) -> tuple:
+	# return the absolute paths of python files of a list of files and folders (without duplicates) and the paths not found
+	module_paths, missing_paths = [], []
+	matcher = PathMatcher(include, exclude)  # the patterns are compiled once for all folders
+	for path in paths:
+		if os.path.isdir(path):
+			module_paths.extend(discover_modules(os.path.abspath(path), subpackages, matcher=matcher))
+		elif os.path.isfile(path):
+			module_paths.append(os.path.abspath(path))
+		else:
+			_logger.error(f"The path {path} was not found")
+			missing_paths.append(os.path.abspath(path))
+	return list(dict.fromkeys(module_paths)), missing_paths  # a file passed twice (directly and in a folder) is documented once
+
+
+def _largest_first(module_paths: list) -> list:
+	# the largest files are imported first: a large file started last would keep one worker busy while the others are idle
+	def size(module_path: str) -> int:
+		try:
+			return os.path.getsize(module_path)
+		except OSError:
+			return 0
+	return sorted(module_paths, key=size, reverse=True)
+
+
+def _prefilter(module_paths: list, decorator_name: str = 'to_document') -> tuple:
+	# the files without the decorator are not imported nor parsed: return their results ('unchanged') and the other files
+	marked_paths = filter_modules(module_paths, decorator_name)
+	_logger.info(f"{len(marked_paths)}/{len(module_paths)} python files contain the decorator '{decorator_name}'")
+	marked = set(marked_paths)
+	return [FileResult(module_path, 'unchanged') for module_path in module_paths if module_path not in marked], marked_paths
+
+
+def _document_files(module_paths: list, outputs, remove_decorator: bool = True, decorator_name: str = 'to_document',
+					sink: OutputSink = None, static: bool = False, pool: ImportWorkerPool = None, symbol_index: SymbolIndex = None,
+					cache: ResultCache = None, package: tuple = None):
+	# document python files with the decorator for the outputs (a list of pairs (formatter, new path), or a function which
+	# returns the pairs of a file) and yield the result of each file as soon as it's done: the files of cache, the files of index
+	# and the others in the order of analysis (with a pool, the largest files are imported first and the results are yielded
+	# in the order of completion). The files of 'package' (folder, name) are imported as submodules of this package.
+	file_outputs = outputs if callable(outputs) else lambda module_path: outputs
+
+	def document_file(module_path: str):
+		analysed = _analyse_file(module_path, decorator_name, static, pool, symbol_index, package)
+		if isinstance(analysed, FileResult):
+			return analysed
+		path, source_code, symbols = analysed
+		return _finish_file(path, source_code, symbols, file_outputs(path), remove_decorator, decorator_name, sink, symbol_index,
+							cache, static)
 
-	# get the list of modules (getmembers & ismodule) from package (dirname(package) == commonpath([package, module]))
-	list_modules = [member for name, member in getmembers(package) if ismodule(member) and _modules_utils._is_subpackage_of(member, package)]
-	_logger.debug(f"List modules from package {package.__name__}:\n{[module.__name__ for module in list_modules]}")
-	if new_package_path is not None and not os.path.exists(new_package_path):
-		copy_tree(os.path.dirname(path), new_package_path)
-
-	# create docstrings in the __init__ of package
-	create_docstrings_from_module(package, formatter,
-									new_path=new_path_module(package, path),
-									remove_decorator=remove_decorator,
-									decorator_name=decorator_name)
-
-	for module in list_modules:
-		if subpackages and os.path.basename(module.__file__) == "__init__.py":
-			# document a subpackage
-			create_docstrings_from_package(module, formatter, os.path.dirname(new_path_module(module, path)), subpackages, remove_decorator, decorator_name)
-		elif os.path.basename(module.__file__) != "__init__.py":
-			# create docstrings in the modules found
-			create_docstrings_from_module(module, formatter,
-									new_path=new_path_module(module, path),
-									remove_decorator=remove_decorator,
-									decorator_name=decorator_name)
-
-	_logger.info(f"package {package.__name__} was documented with success!")
+	def document_members(module_path: str, members: tuple):
+		_logger.info(f"Start to document the file '{module_path}'")
+		if isinstance(members, WorkerError):
+			raise members
+		symbols = members[0] + _with_methods(members[1])
+		return _finish_file(module_path, _read_source(module_path), symbols, file_outputs(module_path), remove_decorator, decorator_name,
+							sink, symbol_index, cache, static)
+
+	if cache is not None:
+		# the files documented by a previous run are copied from the cache
+		cached_paths = set()
+		for module_path in module_paths:
+			cached = _from_cache(module_path, file_outputs(module_path), cache, remove_decorator, decorator_name, static)
+			if cached is not None:
+				cached_paths.add(module_path)
+				yield _try_file(module_path, _write_outputs, module_path, *cached, file_outputs(module_path), sink)
+		_logger.info(f"{len(cached_paths)}/{len(module_paths)} python files were found in the cache")
+		module_paths = [module_path for module_path in module_paths if module_path not in cached_paths]
+
+	if symbol_index is not None:
+		# the files which didn't change are documented with the symbols of index
+		fresh_paths = {module_path for module_path in module_paths if symbol_index.is_fresh(module_path)}
+		_logger.info(f"{len(fresh_paths)}/{len(module_paths)} python files didn't change since the index was built")
+		for module_path in sorted(fresh_paths):
+			yield _try_file(module_path, document_file, module_path)
+		module_paths = [module_path for module_path in module_paths if module_path not in fresh_paths]
+
+	if pool is not None and not static:
+		for module_path, members in pool.analyse_many(_largest_first(module_paths)):
+			yield _try_file(module_path, document_members, module_path, members)
+	else:
+		for module_path in module_paths:
+			yield _try_file(module_path, document_file, module_path)
+
+
+def create_docstrings_from_files(paths: list, formatter: BaseFormatter = Formatter.simple_format(), subpackages: bool = True,
+									remove_decorator: bool = True, decorator_name: str = 'to_document', sink: OutputSink = None,
+									static: bool = False, pool: ImportWorkerPool = None, include: list = None, exclude: list = None,
+									symbol_index: SymbolIndex = None, bytecode: bool = False, cache: ResultCache = None,
+									memprofile: bool = False, progress: Progress = None):
+	"""Create docstrings for a list of python files and folders (the files passed by a pre-commit hook...) in one run.
+	The files are overwritten (or added to the sink).
+
+	Parameters
+	----------
+	paths : List[str]
+		The paths of python files and of folders. The python files of a folder are found like the files of a package.
+	OPTIONAL[formatter] : BaseFormatter
+		The formatter to use for all files.
+		Default: The 'simple' formatter. Get with `pyDocStr.utils.Formatter.simple_format()`
+	OPTIONAL[subpackages] : bool
+		If True, the python files of the subfolders of a folder are documented.
+		Default: True
+	OPTIONAL[remove_decorator] : bool
+		If True, decorators 'to_document' specify with 'decorator_name' argument are removed.
+		Default: True
+	OPTIONAL[decorator_name] : str
+		The decorator name use for 'to_document'
+		Default: to_document
+	OPTIONAL[sink] : OutputSink
+		If specified, the new files are added to this sink instead of being written.
+		If the root of sink is None, the paths in the sink are relative to the common folder of files.
+		Default: None
+	OPTIONAL[static] : bool
+		If True, the python files are analysed without importing them.
+		Default: False
+	OPTIONAL[pool] : ImportWorkerPool
+		If specified (and 'static' is False), the python files are imported in parallel in the workers of this pool.
+		Default: None
+	OPTIONAL[include] : List[str]
+		The glob patterns of python files to document, relative to each folder. The files passed directly are always documented.
+		Default: None
+	OPTIONAL[exclude] : List[str]
+		The glob patterns of python files or folders to not document, relative to each folder.
+		Default: None
+	OPTIONAL[symbol_index] : SymbolIndex
+		If specified, the files which didn't change are documented with the symbols of this index (they are not analysed),
+		and the symbols of the other files are added to the index.
+		Default: None
+	OPTIONAL[bytecode] : bool
+		If True, the bytecode ('__pycache__') of the files written is refreshed right after the run, in parallel.
+		Default: False
+	OPTIONAL[cache] : ResultCache
+		If specified, the files documented with the same content and the same settings by a previous run are copied
+		from this cache (they are not analysed), the new source code of the other files is added to the cache.
+		The cache is only used with the static analysis (an imported module also depends on the modules it imports).
+		Default: None
+	OPTIONAL[memprofile] : bool
+		If True, the memory allocated by each stage and each file is traced with tracemalloc (slow) and saved in 'summary.memory'.
+		Default: False
+	OPTIONAL[progress] : Progress
+		If specified, the progress of run (files/s, estimated time left, failures so far) is reported by this progress.
+		Default: None
+
+	Returns
+	-------
+	summary : RunSummary
+		The result of each file (a path not found is a failed file). A failure of a file doesn't stop the run.
+	"""
+	summary = RunSummary()
+	cache = _static_cache(cache, static)
+	module_paths, missing_paths = _expand_paths(paths, subpackages, include, exclude)
+	for path in missing_paths:
+		summary.add(FileResult(path, 'failed', error="The path was not found"))
+	if not module_paths:
+		return summary
+	if sink is not None and sink.root is None:
+		sink.root = os.path.commonpath([os.path.dirname(module_path) for module_path in module_paths])
+
+	_logger.info(f"Start to document {len(module_paths)} python files ({'static analysis' if static else 'import workers' if pool is not None else 'import'})")
+	unmarked, module_paths = _prefilter(module_paths, decorator_name)
+	if progress is not None:
+		# the progress starts after the prefilter: the files without the decorator are not in the files/s
+		# nor in the estimated time left of the files analysed
+		progress.start(len(missing_paths) + len(module_paths))
+		for result in summary.results:  # the paths not found are the first failures
+			progress.update(result)
+	for result in unmarked:
+		summary.add(result)
+	try:
+		# the import time of modules and the memory of stages
+		with summary.imports.recording(), summary.memory.recording() if memprofile else nullcontext():
+			for result in _document_files(module_paths, [(formatter, None)], remove_decorator, decorator_name, sink, static, pool,
+											symbol_index, cache):
+				summary.add(result)
+				if progress is not None:
+					progress.update(result)
+	finally:
+		if progress is not None:
+			progress.close()
+	if bytecode:
+		refresh_bytecode(summary.written, workers=pool.nb_workers if pool is not None else None)
+	if cache is not None:
+		_logger.info(str(cache))
+
+	for result in summary.failed:
+		_logger.warning(f"Failed: '{result.path}': {result.error}")
+	_logger.info(f"{len(paths)} paths were documented: {summary}")
+	return summary
+
+
+def iter_documented(path_or_package, formatter: BaseFormatter = Formatter.simple_format(), subpackages: bool = True,
+					remove_decorator: bool = True, decorator_name: str = 'to_document', static: bool = False, pool: ImportWorkerPool = None,
+					include: list = None, exclude: list = None, symbol_index: SymbolIndex = None, cache: ResultCache = None,
+					diff: bool = False, write: bool = False):
+	"""Document python files and yield the result of each file as soon as it's done. The files are documented while
+	the results are consumed and the new source code of a file is only kept in its result, so a caller can upload, render
+	or commit each file without waiting for the whole tree. Nothing is written unless 'write' is True.
+
+	Parameters
+	----------
+	path_or_package : Union[str, module, List[Union[str, module]]]
+		The path of a python file or of a folder, a module or a package, or a list of them.
+		The python files of a folder are found like the files of a package.
+	OPTIONAL[formatter] : BaseFormatter
+		The formatter to use for all files.
+		Default: The 'simple' formatter. Get with `pyDocStr.utils.Formatter.simple_format()`
+	OPTIONAL[subpackages] : bool
+		If True, the python files of the subfolders of a folder are documented.
+		Default: True
+	OPTIONAL[remove_decorator] : bool
+		If True, decorators 'to_document' specify with 'decorator_name' argument are removed.
+		Default: True
+	OPTIONAL[decorator_name] : str
+		The decorator name use for 'to_document'
+		Default: to_document
+	OPTIONAL[static] : bool
+		If True, the python files are analysed without importing them.
+		Default: False
+	OPTIONAL[pool] : ImportWorkerPool
+		If specified (and 'static' is False), the python files are imported in parallel in the workers of this pool,
+		the results are yielded in the order of completion.
+		Default: None
+	OPTIONAL[include] : List[str]
+		The glob patterns of python files to document, relative to each folder.
+		Default: None
+	OPTIONAL[exclude] : List[str]
+		The glob patterns of python files or folders to not document, relative to each folder.
+		Default: None
+	OPTIONAL[symbol_index] : SymbolIndex
+		If specified, the files which didn't change are documented with the symbols of this index (they are not analysed),
+		and the symbols of the other files are added to the index.
+		Default: None
+	OPTIONAL[cache] : ResultCache
+		If specified, the files documented with the same content and the same settings by a previous run are copied
+		from this cache (they are not analysed), the new source code of the other files is added to the cache.
+		The cache is only used with the static analysis (an imported module also depends on the modules it imports).
+		Default: None
+	OPTIONAL[diff] : bool
+		If True, the unified diff of each file is added to its result (the paths are relative to the common folder of files).
+		Default: False
+	OPTIONAL[write] : bool
+		If True, the changed files are overwritten with their new source code before their result is yielded.
+		Default: False
+
+	Returns
+	-------
+	results : Iterator[FileResult]
+		The result of each file with the hash of its source code, its new source code, its diff and its duration
+		(the source codes are None for a failed file and for a file without the decorator).
+	"""
+	paths = list(path_or_package) if isinstance(path_or_package, (list, tuple)) else [path_or_package]
+	paths = [path if not ismodule(path) else os.path.dirname(_module_path(path)) if hasattr(path, '__path__') else _module_path(path)
+			for path in paths]
+	cache = _static_cache(cache, static)
+	module_paths, missing_paths = _expand_paths(paths, subpackages, include, exclude)
+	for path in missing_paths:
+		yield FileResult(path, 'failed', error="The path was not found")
+	if not module_paths:
+		return
 
+	sink = MemorySink(os.path.commonpath([os.path.dirname(module_path) for module_path in module_paths]))
+	unmarked, module_paths = _prefilter(module_paths, decorator_name)
+	yield from unmarked
+	for result in _document_files(module_paths, [(formatter, None)], remove_decorator, decorator_name, sink, static, pool,
+									symbol_index, cache):
+		source_code, new_source_code = sink.pop(result.path)
+		if source_code is not None:
+			result.source_hash = source_hash(source_code)
+			result.new_source_code = new_source_code
+			if diff:
+				result.diff = ''.join(diff_lines(sink.relative_path(result.path), source_code, new_source_code))
+			if write and new_source_code != source_code:
+				result.written = [_write_new_source_code(result.path, source_code, new_source_code)]
+		yield result
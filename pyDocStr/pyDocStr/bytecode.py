@@ -0,0 +1,61 @@
+"""Refresh the bytecode ('__pycache__') of the python files written by pyDocStr, in parallel.
+
+The files written have a new source code, so their bytecode is stale: without a refresh, they are compiled again one by one
+by the first import (the start of a service...). The files are compiled in a pool of processes, 'compile' holds the GIL.
+"""
+import os
+import py_compile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from . import _logger
+
+
+MIN_BYTES_BY_PROCESS = 2**20  # the source code compiled by a process must pay its start (~0.1 s, ~1 MB of source code is compiled in 0.2 s)
+
+
+def _compile_file(path: str, optimize: int = -1) -> tuple:
+	# compile a file in its '__pycache__', return its path and the error message (None if it was compiled)
+	try:
+		py_compile.compile(path, doraise=True, optimize=optimize)
+	except (py_compile.PyCompileError, OSError) as e:
+		return path, f"{type(e).__name__}: {str(e).strip()}"
+	return path, None
+
+
+def refresh_bytecode(paths: list, workers: int = None, optimize: int = -1) -> dict:
+	"""Compile python files in their '__pycache__' folder, in parallel.
+
+	Parameters
+	----------
+	paths : List[str]
+		The paths of python files to compile
+	OPTIONAL[workers] : int
+		The maximum number of processes. If None, the number of CPU. A process is started for each MB of source code,
+		the files are compiled in the current process if there is one worker or less than 2 MB.
+		Default: None
+	OPTIONAL[optimize] : int
+		The optimization level of bytecode (-1: the level of the current interpreter, 0, 1 or 2 like the options '-O', '-OO').
+		Default: -1
+
+	Returns
+	-------
+	errors : Dict[str, str]
+		The error message of each file which can't be compiled
+	"""
+	paths = list(dict.fromkeys(os.path.abspath(path) for path in paths))
+	if not paths:
+		return {}
+	size = sum(os.path.getsize(path) for path in paths if os.path.isfile(path))
+	workers = min(workers or os.cpu_count() or 1, size // MIN_BYTES_BY_PROCESS)
+	_logger.info(f"Refresh the bytecode of {len(paths)} python files ({max(workers, 1)} processes)...")
+	if workers <= 1:
+		results = [_compile_file(path, optimize) for path in paths]
+	else:
+		with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+			chunksize = max(len(paths) // (workers * 4), 1)
+			results = list(executor.map(_compile_file, paths, [optimize] * len(paths), chunksize=chunksize))
+	errors = {path: error for path, error in results if error is not None}
+	for path, error in errors.items():
+		_logger.warning(f"The bytecode of '{path}' can't be refreshed: {error}")
+	return errors
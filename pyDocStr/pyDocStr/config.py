@@ -0,0 +1,172 @@
+"""The settings of a project read in the section '[tool.pydocstr]' of its 'pyproject.toml'.
+The keys are the names of the command line options ('decorator-name' or 'decorator_name'), the relative paths are relative
+to the folder of 'pyproject.toml'. An option passed on the command line (or an argument passed to a function, not None)
+wins over the project settings, even if its value is the default value.
+"""
+import os
+try:
+	import tomllib
+except ModuleNotFoundError:  # python < 3.11
+	try:
+		import tomli as tomllib
+	except ModuleNotFoundError:
+		tomllib = None
+
+from . import _logger
+
+
+# the settings of the section: {name: (type, True if it's a path)}
+OPTIONS = {
+	'formatter': (str, False),
+	'config_formatter': (str, True),
+	'decorator_name': (str, False),
+	'workers': (int, False),
+	'cache': (str, True),
+	'index': (str, True),
+	'include': (list, False),
+	'exclude': (list, False),
+}
+# the settings which are only applied together: an explicit formatter is not replaced by the config formatter of the project
+_GROUPS = (('formatter', 'config_formatter'),)
+
+
+def find_pyproject(start: str) -> str:
+	"""Find the 'pyproject.toml' of a folder or of its nearest parent folder.
+
+	Parameters
+	----------
+	start : str
+		The path of a folder or of a file
+
+	Returns
+	-------
+	path : str
+		The path of 'pyproject.toml', None if there is no 'pyproject.toml' in the folder and its parents
+	"""
+	folder = os.path.abspath(start)
+	if not os.path.isdir(folder):
+		folder = os.path.dirname(folder)
+	while True:
+		path = os.path.join(folder, 'pyproject.toml')
+		if os.path.isfile(path):
+			return path
+		parent = os.path.dirname(folder)
+		if parent == folder:
+			return None
+		folder = parent
+
+
+def _check(path: str, name: str, value):
+	# return the value of a setting with the relative paths resolved, raise a ValueError if its type is wrong
+	type_, is_path = OPTIONS[name]
+	if type_ is list and isinstance(value, str):
+		value = [value]
+	if not isinstance(value, type_) or isinstance(value, bool) or (type_ is list and not all(isinstance(item, str) for item in value)):
+		expected = 'a list of str' if type_ is list else f"a {type_.__name__}"
+		raise ValueError(f"The setting '{name}' of [tool.pydocstr] in '{path}' must be {expected}, not {value!r}")
+	if name == 'formatter' and value.lower() not in ('simple', 'numpy'):
+		raise ValueError(f"The setting 'formatter' of [tool.pydocstr] in '{path}' must be 'simple' or 'numpy', not {value!r} (use 'config-formatter' for a config file)")
+	if is_path:
+		value = os.path.normpath(os.path.join(os.path.dirname(path), os.path.expanduser(value)))
+	return value
+
+
+class ProjectConfig:
+	"""The settings of a project read in the section '[tool.pydocstr]' of its 'pyproject.toml'.
+
+	Attributes
+	----------
+	path : str
+		The path of 'pyproject.toml', None if no file was read.
+	settings : dict
+		The settings of the section, by name of option ('decorator_name'...). The paths are absolute.
+
+	Public methods
+	--------------
+	apply : dict
+		Return the values of options with the project settings for the options not specified explicitly.
+	"""
+
+	def __init__(self, path: str = None, settings: dict = None):
+		self.path = path
+		self.settings = settings if settings is not None else {}
+
+	def apply(self, values: dict, specified: set) -> dict:
+		"""Return the values of options with the project settings for the options not specified explicitly.
+
+		Parameters
+		----------
+		values : dict
+			The values of options, by name of option
+		specified : Set[str]
+			The names of options specified explicitly (passed on the command line or to a function),
+			their value is kept even if it's the default value
+
+		Returns
+		-------
+		values : dict
+			The new values of options
+		"""
+		values = dict(values)
+		specified = set(specified)
+		for group in _GROUPS:
+			if specified.intersection(group):
+				specified.update(group)
+		for name, value in self.settings.items():
+			if name in values and name not in specified:
+				values[name] = value
+		return values
+
+	def __len__(self):
+		return len(self.settings)
+
+	def __repr__(self):
+		return f"<ProjectConfig '{self.path}' {self.settings}>"
+
+
+def load_config(path: str = None, start: str = None) -> ProjectConfig:
+	"""Read the settings of the section '[tool.pydocstr]' of a 'pyproject.toml', once by run.
+
+	Parameters
+	----------
+	OPTIONAL[path] : str
+		The path of 'pyproject.toml'. If None, it's searched in 'start' and its parent folders.
+		Default: None
+	OPTIONAL[start] : str
+		The folder (or file) where the search of 'pyproject.toml' starts. If None, the current folder.
+		Default: None
+
+	Returns
+	-------
+	config : ProjectConfig
+		The settings of project (empty if there is no 'pyproject.toml' or no section '[tool.pydocstr]')
+
+	Raises
+	------
+	ValueError
+		If the file can't be parsed or if a setting has a wrong type.
+	"""
+	if path is None:
+		path = find_pyproject(start if start is not None else os.getcwd())
+		if path is None:
+			return ProjectConfig()
+	path = os.path.abspath(path)
+	if tomllib is None:
+		_logger.warning(f"The settings of '{path}' are not read: 'tomli' must be installed with python < 3.11")
+		return ProjectConfig()
+	with open(path, 'rb') as f:
+		try:
+			section = tomllib.load(f).get('tool', {}).get('pydocstr', {})
+		except tomllib.TOMLDecodeError as e:
+			raise ValueError(f"The file '{path}' can't be parsed: {e}") from None
+
+	settings = {}
+	for key, value in section.items():
+		name = key.replace('-', '_')
+		if name not in OPTIONS:
+			_logger.warning(f"Unknown setting '{key}' in [tool.pydocstr] of '{path}', the settings are: {', '.join(OPTIONS)}")
+			continue
+		settings[name] = _check(path, name, value)
+	if settings:
+		_logger.info(f"Settings of project read in '{path}': {settings}")
+	return ProjectConfig(path, settings)
@@ -0,0 +1,162 @@
+"""Functions to find the python files of a package folder without importing it."""
+import os
+import re
+from fnmatch import translate
+
+
+def _compile(patterns: list):
+	# one regular expression for all glob patterns (None without pattern), like `fnmatch` the case depends on the OS
+	if not patterns:
+		return None
+	return re.compile('|'.join(f"(?:{translate(os.path.normcase(pattern))})" for pattern in patterns))
+
+
+class PathMatcher:
+	"""The include and exclude glob patterns of a run compiled once into one regular expression each:
+	a path is tested once instead of once by pattern. The paths are relative to the folder explored, with '/' separators.
+
+	Attributes
+	----------
+	include : List[str]
+		The glob patterns of python files to return (all python files if it's empty).
+	exclude : List[str]
+		The glob patterns of python files or folders to ignore.
+
+	Public methods
+	--------------
+	is_included : bool
+		Return True if a python file must be returned.
+	is_pruned : bool
+		Return True if a folder must not be entered.
+	"""
+
+	def __init__(self, include: list = None, exclude: list = None):
+		self.include = list(include or [])
+		self.exclude = list(exclude or [])
+		self._include = _compile(self.include)
+		self._exclude = _compile(self.exclude)
+
+	def is_included(self, relative_path: str) -> bool:
+		"""Return True if a python file must be returned: it matches no exclude pattern and an include pattern (if any).
+
+		Parameters
+		----------
+		relative_path : str
+			The path of file, relative to the folder explored
+
+		Returns
+		-------
+		result : bool
+			True if the file is included
+		"""
+		relative_path = os.path.normcase(relative_path)
+		if self._exclude is not None and self._exclude.match(relative_path):
+			return False
+		return self._include is None or self._include.match(relative_path) is not None
+
+	def is_pruned(self, relative_folder: str) -> bool:
+		"""Return True if a folder must not be entered: it matches an exclude pattern ('tests')
+		or an exclude pattern matches all its content ('tests/*').
+
+		Parameters
+		----------
+		relative_folder : str
+			The path of folder, relative to the folder explored (without '/' at the end)
+
+		Returns
+		-------
+		result : bool
+			True if the folder is excluded
+		"""
+		relative_folder = os.path.normcase(relative_folder)
+		return self._exclude is not None and (self._exclude.match(relative_folder) is not None
+											or self._exclude.match(relative_folder + '/') is not None)
+
+	def __repr__(self):
+		return f"<PathMatcher include={self.include} exclude={self.exclude}>"
+
+
+def discover_modules(package_dir: str, subpackages: bool = True, include: list = None, exclude: list = None,
+						matcher: PathMatcher = None) -> list:
+	"""Find the python files of a package folder with `os.scandir`.
+	Each python file is returned once, even if it can be reached with several paths (symbolic links):
+	the real path is preferred to the links.
+	The folders are only explored if they are subpackages (with a '__init__.py').
+
+	Parameters
+	----------
+	package_dir : str
+		The folder of package
+	OPTIONAL[subpackages] : bool
+		If True, the python files of subpackages are returned.
+		Default: True
+	OPTIONAL[include] : List[str]
+		The glob patterns of python files to return, relative to the package folder ('sub/*.py'...). If None, all python files are returned.
+		Default: None
+	OPTIONAL[exclude] : List[str]
+		The glob patterns of python files or folders to ignore, relative to the package folder ('tests', '*/_version.py'...).
+		The excluded folders are not entered.
+		Default: None
+	OPTIONAL[matcher] : PathMatcher
+		The patterns already compiled (to explore several folders with the same patterns). If specified, 'include' and 'exclude' are not used.
+		Default: None
+
+	Returns
+	-------
+	paths : List[str]
+		The absolute paths of python files, sorted by folder then by name
+	"""
+	package_dir = os.path.abspath(package_dir)
+	matcher = matcher if matcher is not None else PathMatcher(include, exclude)
+	visited, paths, files = set(), [], {}  # files: {real path of file: index in paths}
+	folders = [(package_dir, '')]
+	while folders:
+		folder, relative_folder = folders.pop()
+		real_folder = os.path.realpath(folder)
+		if real_folder in visited:
+			continue
+		visited.add(real_folder)
+
+		subfolders = []
+		with os.scandir(folder) as entries:
+			for entry in sorted(entries, key=lambda entry: entry.name):
+				relative_path = relative_folder + entry.name
+				if entry.name.endswith('.py') and entry.is_file():
+					if not matcher.is_included(relative_path):
+						continue
+					real_path = os.path.realpath(entry.path)
+					if real_path not in files:
+						files[real_path] = len(paths)
+						paths.append(entry.path)
+					elif real_path == entry.path:  # the file was found with a link before
+						paths[files[real_path]] = None
+						files[real_path] = len(paths)
+						paths.append(entry.path)
+				elif subpackages and entry.is_dir() and not matcher.is_pruned(relative_path) and os.path.isfile(os.path.join(entry.path, '__init__.py')):
+					subfolders.append((entry.path, relative_path + '/'))
+		folders.extend(reversed(subfolders))
+	return [path for path in paths if path is not None]
+
+
+def read_manifest(path: str) -> list:
+	"""Read a manifest file which lists the roots to document (packages, folders or python files of a monorepo), one by line.
+	The empty lines and the comments ('#') are ignored, the relative paths are relative to the folder of manifest.
+
+	Parameters
+	----------
+	path : str
+		The path of manifest
+
+	Returns
+	-------
+	roots : List[str]
+		The absolute paths of roots, in the order of manifest (without duplicates)
+	"""
+	folder = os.path.dirname(os.path.abspath(path))
+	roots = []
+	with open(path, 'r', encoding='utf-8') as f:
+		for line in f:
+			line = line.split('#', 1)[0].strip()
+			if line:
+				roots.append(os.path.normpath(os.path.join(folder, os.path.expanduser(line))))
+	return list(dict.fromkeys(roots))
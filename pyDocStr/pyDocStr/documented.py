@@ -2,6 +2,8 @@
 A Decorator is used to indicate if the functions or class must be documented or not"""
 from inspect import getsource, getmembers, isfunction, ismethod, isclass, signature, _empty, isbuiltin
 
+from .utils.annotations import function_from_source
+
 
 class ObjectToDocument:
 	""".A base class for objects to document.
@@ -11,15 +13,36 @@ class ObjectToDocument:
 	obj : The object (function or class) to document.
 	name : str
 		The name of the object.
+	qualname : str
+		The qualified name of the object ('Class.method' for a method).
 	description : str
 		The description for the object.
+	docstring_fields : Tuple[Tuple[str, str]]
+		The fields of docstring: the name of field and the name of attribute with the items of field.
+
+	Public methods
+	--------------
+	get_docstring_fields : Dict[str, dict]
+		Return the fields of docstring with their items.
 	"""
+	docstring_fields = ()
 
 	def __init__(self, func_or_class, description: str = ""):
 		self.obj = func_or_class
 		self.name = self.obj.__name__
+		self.qualname = getattr(self.obj, '__qualname__', self.name)
 		self.description = description
 
+	def get_docstring_fields(self) -> dict:
+		"""Return the fields of docstring with their items.
+
+		Returns
+		-------
+		fields : Dict[str, dict]
+			A dictionary with name of fields in key and in value a dictionary of items
+		"""
+		return {name: getattr(self, attribute) for name, attribute in self.docstring_fields}
+
 	def __str__(self):
 		return f"<type='{type(self).__name__}' | name='{self.name}'>"
 
@@ -35,25 +58,73 @@ class FunctionToDocument(ObjectToDocument):
 	
 	Attributes
 	----------
-	parameters : Dict[str, Tuple[type, Any]]
+	parameters : Dict[str, Tuple[Union[str, type], Any]]
 		A dictionary with all parameters of function and these types and default value.
-	returns : Dict[str, Tuple[type, _empty]]
+		The type is the source text of annotation if the source is available.
+	returns : Dict[str, Tuple[Union[str, type], _empty]]
 		A dictionnary with the value return and this type.
+		The name is the returned variable if all 'return' of the body return the same variables.
+	yields : Dict[str, Tuple[Union[str, type], _empty]]
+		A dictionnary with the value yielded by a generator and this type (read in the return annotation 'Iterator[type]').
+	raises : Dict[str, Tuple[_empty, _empty]]
+		A dictionnary with the exceptions raised in the body of function.
 	nb_base_tab : int
 		The number of indentation for this function.
 	"""
+	docstring_fields = (('Parameters', 'parameters'), ('Returns', 'returns'))
 
-	def __init__(self, func_, description: str = "", name_return: str = "result", **kwargs):
+	def __init__(self, func_, description: str = "", name_return: str = None, **kwargs):
 		ObjectToDocument.__init__(self, func_, description)
+		source = getsource(func_)
+		# annotations are read in the source code to not evaluate them, the body is analysed with the same parse
+		annotations, return_annotation, body = function_from_source(source)
 		sign = signature(self.obj)
-		self.parameters = {name: (param.annotation, param.default) for name, param in sign.parameters.items() if name != 'self'}
-		self.returns = {name_return: (sign.return_annotation, _empty)} if sign.return_annotation != _empty else {}
+		self.parameters = {name: (annotations.get(name, param.annotation), param.default)
+							for name, param in sign.parameters.items() if name != 'self'}
+		if return_annotation is None and sign.return_annotation is not _empty:
+			return_annotation = sign.return_annotation
+		self._set_body_fields(return_annotation, body, name_return)
 		del(sign)
 
-		source = getsource(func_)
 		self.nb_base_tab = source[:source.find('def')].count('\t') // 2 + 1  # 1 indentations in python file count for 2 ? (test)
 		del(source)
 
+	def _set_body_fields(self, return_annotation, body, name_return: str = None):
+		"""Set the fields Returns, Yields and Raises with the return annotation and the fields inferred from the body.
+
+		Parameters
+		----------
+		return_annotation : Union[str, type]
+			The return annotation, None if there is no return annotation
+		body : BodyFields
+			The fields inferred from the body, None if the body is not available
+		OPTIONAL[name_return] : str
+			The name of returned value, if None it's the returned variable or 'result'
+			Default: None
+		
+		Returns
+		-------
+		None
+		"""
+		self.raises = {name: (_empty, _empty) for name in body.raises} if body is not None else {}
+		self.yields = {}
+		if body is not None and body.is_generator:
+			type_ = body.yield_type if body.yield_type is not None else _empty
+			self.yields = {name_return or body.yield_name or 'result': (type_, _empty)}
+			self.returns = {}
+		elif return_annotation is None:
+			self.returns = {}
+		elif name_return is None and body is not None and body.return_types is not None:  # return a, b -> Tuple[int, str]
+			self.returns = {name: (type_, _empty) for name, type_ in zip(body.return_names, body.return_types)}
+		elif name_return is None and body is not None and body.return_names is not None and len(body.return_names) == 1:
+			self.returns = {body.return_names[0]: (return_annotation, _empty)}
+		else:
+			self.returns = {name_return or 'result': (return_annotation, _empty)}
+
+		if self.yields or self.raises:
+			self.docstring_fields = ((('Parameters', 'parameters'), ('Yields', 'yields')) if self.yields else type(self).docstring_fields) \
+									+ ((('Raises', 'raises'),) if self.raises else ())
+
 
 class ClassToDocument(ObjectToDocument):
 	"""A class to represent a function to document.
@@ -76,6 +147,7 @@ class ClassToDocument(ObjectToDocument):
 	_isfunction_or_isfunctiontodocument : bool
 		Return if an object is a function or a FunctionToDocument.
 	"""
+	docstring_fields = (('Attributes', 'attributes'), ('Public methods', 'public_methods'), ('Protected methods', 'protected_methods'))
 
 	def __init__(self, class_, description: str = "", **kwargs):
 		ObjectToDocument.__init__(self, class_, description)
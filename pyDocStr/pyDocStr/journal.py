@@ -0,0 +1,253 @@
+"""The results of a run and the checkpoint journal to resume an interrupted run."""
+import os
+import json
+
+from . import _logger
+from .utils._import_timer import ImportProfile
+from .utils._memory_profile import MemoryProfile
+
+
+JOURNAL_VERSION = 1
+
+
+class FileResult:
+	"""The result of the documentation of a file.
+
+	Attributes
+	----------
+	path : str
+		The path of file.
+	status : str
+		'documented' (the file was changed), 'unchanged', 'failed' or 'resumed' (documented by a previous run).
+	nb_symbols : int
+		The number of symbols documented.
+	error : str
+		The error message if the file failed, else None.
+	written : List[str]
+		The paths of files written with the new source code (the file or its copies in the outputs).
+	duration : float
+		The time spent on the file by the current process, in seconds (None if the file was not documented by the run).
+	source_hash : str
+		The hash of the original source code (only set by 'iter_documented').
+	new_source_code : str
+		The source code with docstrings (only set by 'iter_documented').
+	diff : str
+		The unified diff of the file (only set by 'iter_documented' with 'diff').
+	"""
+
+	def __init__(self, path: str, status: str, nb_symbols: int = 0, error: str = None, written: list = None):
+		self.path = path
+		self.status = status
+		self.nb_symbols = nb_symbols
+		self.error = error
+		self.written = written if written is not None else []
+		self.duration = None
+		self.source_hash = None
+		self.new_source_code = None
+		self.diff = None
+
+	def __str__(self):
+		return f"<path='{self.path}' | status='{self.status}'" + (f" | error='{self.error}'>" if self.error is not None else ">")
+
+	def __repr__(self):
+		return self.__str__()
+
+
+class RunSummary:
+	"""The results of all files of a run.
+
+	Attributes
+	----------
+	results : List[FileResult]
+		The result of each file.
+	imports : ImportProfile
+		The import time of the modules imported to analyse the files (empty with the static analysis).
+	memory : MemoryProfile
+		The memory allocated by each stage and each file (empty if the memory was not profiled).
+
+	Public methods
+	--------------
+	add : None
+		Add the result of a file.
+	by_status : List[FileResult]
+		Return the results with a status.
+	to_dict : dict
+		Return the summary and the profiles as a dictionary (for a JSON file).
+	"""
+
+	def __init__(self):
+		self.results = []
+		self.imports = ImportProfile()
+		self.memory = MemoryProfile()
+
+	def add(self, result: FileResult):
+		"""Add the result of a file.
+
+		Parameters
+		----------
+		result : FileResult
+			The result of a file
+
+		Returns
+		-------
+		None
+		"""
+		self.results.append(result)
+
+	def by_status(self, status: str) -> list:
+		"""Return the results with a status.
+
+		Parameters
+		----------
+		status : str
+			'documented', 'unchanged', 'failed' or 'resumed'
+
+		Returns
+		-------
+		results : List[FileResult]
+			The results with this status
+		"""
+		return [result for result in self.results if result.status == status]
+
+	@property
+	def failed(self) -> list:
+		return self.by_status('failed')
+
+	@property
+	def written(self) -> list:
+		# the paths of all files written by the run
+		return [path for result in self.results for path in result.written]
+
+	def to_dict(self) -> dict:
+		"""Return the summary and the profiles as a dictionary (for a JSON file).
+
+		Returns
+		-------
+		summary : dict
+			{'counts': {status: number of files}, 'files': [{'path', 'status', 'nb_symbols', 'error', 'duration'}], 'imports': profile of imports,
+			'memory': profile of memory (only if the memory was profiled)}
+		"""
+		summary = {
+			'counts': {status: len(self.by_status(status)) for status in ('documented', 'unchanged', 'resumed', 'failed')},
+			'files': [{'path': result.path, 'status': result.status, 'nb_symbols': result.nb_symbols, 'error': result.error,
+						'duration': result.duration} for result in self.results],
+			'imports': self.imports.to_dict(),
+		}
+		if len(self.memory) > 0:
+			summary['memory'] = self.memory.to_dict()
+		return summary
+
+	def __str__(self):
+		counts = ', '.join(f"{len(self.by_status(status))} {status}" for status in ('documented', 'unchanged', 'resumed', 'failed'))
+		return f"{len(self.results)} files: {counts}"
+
+	def __repr__(self):
+		return f"<RunSummary {self.__str__()}>"
+
+
+class Journal:
+	"""A checkpoint journal: the result of each file is appended to a JSON-lines file when it's done.
+	If a run is interrupted, the next run with the same journal and the same settings skips the files already documented.
+	The journal is removed at the end of a run without failures.
+
+	Attributes
+	----------
+	path : str
+		The path of journal.
+	root : str
+		The folder use to get the relative path of files in the journal.
+	settings : dict
+		The settings of run (package folder, outputs and their formatter...), the journal is only used by a run with the same settings.
+	done : Set[str]
+		The relative paths of files documented by the previous runs.
+
+	Public methods
+	--------------
+	is_done : bool
+		Return True if a file was documented by a previous run.
+	record : None
+		Append the result of a file to the journal.
+	close : None
+		Close the journal, it's removed if the run is complete and without failures.
+	"""
+
+	def __init__(self, path: str, root: str, settings: dict):
+		self.path = os.path.abspath(path)
+		self.root = os.path.abspath(root)
+		self.settings = dict(settings, version=JOURNAL_VERSION)
+		self.done = set()
+		if os.path.exists(self.path):
+			self._load()
+		if len(self.done) == 0:
+			with open(self.path, 'w', encoding='utf-8') as f:
+				f.write(json.dumps(self.settings) + '\n')
+		self._file = open(self.path, 'a', encoding='utf-8')
+
+	def _load(self):
+		# load the files documented by the previous runs, the journal is ignored if the settings are different
+		with open(self.path, 'r', encoding='utf-8') as f:
+			try:
+				settings = json.loads(f.readline() or '{}')
+			except json.JSONDecodeError:
+				settings = {}
+			if settings != self.settings:
+				_logger.warning(f"The journal '{self.path}' was written by a run with other settings, it's not used.")
+				return
+			for line in f:
+				try:
+					entry = json.loads(line)
+				except json.JSONDecodeError:  # the last line can be incomplete if the run was killed
+					continue
+				if entry['status'] in ('documented', 'unchanged'):
+					self.done.add(entry['path'])
+		_logger.info(f"Resume the run of journal '{self.path}': {len(self.done)} files already documented")
+
+	def _key(self, path: str) -> str:
+		return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+	def is_done(self, path: str) -> bool:
+		"""Return True if a file was documented by a previous run.
+
+		Parameters
+		----------
+		path : str
+			The path of file
+
+		Returns
+		-------
+		result : bool
+			True if the file must be skipped
+		"""
+		return self._key(path) in self.done
+
+	def record(self, result: FileResult):
+		"""Append the result of a file to the journal.
+
+		Parameters
+		----------
+		result : FileResult
+			The result of a file
+
+		Returns
+		-------
+		None
+		"""
+		self._file.write(json.dumps({'path': self._key(result.path), 'status': result.status, 'error': result.error}) + '\n')
+		self._file.flush()
+
+	def close(self, summary: RunSummary = None):
+		"""Close the journal. It's removed if the run is complete (summary specified) and without failures.
+
+		Parameters
+		----------
+		OPTIONAL[summary] : RunSummary
+			The summary of run, None if the run was interrupted
+			Default: None
+
+		Returns
+		-------
+		None
+		"""
+		self._file.close()
+		if summary is not None and len(summary.failed) == 0:
+			os.remove(self.path)
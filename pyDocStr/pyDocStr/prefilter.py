@@ -0,0 +1,113 @@
+"""A fast prefilter to find the python files with the decorator 'to_document' without reading them as text.
+The files are memory-mapped and the decorator is searched as raw bytes: a file without marker is not imported nor parsed."""
+import os
+import mmap
+
+
+def _open_bytes(path: str):
+	# return the content of a file as a memory map (or b'' for an empty file), the map must be closed
+	with open(path, 'rb') as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			return b''
+		return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _iter_markers(data, decorator_name: str):
+	# yield the positions of the markers: the decorator name after '@' or '.' ('@to_document', '@pyDocStr.to_document')
+	name = decorator_name.encode()
+	start = data.find(name)
+	while start != -1:
+		end = start + len(name)
+		after = data[end:end + 1]
+		if start > 0 and data[start - 1:start] in (b'@', b'.') and not (after.isalnum() or after == b'_'):
+			yield start
+		start = data.find(name, end)
+
+
+def count_markers(path: str, decorator_name: str = 'to_document', stop_at: int = None) -> int:
+	"""Count the markers of the decorator 'to_document' in a file, with a raw byte search.
+
+	Parameters
+	----------
+	path : str
+		The path of file
+	OPTIONAL[decorator_name] : str
+		The name of decorator 'to_document'
+		Default: 'to_document'
+	OPTIONAL[stop_at] : int
+		If specified, the count stops when this number of markers is reached.
+		Default: None
+
+	Returns
+	-------
+	count : int
+		The number of markers in the file
+	"""
+	data = _open_bytes(path)
+	try:
+		count = 0
+		for _ in _iter_markers(data, decorator_name):
+			count += 1
+			if count == stop_at:
+				break
+		return count
+	finally:
+		if isinstance(data, mmap.mmap):
+			data.close()
+
+
+def has_marker(path: str, decorator_name: str = 'to_document') -> bool:
+	"""Return True if a file contains the decorator 'to_document' (raw byte search, the file is not parsed).
+
+	Parameters
+	----------
+	path : str
+		The path of file
+	OPTIONAL[decorator_name] : str
+		The name of decorator 'to_document'
+		Default: 'to_document'
+
+	Returns
+	-------
+	result : bool
+		True if the file contains a marker
+	"""
+	return count_markers(path, decorator_name, stop_at=1) > 0
+
+
+def filter_modules(paths: list, decorator_name: str = 'to_document') -> list:
+	"""Return the python files which contain the decorator 'to_document'.
+
+	Parameters
+	----------
+	paths : List[str]
+		The paths of python files
+	OPTIONAL[decorator_name] : str
+		The name of decorator 'to_document'
+		Default: 'to_document'
+
+	Returns
+	-------
+	paths : List[str]
+		The paths of files with a marker, in the same order
+	"""
+	return [path for path in paths if has_marker(path, decorator_name)]
+
+
+def marker_stats(paths: list, decorator_name: str = 'to_document') -> dict:
+	"""Count the markers of the decorator 'to_document' in python files, with the prefilter only.
+
+	Parameters
+	----------
+	paths : List[str]
+		The paths of python files
+	OPTIONAL[decorator_name] : str
+		The name of decorator 'to_document'
+		Default: 'to_document'
+
+	Returns
+	-------
+	stats : Dict[str, int]
+		The number of markers of each file
+	"""
+	return {path: count_markers(path, decorator_name) for path in paths}
@@ -0,0 +1,123 @@
+"""The live progress of a run: the files done, the throughput, the estimated time left and the failures so far."""
+import sys
+from time import monotonic
+
+
+def _format_duration(seconds: float) -> str:
+	# 'm:ss' under one hour, else 'h:mm:ss'
+	minutes, seconds = divmod(int(round(seconds)), 60)
+	hours, minutes = divmod(minutes, 60)
+	return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class Progress:
+	"""Report the progress of a run on a stream while the results of files arrive.
+	On a terminal, the line of progress is rewritten in place; else (a CI log) a line is written at each interval.
+
+	Attributes
+	----------
+	stream : TextIO
+		The stream where the progress is written.
+	interval : float
+		The minimum time between two lines, in seconds.
+	total : int
+		The number of files of the run.
+	done : int
+		The number of files done.
+	failed : int
+		The number of files failed so far.
+
+	Public methods
+	--------------
+	start : None
+		Start the progress of a run.
+	update : None
+		Add the result of a file, the progress is written if the interval elapsed.
+	close : None
+		Write the last line of progress.
+	"""
+
+	def __init__(self, stream=None, interval: float = None):
+		self.stream = stream if stream is not None else sys.stderr
+		self._tty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+		self.interval = interval if interval is not None else 0.2 if self._tty else 10.
+		self.total = 0
+		self.done = 0
+		self.failed = 0
+		self._start = None
+		self._last = None
+
+	def start(self, total: int):
+		"""Start the progress of a run.
+
+		Parameters
+		----------
+		total : int
+			The number of files of the run
+
+		Returns
+		-------
+		None
+		"""
+		self.total, self.done, self.failed = total, 0, 0
+		self._start = self._last = monotonic()
+
+	@property
+	def rate(self) -> float:
+		# the number of files done by second since the start
+		elapsed = monotonic() - self._start if self._start is not None else 0.
+		return self.done / elapsed if elapsed > 0 else 0.
+
+	@property
+	def eta(self) -> float:
+		# the estimated time left, in seconds (None before the first file)
+		rate = self.rate
+		return (self.total - self.done) / rate if rate > 0 else None
+
+	def update(self, result):
+		"""Add the result of a file, the progress is written if the interval elapsed since the last line.
+
+		Parameters
+		----------
+		result : FileResult
+			The result of a file
+
+		Returns
+		-------
+		None
+		"""
+		if self._start is None:
+			self.start(self.total)
+		self.done += 1
+		if result.status == 'failed':
+			self.failed += 1
+		now = monotonic()
+		if now - self._last >= self.interval:
+			self._last = now
+			self._write()
+
+	def close(self):
+		"""Write the last line of progress.
+
+		Returns
+		-------
+		None
+		"""
+		if self._start is not None:
+			self._write(last=True)
+
+	def _write(self, last: bool = False):
+		eta = self.eta
+		line = (f"{self.done}/{self.total} files ({100 * self.done / self.total if self.total else 100.:.0f}%) | "
+				f"{self.rate:.1f} files/s | ETA {_format_duration(eta) if eta is not None else '?'} | {self.failed} failed")
+		if self._tty:
+			self.stream.write('\r\x1b[K' + line + ('\n' if last else ''))
+		else:
+			self.stream.write(line + '\n')
+		self.stream.flush()
+
+	def __str__(self):
+		return f"{self.done}/{self.total} files, {self.failed} failed"
+
+	def __repr__(self):
+		return f"<Progress {self.__str__()}>"
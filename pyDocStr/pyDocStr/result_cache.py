@@ -0,0 +1,157 @@
+"""A content-addressed cache of documented files, shared by all checkouts and runs of a machine (like ccache).
+
+The key of a file is the hash of its source code, of the settings of its documentation (formatter, decorator name,
+analysis...) and of the version of pyDocStr and of its output, so a file with the same content is documented once and then copied from the cache.
+The entries are the new source codes: '<cache folder>/<2 first characters of key>/<rest of key>'.
+"""
+import os
+import json
+import hashlib
+import tempfile
+
+from . import _logger, __version__
+
+
+CACHE_ENV = 'PYDOCSTR_CACHE_DIR'  # the environment variable of the default cache folder
+CACHE_VERSION = 2  # incremented when the documentation of a same file changes between two versions (2: Raises and Yields)
+
+
+def _formatter_key(formatter) -> str:
+	# the class and the attributes of a formatter (the formats of a 'Formatter'),
+	# the code of a custom formatter is only identified by the name of its class
+	cls = type(formatter)
+	return json.dumps({'class': f"{cls.__module__}.{cls.__qualname__}", 'attributes': vars(formatter)}, sort_keys=True, default=repr)
+
+
+class ResultCache:
+	"""A content-addressed cache of documented files in a folder.
+	The entries are written atomically, so the cache can be shared by concurrent runs.
+
+	Attributes
+	----------
+	path : str
+		The folder of cache.
+	hits : int
+		The number of files found in the cache.
+	misses : int
+		The number of files not found in the cache.
+
+	Public methods
+	--------------
+	key : str
+		Return the key of a source code documented with some settings.
+	get : str
+		Return the new source code of a key.
+	put : None
+		Save the new source code of a key.
+	"""
+
+	def __init__(self, path: str):
+		self.path = os.path.abspath(path)
+		self.hits = 0
+		self.misses = 0
+		os.makedirs(self.path, exist_ok=True)
+
+	def key(self, source_code: str, formatter, decorator_name: str = 'to_document', remove_decorator: bool = True,
+			static: bool = False) -> str:
+		"""Return the key of a source code documented with some settings.
+
+		Parameters
+		----------
+		source_code : str
+			The source code of file
+		formatter : BaseFormatter
+			The formatter
+		OPTIONAL[decorator_name] : str
+			The decorator name use for 'to_document'
+			Default: 'to_document'
+		OPTIONAL[remove_decorator] : bool
+			If the decorators are removed
+			Default: True
+		OPTIONAL[static] : bool
+			If the file is analysed without importing it (the import can find other symbols)
+			Default: False
+
+		Returns
+		-------
+		key : str
+			The sha256 of the source code and of the settings
+		"""
+		settings = json.dumps([__version__, CACHE_VERSION, _formatter_key(formatter), decorator_name, remove_decorator, static])
+		digest = hashlib.sha256(settings.encode('utf-8'))
+		digest.update(b'\0')
+		digest.update(source_code.encode('utf-8', 'surrogatepass'))
+		return digest.hexdigest()
+
+	def _entry_path(self, key: str) -> str:
+		return os.path.join(self.path, key[:2], key[2:])
+
+	def get(self, key: str) -> str:
+		"""Return the new source code of a key.
+
+		Parameters
+		----------
+		key : str
+			The key of file
+
+		Returns
+		-------
+		new_source_code : str
+			The new source code, None if the key is not in the cache
+		"""
+		try:
+			with open(self._entry_path(key), 'r', encoding='utf-8', newline='') as f:
+				new_source_code = f.read()
+		except (OSError, UnicodeDecodeError):
+			self.misses += 1
+			return None
+		self.hits += 1
+		return new_source_code
+
+	def put(self, key: str, new_source_code: str):
+		"""Save the new source code of a key. The entry is written in a temporary file then renamed.
+
+		Parameters
+		----------
+		key : str
+			The key of file
+		new_source_code : str
+			The new source code
+
+		Returns
+		-------
+		None
+		"""
+		entry_path = self._entry_path(key)
+		try:
+			os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+			fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), prefix='.tmp_')
+			with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+				f.write(new_source_code)
+			os.replace(tmp_path, entry_path)
+		except OSError as e:  # a cache which can't be written doesn't stop the run
+			_logger.warning(f"The cache entry '{entry_path}' can't be written: {e}")
+
+	def __str__(self):
+		return f"cache '{self.path}': {self.hits} hits, {self.misses} misses"
+
+	def __repr__(self):
+		return f"<ResultCache {self.__str__()}>"
+
+
+def get_cache(path: str = None) -> ResultCache:
+	"""Return the cache of a folder, or of the folder of the environment variable 'PYDOCSTR_CACHE_DIR'.
+
+	Parameters
+	----------
+	OPTIONAL[path] : str
+		The folder of cache
+		Default: None
+
+	Returns
+	-------
+	cache : ResultCache
+		The cache, None if no folder is specified
+	"""
+	path = path or os.environ.get(CACHE_ENV)
+	return ResultCache(path) if path else None
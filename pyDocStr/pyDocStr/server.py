@@ -0,0 +1,445 @@
+"""A JSON-RPC server over stdin/stdout to document files from an editor without starting a new interpreter for each file.
+
+Each line of stdin is a JSON-RPC 2.0 request, each response is written on one line of stdout.
+The formatters, the source codes and their index are kept in memory between requests.
+
+Methods
+-------
+document_buffer : {'source': str, 'changed': bool}
+	Document a source code. params: source, [formatter, config_formatter, decorator_name, remove_decorator]
+document_file : {'path': str, 'changed': bool, 'source': str}
+	Document a file. params: path, [new_path, write, formatter, config_formatter, decorator_name, remove_decorator]
+document_package : {'files': List[str]}
+	Document a package folder. params: path, [new_package_path, subpackages, formatter, config_formatter, decorator_name, remove_decorator]
+check_file : {'path': str, 'needs_changes': bool}
+	Check if a file has symbols to document. params: path, [formatter, config_formatter, decorator_name, remove_decorator]
+invalidate : {'invalidated': int}
+	Remove a file (or all files if 'path' is not specified) of caches. params: [path]
+shutdown : None
+	Stop the server after the response.
+"""
+import os
+import sys
+import json
+import hashlib
+import traceback
+from inspect import signature
+from collections import OrderedDict
+
+from . import _logger
+from .utils import BaseFormatter, Formatter, _fs_utils, _source_io
+from .analysis import SourceIndex
+from .build_docstrings import create_docstrings_from_source
+from .discovery import discover_modules
+from .prefilter import has_marker
+
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RPCError(Exception):
+	"""An error returned to the client in the JSON-RPC response.
+
+	Attributes
+	----------
+	code : int
+		The JSON-RPC error code.
+	message : str
+		The error message.
+	"""
+
+	def __init__(self, code: int, message: str):
+		Exception.__init__(self, message)
+		self.code = code
+		self.message = message
+
+
+class Server:
+	"""A JSON-RPC server which reads requests on a stream and writes responses on another stream, one message by line.
+
+	Attributes
+	----------
+	input : TextIO
+		The stream of requests.
+	output : TextIO
+		The stream of responses.
+	formatter : BaseFormatter
+		The default formatter.
+	decorator_name : str
+		The default decorator name.
+	max_buffers : int
+		The maximum number of buffer indexes kept in memory.
+
+	Public methods
+	--------------
+	serve_forever : None
+		Read and handle requests until the end of input or a 'shutdown' request.
+	handle : dict
+		Handle a request and return the response.
+	"""
+
+	def __init__(self, input=None, output=None, formatter: BaseFormatter = None, decorator_name: str = 'to_document',
+				max_buffers: int = 64):
+		self.input = sys.stdin if input is None else input
+		self.output = sys.stdout if output is None else output
+		self.formatter = Formatter.simple_format() if formatter is None else formatter
+		self.decorator_name = decorator_name
+		self.max_buffers = max_buffers
+		self._running = False
+		self._formatters = {}  # {name or (config path, mtime): formatter}
+		self._files = {}  # {path: (mtime_ns, size, source code, {decorator name: index})}
+		self._buffers = OrderedDict()  # {(hash, decorator name): index}, the least recently used is removed first
+		self._methods = {
+			'document_buffer': self.document_buffer,
+			'document_file': self.document_file,
+			'document_package': self.document_package,
+			'check_file': self.check_file,
+			'invalidate': self.invalidate,
+			'shutdown': self.shutdown,
+		}
+
+	def serve_forever(self):
+		"""Read and handle requests until the end of input or a 'shutdown' request.
+
+		Returns
+		-------
+		None
+		"""
+		self._running = True
+		for line in self.input:
+			if not line.strip():
+				continue
+			response = self.handle_line(line)
+			if response is not None:
+				self.output.write(json.dumps(response) + '\n')
+				self.output.flush()
+			if not self._running:
+				break
+
+	def handle_line(self, line: str) -> dict:
+		"""Handle a line with a JSON-RPC request.
+
+		Parameters
+		----------
+		line : str
+			The request
+
+		Returns
+		-------
+		response : dict
+			The response, None for a notification (a request without id).
+		"""
+		try:
+			request = json.loads(line)
+		except ValueError:
+			return {'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': 'Parse error'}}
+		return self.handle(request)
+
+	def handle(self, request: dict) -> dict:
+		"""Handle a request and return the response.
+
+		Parameters
+		----------
+		request : dict
+			The JSON-RPC request
+
+		Returns
+		-------
+		response : dict
+			The response, None for a notification (a request without id).
+		"""
+		request_id = request.get('id') if isinstance(request, dict) else None
+		try:
+			if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+				raise RPCError(INVALID_REQUEST, 'Invalid Request')
+			if request['method'] not in self._methods:
+				raise RPCError(METHOD_NOT_FOUND, f"Method not found: '{request['method']}'")
+			params = request.get('params', {})
+			if not isinstance(params, dict):
+				raise RPCError(INVALID_PARAMS, "'params' must be an object")
+			method = self._methods[request['method']]
+			try:
+				signature(method).bind(**params)
+			except TypeError as e:
+				raise RPCError(INVALID_PARAMS, str(e))
+			result = method(**params)
+			response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+		except RPCError as e:
+			response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': e.message}}
+		except Exception as e:
+			_logger.error(f"An exception was raised while handling a request: {e}")
+			_logger.debug(traceback.format_exc())
+			response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': INTERNAL_ERROR, 'message': f'{type(e).__name__}: {e}'}}
+		if isinstance(request, dict) and 'id' not in request:  # a notification
+			return None
+		return response
+
+	def _get_formatter(self, formatter: str = None, config_formatter: str = None) -> BaseFormatter:
+		# return a formatter from the cache
+		if config_formatter is not None:
+			key = (os.path.abspath(config_formatter), os.stat(config_formatter).st_mtime_ns)
+			if key not in self._formatters:
+				self._formatters[key] = Formatter.from_config(config_formatter)
+			return self._formatters[key]
+		elif formatter is None:
+			return self.formatter
+		elif formatter not in self._formatters:
+			formatters = {'simple': Formatter.simple_format, 'numpy': Formatter.numpy_format}
+			if formatter not in formatters:
+				raise RPCError(INVALID_PARAMS, f"Unknown formatter: '{formatter}'")
+			self._formatters[formatter] = formatters[formatter]()
+		return self._formatters[formatter]
+
+	def _get_file(self, path: str, decorator_name: str) -> tuple:
+		# return the source code and the index of a file from the cache, the file is read again if it was modified
+		path = os.path.abspath(path)
+		try:
+			stat = os.stat(path)
+		except OSError:
+			raise RPCError(INVALID_PARAMS, f"The file was not found: '{path}'")
+		cached = self._files.get(path)
+		if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+			cached = self._files[path] = (stat.st_mtime_ns, stat.st_size, _source_io.read_source(path), {})
+		source_code, indexes = cached[2], cached[3]
+		if decorator_name not in indexes:
+			indexes[decorator_name] = SourceIndex(source_code, decorator_name)
+		return source_code, indexes[decorator_name]
+
+	def _get_buffer_index(self, source: str, decorator_name: str) -> SourceIndex:
+		# return the index of a buffer from the cache
+		key = (hashlib.sha1(source.encode('utf-8', 'surrogatepass')).hexdigest(), decorator_name)
+		index = self._buffers.pop(key, None)
+		if index is None:
+			index = SourceIndex(source, decorator_name)
+		self._buffers[key] = index
+		while len(self._buffers) > self.max_buffers:
+			self._buffers.popitem(last=False)
+		return index
+
+	def _document(self, source_code: str, index: SourceIndex, formatter: str, config_formatter: str,
+					decorator_name: str, remove_decorator: bool) -> str:
+		return create_docstrings_from_source(source_code, self._get_formatter(formatter, config_formatter),
+											remove_decorator, decorator_name, index=index)
+
+	def document_buffer(self, source: str, formatter: str = None, config_formatter: str = None,
+						decorator_name: str = None, remove_decorator: bool = True) -> dict:
+		"""Document a source code.
+
+		Parameters
+		----------
+		source : str
+			The source code to document
+		OPTIONAL[formatter] : str
+			The formatter name ('simple' or 'numpy'), the default formatter of server if None.
+			Default: None
+		OPTIONAL[config_formatter] : str
+			The path of a config file for the formatter.
+			Default: None
+		OPTIONAL[decorator_name] : str
+			The decorator name, the default decorator name of server if None.
+			Default: None
+		OPTIONAL[remove_decorator] : bool
+			If True, the decorators are removed.
+			Default: True
+
+		Returns
+		-------
+		result : dict
+			The new source code ('source') and if it's different of the source code ('changed')
+		"""
+		decorator_name = self.decorator_name if decorator_name is None else decorator_name
+		try:
+			index = self._get_buffer_index(source, decorator_name)
+		except SyntaxError as e:
+			raise RPCError(INVALID_PARAMS, f"SyntaxError: {e}")
+		new_source = self._document(source, index, formatter, config_formatter, decorator_name, remove_decorator)
+		return {'source': new_source, 'changed': new_source != source}
+
+	def document_file(self, path: str, new_path: str = None, write: bool = True, formatter: str = None,
+						config_formatter: str = None, decorator_name: str = None, remove_decorator: bool = True) -> dict:
+		"""Document a file.
+
+		Parameters
+		----------
+		path : str
+			The path of file to document
+		OPTIONAL[new_path] : str
+			The path where the new source code is written. If None, the file is overwritten.
+			Default: None
+		OPTIONAL[write] : bool
+			If False, the new source code is only returned.
+			Default: True
+		OPTIONAL[formatter] : str
+			The formatter name ('simple' or 'numpy'), the default formatter of server if None.
+			Default: None
+		OPTIONAL[config_formatter] : str
+			The path of a config file for the formatter.
+			Default: None
+		OPTIONAL[decorator_name] : str
+			The decorator name, the default decorator name of server if None.
+			Default: None
+		OPTIONAL[remove_decorator] : bool
+			If True, the decorators are removed.
+			Default: True
+
+		Returns
+		-------
+		result : dict
+			The path of new file ('path'), if the source code was changed ('changed') and the new source code ('source')
+		"""
+		decorator_name = self.decorator_name if decorator_name is None else decorator_name
+		try:
+			source_code, index = self._get_file(path, decorator_name)
+		except SyntaxError as e:
+			raise RPCError(INVALID_PARAMS, f"SyntaxError in '{path}': {e}")
+		new_source = self._document(source_code, index, formatter, config_formatter, decorator_name, remove_decorator)
+		new_path = os.path.abspath(path if new_path is None else new_path)
+		changed = new_source != source_code
+		if write and (changed or new_path != os.path.abspath(path)):
+			data = _source_io.encode_like(path, source_code, new_source)  # the encoding and the newlines of the file
+			if new_path != os.path.abspath(path):
+				_fs_utils.break_link(new_path)
+			with open(new_path, 'wb') as f:
+				f.write(data)
+		return {'path': new_path, 'changed': changed, 'source': new_source}
+
+	def document_package(self, path: str, new_package_path: str = None, subpackages: bool = True, formatter: str = None,
+							config_formatter: str = None, decorator_name: str = None, remove_decorator: bool = True,
+							include: list = None, exclude: list = None) -> dict:
+		"""Document all python files of a package folder.
+
+		Parameters
+		----------
+		path : str
+			The path of package folder
+		OPTIONAL[new_package_path] : str
+			The folder where the new files are written. If None, the files are overwritten.
+			Default: None
+		OPTIONAL[subpackages] : bool
+			If True, the subpackages are documented.
+			Default: True
+		OPTIONAL[formatter] : str
+			The formatter name ('simple' or 'numpy'), the default formatter of server if None.
+			Default: None
+		OPTIONAL[config_formatter] : str
+			The path of a config file for the formatter.
+			Default: None
+		OPTIONAL[decorator_name] : str
+			The decorator name, the default decorator name of server if None.
+			Default: None
+		OPTIONAL[remove_decorator] : bool
+			If True, the decorators are removed.
+			Default: True
+		OPTIONAL[include] : List[str]
+			The glob patterns of python files to document, relative to the package folder. All python files if None.
+			Default: None
+		OPTIONAL[exclude] : List[str]
+			The glob patterns of python files or folders to not document, relative to the package folder.
+			Default: None
+
+		Returns
+		-------
+		result : dict
+			The list of files changed ('files')
+		"""
+		package_dir = os.path.abspath(path)
+		if not os.path.isdir(package_dir):
+			raise RPCError(INVALID_PARAMS, f"The package folder was not found: '{path}'")
+		files = []
+		for module_path in discover_modules(package_dir, subpackages, include, exclude):
+			new_path = os.path.join(new_package_path, os.path.relpath(module_path, package_dir)) if new_package_path is not None else None
+			if new_path is not None:
+				os.makedirs(os.path.dirname(new_path), exist_ok=True)
+			if not has_marker(module_path, self.decorator_name if decorator_name is None else decorator_name):
+				if new_path is not None and not os.path.lexists(new_path):
+					_fs_utils.link_file(module_path, new_path)
+				continue
+			result = self.document_file(module_path, new_path, True, formatter, config_formatter, decorator_name, remove_decorator)
+			if result['changed']:
+				files.append(result['path'])
+		return {'files': files}
+
+	def check_file(self, path: str, formatter: str = None, config_formatter: str = None,
+					decorator_name: str = None, remove_decorator: bool = True) -> dict:
+		"""Check if a file has symbols to document.
+
+		Parameters
+		----------
+		path : str
+			The path of file to check
+		OPTIONAL[formatter] : str
+			The formatter name ('simple' or 'numpy'), the default formatter of server if None.
+			Default: None
+		OPTIONAL[config_formatter] : str
+			The path of a config file for the formatter.
+			Default: None
+		OPTIONAL[decorator_name] : str
+			The decorator name, the default decorator name of server if None.
+			Default: None
+		OPTIONAL[remove_decorator] : bool
+			If True, the decorators are removed.
+			Default: True
+
+		Returns
+		-------
+		result : dict
+			The path of file ('path') and if the file must be documented ('needs_changes')
+		"""
+		result = self.document_file(path, None, False, formatter, config_formatter, decorator_name, remove_decorator)
+		return {'path': result['path'], 'needs_changes': result['changed']}
+
+	def invalidate(self, path: str = None) -> dict:
+		"""Remove a file of caches, all files and buffers if 'path' is None.
+
+		Parameters
+		----------
+		OPTIONAL[path] : str
+			The path of file to remove of caches.
+			Default: None
+
+		Returns
+		-------
+		result : dict
+			The number of entries removed ('invalidated')
+		"""
+		if path is None:
+			invalidated = len(self._files) + len(self._buffers) + len(self._formatters)
+			self._files.clear()
+			self._buffers.clear()
+			self._formatters.clear()
+		else:
+			invalidated = 1 if self._files.pop(os.path.abspath(path), None) is not None else 0
+		return {'invalidated': invalidated}
+
+	def shutdown(self):
+		"""Stop the server after the response.
+
+		Returns
+		-------
+		None
+		"""
+		self._running = False
+		return None
+
+
+def serve(formatter: BaseFormatter = None, decorator_name: str = 'to_document'):
+	"""Run a JSON-RPC server on stdin/stdout until the end of stdin or a 'shutdown' request.
+
+	Parameters
+	----------
+	OPTIONAL[formatter] : BaseFormatter
+		The default formatter, the 'simple' formatter if None.
+		Default: None
+	OPTIONAL[decorator_name] : str
+		The default decorator name.
+		Default: 'to_document'
+
+	Returns
+	-------
+	None
+	"""
+	Server(formatter=formatter, decorator_name=decorator_name).serve_forever()
@@ -0,0 +1,298 @@
+"""Sinks to save the documented source code in a single file (a patch, an archive or a json file)."""
+import os
+import io
+import re
+import json
+import time
+import tarfile
+import zipfile
+from difflib import unified_diff
+
+from .utils import _source_io
+
+
+_LINE = re.compile(r'[^\n]*\n|[^\n]+')  # a line of a patch ends with '\n' only ('\r\n' keeps its '\r', like in git)
+
+
+class OutputSink:
+	"""A base class for sinks, a sink receives the documented source code of all files and writes it in one output.
+
+	Attributes
+	----------
+	path : str
+		The path of the output file.
+	root : str
+		The folder use to get the relative path of files in the output.
+		If None, the name of files is used.
+
+	Public methods
+	--------------
+	relative_path : str
+		Return the path of a file in the output.
+	write : None
+		Add the new source code of a file to the output.
+	close : None
+		Finish and close the output.
+	"""
+
+	def __init__(self, path: str, root: str = None):
+		self.path = os.path.abspath(path)
+		self.root = root
+		self._file = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def relative_path(self, path: str) -> str:
+		"""Return the path of a file in the output.
+
+		Parameters
+		----------
+		path : str
+			The path of the source file
+
+		Returns
+		-------
+		path : str
+			The relative path of file with '/' as separator
+		"""
+		if self.root is None:
+			return os.path.basename(path)
+		return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+	def write(self, path: str, source_code: str, new_source_code: str):
+		"""Add the new source code of a file to the output.
+
+		Parameters
+		----------
+		path : str
+			The path of the source file
+		source_code : str
+			The original source code
+		new_source_code : str
+			The source code with docstrings
+
+		Returns
+		-------
+		None
+		"""
+		raise NotImplementedError
+
+	def close(self):
+		"""Finish and close the output.
+
+		Returns
+		-------
+		None
+		"""
+		self._get_file().close()
+		self._file = None
+
+	def _open(self):
+		# open the output file
+		return open(self.path, 'w', encoding='utf-8', newline='')
+
+	def _get_file(self):
+		# return the output file, opened the first time
+		if self._file is None:
+			self._file = self._open()
+		return self._file
+
+
+def diff_lines(relative_path: str, source_code: str, new_source_code: str):
+	"""Return the lines of the unified diff of a file ('a/path' -> 'b/path').
+
+	Parameters
+	----------
+	relative_path : str
+		The path of file in the diff
+	source_code : str
+		The original source code
+	new_source_code : str
+		The source code with docstrings
+
+	Returns
+	-------
+	lines : Iterator[str]
+		The lines of diff, with their line endings. A last line without newline is followed by the marker
+		'\\ No newline at end of file', like `diff` and `git diff`, so the patch can be applied.
+	"""
+	for line in unified_diff(_LINE.findall(source_code), _LINE.findall(new_source_code),
+							fromfile=f'a/{relative_path}', tofile=f'b/{relative_path}'):
+		if line.endswith('\n'):
+			yield line
+		else:
+			yield line + '\n\\ No newline at end of file\n'
+
+
+class PatchSink(OutputSink):
+	"""A sink to write all changes in a single unified patch file.
+	The diff is built from the bytes of files (their encoding and their newlines), so the patch applies to files
+	which are not in utf-8 or which use '\r\n'.
+	"""
+
+	def write(self, path: str, source_code: str, new_source_code: str):
+		if source_code == new_source_code:
+			return
+		try:
+			with open(path, 'rb') as f:
+				raw = f.read()
+		except OSError:
+			raw = source_code.encode('utf-8')
+		data = _source_io.encode_source(raw, source_code, new_source_code)
+		# the bytes which are not utf-8 are decoded as surrogates, they are written back unchanged in the patch
+		self._get_file().writelines(diff_lines(self.relative_path(path), raw.decode('utf-8', 'surrogateescape'),
+												data.decode('utf-8', 'surrogateescape')))
+
+	def _open(self):
+		return open(self.path, 'w', encoding='utf-8', errors='surrogateescape', newline='')
+
+
+class ArchiveSink(OutputSink):
+	"""A sink to write all changed files in a zip or a tar archive.
+	The archive type is given by the extension of path ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz').
+	"""
+
+	def write(self, path: str, source_code: str, new_source_code: str):
+		if source_code == new_source_code:
+			return
+		relative_path = self.relative_path(path)
+		data = _source_io.encode_like(path, source_code, new_source_code)  # the encoding and the newlines of the file
+		if self.path.endswith('.zip'):
+			self._get_file().writestr(relative_path, data)
+		else:
+			info = tarfile.TarInfo(relative_path)
+			info.size = len(data)
+			info.mtime = time.time()
+			self._get_file().addfile(info, io.BytesIO(data))
+
+	def _open(self):
+		if self.path.endswith('.zip'):
+			return zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_DEFLATED)
+		return tarfile.open(self.path, 'w:' + _tar_compression(self.path))
+
+
+class JsonSink(OutputSink):
+	"""A sink to write a json file with the relative path of files in key and the new source code in value."""
+
+	def write(self, path: str, source_code: str, new_source_code: str):
+		if source_code == new_source_code:
+			return
+		file = self._get_file()
+		if self._nb_entries > 0:
+			file.write(',')
+		file.write(f'\n{json.dumps(self.relative_path(path))}: {json.dumps(new_source_code)}')
+		self._nb_entries += 1
+
+	def close(self):
+		self._get_file().write('\n}\n')
+		OutputSink.close(self)
+
+	def _open(self):
+		self._nb_entries = 0
+		file = open(self.path, 'w', encoding='utf-8', newline='')
+		file.write('{')
+		return file
+
+
+def _tar_compression(path: str) -> str:
+	# return the compression mode of tarfile from the extension of path
+	if path.endswith(('.tar.gz', '.tgz')):
+		return 'gz'
+	elif path.endswith(('.tar.bz2', '.tbz2')):
+		return 'bz2'
+	elif path.endswith(('.tar.xz', '.txz')):
+		return 'xz'
+	return ''
+
+
+class CheckSink(OutputSink):
+	"""A sink which writes nothing, it only lists the files which would be changed (for a check in CI).
+
+	Attributes
+	----------
+	changed : List[str]
+		The relative paths of files which would be changed.
+	"""
+
+	def __init__(self, root: str = None):
+		self.path = '<check>'
+		self.root = root
+		self.changed = []
+
+	def write(self, path: str, source_code: str, new_source_code: str):
+		if source_code != new_source_code:
+			self.changed.append(self.relative_path(path))
+
+	def close(self):
+		pass
+
+
+class MemorySink(OutputSink):
+	"""A sink which keeps the source codes of files in memory until they are taken (to stream the results of files).
+
+	Attributes
+	----------
+	files : Dict[str, Tuple[str, str]]
+		The original and the new source code of each file not taken yet.
+
+	Public methods
+	--------------
+	pop : Tuple[str, str]
+		Take the source codes of a file.
+	"""
+
+	def __init__(self, root: str = None):
+		self.path = '<memory>'
+		self.root = root
+		self.files = {}
+
+	def write(self, path: str, source_code: str, new_source_code: str):
+		self.files[path] = (source_code, new_source_code)
+
+	def pop(self, path: str) -> tuple:
+		"""Take the source codes of a file, they are removed from the sink.
+
+		Parameters
+		----------
+		path : str
+			The path of the source file
+
+		Returns
+		-------
+		source_codes : Tuple[str, str]
+			The original and the new source code, (None, None) if the file was not written in the sink
+		"""
+		return self.files.pop(path, (None, None))
+
+	def close(self):
+		self.files.clear()
+
+
+def get_sink(path: str, root: str = None) -> OutputSink:
+	"""A function to get the sink to use with the extension of path.
+
+	Parameters
+	----------
+	path : str
+		The path of output file. Extensions: '.patch' or '.diff' for a patch,
+		'.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz' for an archive, '.json' for a json file.
+	OPTIONAL[root] : str
+		The folder use to get the relative path of files in the output.
+		Default: None
+
+	Returns
+	-------
+	sink : OutputSink
+		The sink instance.
+	"""
+	if path.endswith(('.patch', '.diff')):
+		return PatchSink(path, root)
+	elif path.endswith(('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')):
+		return ArchiveSink(path, root)
+	elif path.endswith('.json'):
+		return JsonSink(path, root)
+	raise ValueError(f"The sink extension of '{path}' is not supported, use a patch, an archive or a json file.")
@@ -0,0 +1,268 @@
+"""A persistent index of the symbols to document, to not analyse again the files which didn't change between two runs.
+
+The index is a JSON-lines file: the first line is a header and each other line is the entry of a python file.
+    {"version": 1, "decorator_name": "to_document", "analysis": "static"}
+    {"path": "sub/module.py", "hash": "<sha1 of source code>", "size": 1234, "mtime_ns": 1700000000000000000, "symbols": [<symbol>, ...]}
+A symbol is a function, a class or a method (the methods follow their class):
+    {"kind": "function", "name": "func", "qualname": "func", "description": "...", "nb_base_tab": 1,
+     "fields": [["Parameters", "parameters", [[name, annotation or null, default or null], ...]], ...],
+     "signature_positions": [start, end], "docstring_start": offset, "signature": "def func(a: int) -> int:"}
+The positions are offsets in the source code (str) of file.
+"""
+import os
+import json
+import hashlib
+from json.decoder import scanstring
+
+from .documented import ClassToDocument
+from .workers import _record_symbol, RecordedFunctionToDocument, RecordedClassToDocument
+from . import _logger
+
+
+INDEX_VERSION = 2  # 2: the fields of each symbol are recorded (Yields, Raises)
+_PATH_PREFIX = '{"path":"'  # the start of entries written by 'save'
+
+
+def source_hash(source_code: str) -> str:
+	"""Return the hash of a source code use in the index.
+
+	Parameters
+	----------
+	source_code : str
+		The source code
+
+	Returns
+	-------
+	hash : str
+		The sha1 of source code (utf-8)
+	"""
+	return hashlib.sha1(source_code.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class SymbolIndex:
+	"""A persistent index of the symbols to document of python files.
+	An entry is used only if the hash of the source code didn't change, and only with the static analysis: the symbols of an
+	imported module also depend on the modules it imports (inherited members, evaluated defaults), which are not in the entry.
+
+	Attributes
+	----------
+	path : str
+		The path of the index file (JSON-lines).
+	root : str
+		The folder use to get the relative path of files in the index. If None, the absolute paths are used.
+	decorator_name : str
+		The name of decorator 'to_document' used to build the index.
+	analysis : str
+		The analysis used to build the index: 'static' or 'import'.
+	files : Dict[str, Union[dict, str]]
+		The entry of each file with the relative path in key.
+		The entries loaded are kept as JSON text and they are parsed when they are used.
+
+	Public methods
+	--------------
+	load : SymbolIndex
+		Load an index file, the index is empty if the file doesn't exist or was built with other settings.
+	save : None
+		Write the index in its file.
+	is_fresh : bool
+		Return True if a file has an entry and its size and modification time didn't change.
+	get_symbols : List[Union[RecordedFunctionToDocument, RecordedClassToDocument]]
+		Return the symbols of a file if the source code didn't change.
+	add : None
+		Add or replace the entry of a file.
+	"""
+
+	def __init__(self, path: str, root: str = None, decorator_name: str = 'to_document', analysis: str = 'static'):
+		self.path = os.path.abspath(path)
+		self.root = root
+		self.decorator_name = decorator_name
+		self.analysis = analysis
+		self.files = {}
+		self._changed = False
+
+	@classmethod
+	def load(cls, path: str, root: str = None, decorator_name: str = 'to_document', analysis: str = 'static'):
+		"""Load an index file. The index is empty if the file doesn't exist or if it was built with another
+		version, decorator name or analysis. With the import analysis, the entries are updated but not reused.
+
+		Parameters
+		----------
+		path : str
+			The path of the index file
+		OPTIONAL[root] : str
+			The folder use to get the relative path of files in the index
+			Default: None
+		OPTIONAL[decorator_name] : str
+			The name of decorator 'to_document'
+			Default: 'to_document'
+		OPTIONAL[analysis] : str
+			The analysis: 'static' or 'import'
+			Default: 'static'
+
+		Returns
+		-------
+		index : SymbolIndex
+			The index loaded
+		"""
+		index = cls(path, root, decorator_name, analysis)
+		if not os.path.exists(index.path):
+			return index
+		with open(index.path, 'r', encoding='utf-8') as f:
+			try:
+				header = json.loads(f.readline() or '{}')
+			except json.JSONDecodeError:
+				header = {}
+			if header != index._header():
+				_logger.warning(f"The index '{index.path}' was built with other settings, it's not used.")
+				return index
+			for line in f:
+				if line.startswith(_PATH_PREFIX):  # only the path is decoded, the entry is parsed when it's used
+					path, _ = scanstring(line, len(_PATH_PREFIX))
+					index.files[path] = line.rstrip('\n')
+				elif line.strip():
+					entry = json.loads(line)
+					index.files[entry['path']] = entry
+		_logger.info(f"{len(index.files)} files loaded from the index '{index.path}'")
+		if not index._reusable():
+			_logger.warning(f"The entries of index '{index.path}' are not reused: they're only reused with the static analysis")
+		return index
+
+	def _reusable(self) -> bool:
+		# the entries are only reused with the static analysis: the documentation of an imported module also depends on the
+		# modules it imports, which are not in the entries
+		return self.analysis == 'static'
+
+	def _header(self) -> dict:
+		return {'version': INDEX_VERSION, 'decorator_name': self.decorator_name, 'analysis': self.analysis}
+
+	def _entry(self, path: str) -> dict:
+		# return the entry of a file (parsed), None if the file is not in the index
+		key = self._key(path)
+		entry = self.files.get(key)
+		if isinstance(entry, str):
+			entry = self.files[key] = json.loads(entry)
+		return entry
+
+	def _key(self, path: str) -> str:
+		# the relative path of a file in the index, with '/' as separator
+		path = os.path.abspath(path)
+		return path if self.root is None else os.path.relpath(path, self.root).replace(os.sep, '/')
+
+	def save(self):
+		"""Write the index in its file (only if an entry was added).
+
+		Returns
+		-------
+		None
+		"""
+		if not self._changed and os.path.exists(self.path):
+			return
+		with open(self.path, 'w', encoding='utf-8') as f:
+			f.write(json.dumps(self._header()) + '\n')
+			for entry in self.files.values():
+				f.write((entry if isinstance(entry, str) else json.dumps(entry, separators=(',', ':'))) + '\n')
+		self._changed = False
+		_logger.info(f"{len(self.files)} files saved in the index '{self.path}'")
+
+	def is_fresh(self, path: str) -> bool:
+		"""Return True if a file has an entry and its size and modification time didn't change (the file is not read).
+		Always False with the import analysis.
+
+		Parameters
+		----------
+		path : str
+			The path of file
+
+		Returns
+		-------
+		result : bool
+			True if the entry of file can be used
+		"""
+		entry = self._entry(path) if self._reusable() else None
+		if entry is None:
+			return False
+		stat = os.stat(path)
+		return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+	def get_symbols(self, path: str, source_code: str) -> list:
+		"""Return the symbols to document of a file if the source code didn't change since the entry was added.
+
+		Parameters
+		----------
+		path : str
+			The path of file
+		source_code : str
+			The current source code of file
+
+		Returns
+		-------
+		symbols : List[Union[RecordedFunctionToDocument, RecordedClassToDocument]]
+			The functions, the class and their methods to document (the methods follow their class)
+			with their 'signature_positions'. None if the file is not in the index, if it changed or with the import analysis.
+		"""
+		entry = self._entry(path) if self._reusable() else None
+		if entry is None or entry['hash'] != source_hash(source_code):
+			return None
+		symbols = []
+		for record in entry['symbols']:
+			symbol = RecordedClassToDocument(record) if record['kind'] == 'class' else RecordedFunctionToDocument(record)
+			symbol.signature_positions = tuple(record['signature_positions'])
+			symbols.append(symbol)
+		return symbols
+
+	def add(self, path: str, source_code: str, symbols: list, positions: list):
+		"""Add or replace the entry of a file.
+
+		Parameters
+		----------
+		path : str
+			The path of file
+		source_code : str
+			The source code of file
+		symbols : List[Union[FunctionToDocument, ClassToDocument]]
+			The functions, the class and their methods to document (the methods follow their class)
+		positions : List[Tuple[int, int]]
+			The signature positions of each symbol (start of signature, ':' at the end of signature)
+
+		Returns
+		-------
+		None
+		"""
+		records = []
+		for symbol, (start, end) in zip(symbols, positions):
+			record = _record_symbol(symbol)
+			record['methods'] = []  # the methods are recorded after their class
+			record['kind'] = 'class' if isinstance(symbol, ClassToDocument) else 'function'
+			record['signature_positions'] = [start, end]
+			record['docstring_start'] = source_code.find('\n', end) + 1
+			record['signature'] = source_code[start:end + 1]
+			records.append(record)
+		stat = os.stat(path)
+		self.files[self._key(path)] = {'path': self._key(path), 'hash': source_hash(source_code),
+										'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'symbols': records}
+		self._changed = True
+
+
+def load_index(path: str, root: str = None, decorator_name: str = 'to_document', analysis: str = 'static') -> SymbolIndex:
+	"""A function to load a symbol index (an empty index if the file doesn't exist).
+
+	Parameters
+	----------
+	path : str
+		The path of the index file
+	OPTIONAL[root] : str
+		The folder use to get the relative path of files in the index
+		Default: None
+	OPTIONAL[decorator_name] : str
+		The name of decorator 'to_document'
+		Default: 'to_document'
+	OPTIONAL[analysis] : str
+		The analysis: 'static' or 'import'
+		Default: 'static'
+
+	Returns
+	-------
+	index : SymbolIndex
+		The index loaded
+	"""
+	return SymbolIndex.load(path, root, decorator_name, analysis)
@@ -1,5 +1,12 @@
-from .formatter import Formatter
+from .formatter import BaseFormatter, Formatter
+from .annotations import render_annotation, clear_annotations_cache
 from . import _modules_utils
+from . import _log_utils
+from . import _scanner
+from . import _import_timer
+from . import _body
+from . import _source_io
+from . import _memory_profile
 
 try:
 	from . import coloredLoggerFormatter
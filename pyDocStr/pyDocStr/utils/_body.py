@@ -0,0 +1,141 @@
+"""Infer the fields 'Raises' and 'Yields' and the names of the returned values from the body of a function.
+The body is read with the ast node of the parse which found the function (the static analysis of the file,
+or the parse of the source of an imported function to read its annotations): the source code is not parsed again.
+"""
+import ast
+
+
+ITERATOR_NAMES = ('Iterator', 'Iterable', 'Generator', 'AsyncIterator', 'AsyncIterable', 'AsyncGenerator')
+TUPLE_NAMES = ('Tuple', 'tuple')
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)  # the yield and raise of nested scopes are not of the function
+
+
+class BodyFields:
+	"""The fields of a function inferred from its body.
+
+	Attributes
+	----------
+	raises : List[str]
+		The exceptions raised (source text: 'ValueError', 'errors.ConfigError'), in the order of the body.
+	is_generator : bool
+		True if the function contains 'yield' or 'yield from'.
+	return_names : List[str]
+		The names of the returned values if all 'return' statements return the same variable or the same tuple
+		of variables ('return total', 'return mean, std'), else None.
+	return_types : List[str]
+		The source text of the type of each returned value if the return annotation is a tuple of the same length, else None.
+	yield_name : str
+		The name of the yielded values if all 'yield' statements yield the same variable, else None.
+	yield_type : str
+		The source text of the type of the yielded values, read in the return annotation ('Iterator[int]' -> 'int'), else None.
+	"""
+
+	__slots__ = ('raises', 'is_generator', 'return_names', 'return_types', 'yield_name', 'yield_type')
+
+	def __init__(self, raises: list, is_generator: bool = False, return_names: list = None, return_types: list = None,
+					yield_name: str = None, yield_type: str = None):
+		self.raises = raises
+		self.is_generator = is_generator
+		self.return_names = return_names
+		self.return_types = return_types
+		self.yield_name = yield_name
+		self.yield_type = yield_type
+
+
+def _is_class_name(expression: str) -> bool:
+	# the raised objects whose name is not a class name ('raise error', 'raise make_error()') are not documented
+	return expression.rsplit('.', 1)[-1][:1].isupper()
+
+
+def _raised(exc, caught: tuple) -> list:
+	# return the exceptions raised by 'raise exc', 'caught' are the exceptions and the name of the enclosing 'except' handler
+	names, as_name = caught
+	if exc is None or (isinstance(exc, ast.Name) and exc.id == as_name):  # 'raise' or 'raise e' in a handler
+		return list(names)
+	if isinstance(exc, ast.Call):
+		exc = exc.func
+	if isinstance(exc, (ast.Name, ast.Attribute)):
+		expression = ast.unparse(exc)
+		return [expression] if _is_class_name(expression) else []
+	return []
+
+
+def _caught(handler) -> tuple:
+	# return the exceptions caught by an 'except' handler and its name
+	types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type] if handler.type is not None else []
+	names = [ast.unparse(type_) for type_ in types if isinstance(type_, (ast.Name, ast.Attribute))]
+	return tuple(name for name in names if _is_class_name(name)), handler.name
+
+
+def _value_names(value) -> tuple:
+	# return the names of a returned value: ('total',) for 'total', ('mean', 'std') for 'mean, std', None for an expression
+	if isinstance(value, ast.Name):
+		return (value.id,)
+	if isinstance(value, ast.Tuple) and value.elts and all(isinstance(elt, ast.Name) for elt in value.elts):
+		return tuple(elt.id for elt in value.elts)
+	return None
+
+
+def _same_names(values: list) -> tuple:
+	# return the names if all values have the same names, else None
+	names = {_value_names(value) for value in values}
+	return names.pop() if len(names) == 1 else None
+
+
+def _subscript_args(annotation, names: tuple) -> list:
+	# return the arguments of a subscripted annotation 'Name[a, b]' whose name is in 'names', else None
+	if not isinstance(annotation, ast.Subscript):
+		return None
+	value = annotation.value
+	name = value.id if isinstance(value, ast.Name) else value.attr if isinstance(value, ast.Attribute) else None
+	if name not in names:
+		return None
+	return list(annotation.slice.elts) if isinstance(annotation.slice, ast.Tuple) else [annotation.slice]
+
+
+def analyse_body(node, segment) -> BodyFields:
+	"""Infer the fields of a function from its body, with one walk of its nodes (the nested functions and class are skipped).
+
+	Parameters
+	----------
+	node : Union[ast.FunctionDef, ast.AsyncFunctionDef]
+		The node of function
+	segment : Callable[[ast.AST], str]
+		A function which returns the source text of a node
+
+	Returns
+	-------
+	fields : BodyFields
+		The fields inferred
+	"""
+	raises, returns, yields = {}, [], []
+	is_generator = False
+	no_handler = ((), None)
+	stack = [(child, no_handler) for child in reversed(node.body)]
+	while stack:
+		child, caught = stack.pop()
+		if isinstance(child, _SCOPES):
+			continue
+		if isinstance(child, ast.Raise):
+			raises.update(dict.fromkeys(_raised(child.exc, caught)))
+		elif isinstance(child, ast.Return):
+			if child.value is not None and not (isinstance(child.value, ast.Constant) and child.value.value is None):
+				returns.append(child.value)
+		elif isinstance(child, (ast.Yield, ast.YieldFrom)):
+			is_generator = True
+			yields.append(child.value if isinstance(child, ast.Yield) else None)
+		elif isinstance(child, ast.ExceptHandler):
+			caught = _caught(child)
+		stack.extend((grandchild, caught) for grandchild in reversed(list(ast.iter_child_nodes(child))))
+
+	return_names = _same_names(returns) if returns else None
+	return_types = None
+	if return_names is not None and len(return_names) > 1:
+		args = _subscript_args(node.returns, TUPLE_NAMES)
+		if args is not None and len(args) == len(return_names):
+			return_types = [segment(arg) for arg in args]
+	yield_names = _same_names(yields) if yields and None not in yields else None
+	args = _subscript_args(node.returns, ITERATOR_NAMES) if is_generator else None
+	return BodyFields(list(raises), is_generator, list(return_names) if return_names is not None else None, return_types,
+						yield_names[0] if yield_names is not None and len(yield_names) == 1 else None,
+						segment(args[0]) if args else None)
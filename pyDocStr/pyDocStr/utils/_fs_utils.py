@@ -0,0 +1,152 @@
+"""Functions to build an output tree without copying the files: the files are reflinked or hardlinked when it's possible."""
+import os
+import sys
+import shutil
+try:
+	import fcntl
+except ImportError:  # Windows
+	fcntl = None
+
+
+FICLONE = 0x40049409  # ioctl of Linux to clone a file (btrfs, xfs, ...)
+LINK_MODES = ('auto', 'reflink', 'hardlink', 'copy')
+
+
+def _reflink(src: str, dst: str) -> bool:
+	# clone a file (copy-on-write), return False if the file system doesn't support it
+	if fcntl is None or not sys.platform.startswith('linux'):
+		return False
+	try:
+		with open(src, 'rb') as f_src, open(dst, 'wb') as f_dst:
+			fcntl.ioctl(f_dst.fileno(), FICLONE, f_src.fileno())
+	except OSError:
+		if os.path.exists(dst):
+			os.unlink(dst)
+		return False
+	shutil.copystat(src, dst)
+	return True
+
+
+def _hardlink(src: str, dst: str) -> bool:
+	# hardlink a file, return False if it's not possible (other device, file system without hardlinks...)
+	try:
+		os.link(src, dst)
+	except OSError:
+		return False
+	return True
+
+
+def link_file(src: str, dst: str, mode: str = 'auto') -> str:
+	"""Create 'dst' with the content of 'src' without copying it if it's possible.
+
+	Parameters
+	----------
+	src : str
+		The path of file to copy
+	dst : str
+		The path of new file (it must not exist)
+	OPTIONAL[mode] : str
+		'reflink' (copy-on-write clone), 'hardlink', 'copy', or 'auto' to try a reflink, then a hardlink, then a copy.
+		If the reflink or the hardlink is not possible, the file is copied.
+		Default: 'auto'
+
+	Returns
+	-------
+	mode : str
+		The way the file was created: 'reflink', 'hardlink' or 'copy'
+	"""
+	if mode in ('auto', 'reflink') and _reflink(src, dst):
+		return 'reflink'
+	if mode in ('auto', 'hardlink') and _hardlink(src, dst):
+		return 'hardlink'
+	shutil.copy2(src, dst)
+	return 'copy'
+
+
+def link_tree(src: str, dst: str, mode: str = 'auto') -> dict:
+	"""Create the tree of folder 'dst' with the files of 'src' without copying them if it's possible (see `link_file`).
+	The symbolic links are created again (not followed). A file which already exists in 'dst' is kept if it's the file of 'src'
+	(hardlink) or if it's not older and has the same size, else it's created again (the file of 'src' changed since the last run).
+	Use `break_link` before writing a file of 'dst'.
+
+	Parameters
+	----------
+	src : str
+		The folder to copy
+	dst : str
+		The new folder
+	OPTIONAL[mode] : str
+		'auto', 'reflink', 'hardlink' or 'copy'
+		Default: 'auto'
+
+	Returns
+	-------
+	counts : Dict[str, int]
+		The number of files created with each way ('reflink', 'hardlink', 'copy', 'symlink'), and the number of files
+		of 'dst' created again ('refreshed')
+	"""
+	counts = {'reflink': 0, 'hardlink': 0, 'copy': 0, 'symlink': 0, 'refreshed': 0}
+	folders = [(os.path.abspath(src), os.path.abspath(dst))]
+	while folders:
+		src_folder, dst_folder = folders.pop()
+		os.makedirs(dst_folder, exist_ok=True)
+		with os.scandir(src_folder) as entries:
+			for entry in entries:
+				dst_path = os.path.join(dst_folder, entry.name)
+				if entry.is_symlink():
+					if os.path.lexists(dst_path) and not _is_stale_link(entry.path, dst_path):
+						continue
+					if os.path.lexists(dst_path):
+						os.unlink(dst_path)
+						counts['refreshed'] += 1
+					os.symlink(os.readlink(entry.path), dst_path)
+					counts['symlink'] += 1
+				elif entry.is_dir():
+					folders.append((entry.path, dst_path))
+				elif not os.path.lexists(dst_path) or _is_stale_file(entry, dst_path):
+					if os.path.lexists(dst_path):
+						os.unlink(dst_path)
+						counts['refreshed'] += 1
+					used_mode = link_file(entry.path, dst_path, mode)
+					counts[used_mode] += 1
+					if mode == 'auto' and used_mode != 'reflink':
+						mode = 'hardlink' if used_mode == 'hardlink' else 'copy'  # don't try again for the other files
+	return counts
+
+
+def _is_stale_link(src: str, dst: str) -> bool:
+	# True if the symbolic link of 'dst' doesn't point to the target of 'src'
+	return not os.path.islink(dst) or os.readlink(dst) != os.readlink(src)
+
+
+def _is_stale_file(entry: os.DirEntry, dst: str) -> bool:
+	# True if the file 'dst' of an output tree is not the file of 'src' (hardlink) and 'src' changed since 'dst' was created:
+	# 'src' is newer or has another size (a documented file of 'dst' is written again by the run anyway)
+	if os.path.islink(dst):
+		return True
+	if not os.path.isfile(dst):  # a folder is not replaced
+		return False
+	src_stat, dst_stat = entry.stat(), os.stat(dst)
+	if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+		return False
+	return src_stat.st_mtime_ns > dst_stat.st_mtime_ns or src_stat.st_size != dst_stat.st_size
+
+
+def break_link(path: str) -> bool:
+	"""Remove a file if it's a symbolic link or if it shares its content with other files (hardlink),
+	so the file can be written without changing the other files.
+
+	Parameters
+	----------
+	path : str
+		The path of file
+
+	Returns
+	-------
+	removed : bool
+		True if the file was removed
+	"""
+	if os.path.islink(path) or (os.path.isfile(path) and os.stat(path).st_nlink > 1):
+		os.unlink(path)
+		return True
+	return False
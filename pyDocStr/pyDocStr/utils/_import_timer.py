@@ -0,0 +1,249 @@
+"""Measure the import time of each module while the modules to document are imported, nested imports included
+(like `python -X importtime`).
+
+While a file to document is imported, a finder is the first of 'sys.meta_path': it finds the modules with the other finders
+and wraps the 'exec_module' of their loader to measure it. The time of a module is its cumulative time (with the imports
+it triggers) and its self time. A module already imported costs nothing and is not recorded again.
+"""
+import sys
+from time import perf_counter
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+
+
+_profile = None  # the profile of the current run, the imports are not measured if it's None
+
+
+class ImportProfile:
+	"""The import time of the modules imported by a run.
+
+	Attributes
+	----------
+	records : List[dict]
+		The record of each module imported: {'module', 'path', 'file' (the file to document whose import triggered it),
+		'parent' (the module which imported it, None for a file to document), 'cumulative', 'self'} (times in seconds).
+
+	Public methods
+	--------------
+	recording : ContextManager
+		Record the imports in this profile.
+	add : None
+		Add records (sent by an import worker).
+	slowest : List[dict]
+		Return the records of the slowest modules.
+	file_times : Dict[str, float]
+		Return the import time of each file to document.
+	to_dict : dict
+		Return the profile as a dictionary (for a JSON file).
+	"""
+
+	def __init__(self):
+		self.records = []
+		self._stack = []  # [module, time of the imports of module] of the modules being imported
+		self._file = None
+
+	@contextmanager
+	def recording(self):
+		"""Record the imports in this profile (the imports of the files to document by pyDocStr).
+
+		Returns
+		-------
+		profile : ContextManager[ImportProfile]
+			This profile
+		"""
+		global _profile
+		previous, _profile = _profile, self
+		try:
+			yield self
+		finally:
+			_profile = previous
+
+	@contextmanager
+	def _measure(self, module: str, path: str):
+		# measure the execution of a module, the time of its nested imports is subtracted from its self time
+		start = perf_counter()
+		self._stack.append([module, 0.])
+		try:
+			yield
+		finally:
+			cumulative = perf_counter() - start
+			_, children = self._stack.pop()
+			if self._stack:
+				self._stack[-1][1] += cumulative
+			self.records.append({'module': module, 'path': path, 'file': self._file, 'parent': self._stack[-1][0] if self._stack else None,
+								'cumulative': cumulative, 'self': cumulative - children})
+
+	def add(self, records: list):
+		"""Add records (sent by an import worker).
+
+		Parameters
+		----------
+		records : List[dict]
+			The records of modules
+
+		Returns
+		-------
+		None
+		"""
+		self.records.extend(records)
+
+	def slowest(self, nb_modules: int = 10, key: str = 'cumulative') -> list:
+		"""Return the records of the slowest modules.
+
+		Parameters
+		----------
+		OPTIONAL[nb_modules] : int
+			The number of modules
+			Default: 10
+		OPTIONAL[key] : str
+			'cumulative' (with the nested imports) or 'self'
+			Default: 'cumulative'
+
+		Returns
+		-------
+		records : List[dict]
+			The records, the slowest first
+		"""
+		return sorted(self.records, key=lambda record: record[key], reverse=True)[:nb_modules]
+
+	def file_times(self) -> dict:
+		"""Return the import time of each file to document (with its nested imports), the slowest first.
+
+		Returns
+		-------
+		times : Dict[str, float]
+			The import time of each file, in seconds
+		"""
+		times = {}
+		for record in self.records:
+			if record['parent'] is None and record['file'] is not None:
+				times[record['file']] = times.get(record['file'], 0.) + record['cumulative']
+		return dict(sorted(times.items(), key=lambda item: item[1], reverse=True))
+
+	def to_dict(self) -> dict:
+		"""Return the profile as a dictionary (for a JSON file).
+
+		Returns
+		-------
+		profile : dict
+			{'total': import time of the files to document, 'files': {file: time}, 'modules': records, the slowest first}
+		"""
+		file_times = self.file_times()
+		return {'total': sum(file_times.values()), 'files': file_times, 'modules': self.slowest(len(self.records))}
+
+	def __len__(self):
+		return len(self.records)
+
+	def __str__(self):
+		lines = [f"{record['cumulative'] * 1e3:9.1f} ms (self {record['self'] * 1e3:7.1f} ms)  {record['module']}"
+				for record in self.slowest()]
+		return "slowest imports:\n" + "\n".join(lines) if lines else "no import"
+
+	def __repr__(self):
+		return f"<ImportProfile {len(self.records)} modules>"
+
+
+class _TimingFinder(MetaPathFinder):
+	# find the modules with the next finders of 'sys.meta_path' and wrap the 'exec_module' of their loader
+
+	def __init__(self, profile: ImportProfile):
+		self.profile = profile
+
+	def find_spec(self, name, path, target=None):
+		for finder in sys.meta_path:
+			find_spec = getattr(finder, 'find_spec', None)
+			if finder is self or isinstance(finder, _TimingFinder) or find_spec is None:
+				continue
+			spec = find_spec(name, path, target)
+			if spec is not None:
+				_wrap_loader(spec)
+				return spec
+		return None
+
+
+def _wrap_loader(spec):
+	# measure the 'exec_module' of the loader of a spec. The loaders shared by several modules (builtin and frozen
+	# modules, the loader is a class) are not wrapped, the loaders of files are created for one module
+	loader = spec.loader
+	exec_module = getattr(loader, 'exec_module', None)
+	if exec_module is None or isinstance(loader, type) or getattr(exec_module, '_timed', False):
+		return
+
+	def timed_exec_module(module):
+		with measure(spec.name, spec.origin):
+			exec_module(module)
+
+	timed_exec_module._timed = True
+	try:
+		loader.exec_module = timed_exec_module
+	except (AttributeError, TypeError):
+		pass
+
+
+@contextmanager
+def measure(module: str, path: str = None):
+	"""Measure the execution of a module in the profile of the current run (nothing is done without profile).
+
+	Parameters
+	----------
+	module : str
+		The name of module
+	OPTIONAL[path] : str
+		The path of module
+		Default: None
+
+	Returns
+	-------
+	None
+	"""
+	profile = _profile
+	if profile is None:
+		yield
+		return
+	with profile._measure(module, path):
+		yield
+
+
+@contextmanager
+def importing(file: str):
+	"""Measure the imports while a file to document is imported, in the profile of the current run
+	(nothing is done without profile).
+
+	Parameters
+	----------
+	file : str
+		The path of file to document
+
+	Returns
+	-------
+	None
+	"""
+	profile = _profile
+	if profile is None:
+		yield
+		return
+	finder = _TimingFinder(profile)
+	previous_file, profile._file = profile._file, file
+	sys.meta_path.insert(0, finder)
+	try:
+		yield
+	finally:
+		if finder in sys.meta_path:
+			sys.meta_path.remove(finder)
+		profile._file = previous_file
+
+
+def add_records(records: list):
+	"""Add the records sent by an import worker to the profile of the current run.
+
+	Parameters
+	----------
+	records : List[dict]
+		The records of modules
+
+	Returns
+	-------
+	None
+	"""
+	if _profile is not None and records:
+		_profile.add(records)
@@ -0,0 +1,160 @@
+"""Queue-based logging: the records are put in a queue and written by the handlers in a listener thread,
+so a logging call doesn't wait for the stream. The records of worker processes are sent to the main process
+and written by the same listener."""
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+
+_listeners = {}  # {name of logger: (listener, handlers replaced by the queue handler)}
+_MAX_BATCH = 1000  # the maximum number of records written together by the listener
+
+
+class _LocalQueueHandler(QueueHandler):
+	# a queue handler for a listener of the same process: the record is not copied nor formatted,
+	# only the message is built because its arguments can change before the record is written
+	def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+		record.msg, record.args = record.getMessage(), None
+		return record
+
+
+class _BatchListener(QueueListener):
+	# a listener which writes all the records waiting in the queue with one write by stream: a write releases the GIL,
+	# so a listener which writes the records one by one waits for the GIL after each record
+	def _monitor(self):
+		while True:
+			records = [self.dequeue(True)]
+			try:
+				while len(records) < _MAX_BATCH:
+					records.append(self.queue.get_nowait())
+			except queue.Empty:
+				pass
+			stop = self._sentinel in records
+			self._handle_batch([record for record in records if record is not self._sentinel])
+			if stop:
+				return
+
+	def _handle_batch(self, records: list):
+		for handler in self.handlers:
+			batch = [record for record in records if record.levelno >= handler.level]
+			if not batch:
+				continue
+			if type(handler) is not logging.StreamHandler:
+				for record in batch:
+					handler.handle(record)
+				continue
+			text = ''.join(handler.format(record) + handler.terminator for record in batch if handler.filter(record))
+			if text:
+				with handler.lock:
+					handler.stream.write(text)
+					handler.flush()
+
+
+class _ConnectionQueue:
+	# a 'queue' of QueueHandler which sends the records on the connection of a worker process
+	def __init__(self, connection):
+		self.connection = connection
+
+	def put_nowait(self, record: logging.LogRecord):
+		self.connection.send(('log', record))
+
+
+def queue_logging_pays_off(logger: logging.Logger) -> bool:
+	"""Return True if the queue logging makes the logging calls of a logger faster: its level lets through the records
+	of each file (the level 'info' or 'debug') and a handler writes in a terminal, where each write waits for the terminal.
+	A file, a pipe or the null device are buffered: a record written by the logging call costs less than a record put
+	in the queue (see the logging benchmark).
+
+	Parameters
+	----------
+	logger : logging.Logger
+		The logger
+
+	Returns
+	-------
+	pays_off : bool
+		True if the records should be written by a listener thread
+	"""
+	if logger.getEffectiveLevel() > logging.INFO:
+		return False
+	for handler in logger.handlers:
+		stream = getattr(handler, 'stream', None)
+		if stream is not None and hasattr(stream, 'isatty') and stream.isatty():
+			return True
+	return False
+
+
+def start_queue_logging(logger: logging.Logger) -> QueueListener:
+	"""Replace the handlers of a logger by a queue handler: the records are written by the handlers in a listener thread.
+	The listener is stopped at exit (the records in the queue are written).
+
+	Parameters
+	----------
+	logger : logging.Logger
+		The logger
+
+	Returns
+	-------
+	listener : QueueListener
+		The listener which writes the records (the same listener if the queue logging is already started)
+	"""
+	if logger.name in _listeners:
+		return _listeners[logger.name][0]
+	handlers = list(logger.handlers)
+	log_queue = queue.SimpleQueue()
+	listener = _BatchListener(log_queue, *handlers, respect_handler_level=True)
+	for handler in handlers:
+		logger.removeHandler(handler)
+	logger.addHandler(_LocalQueueHandler(log_queue))
+	listener.start()
+	_listeners[logger.name] = (listener, handlers)
+	atexit.register(stop_queue_logging, logger)  # nothing is done if the queue logging is already stopped
+	return listener
+
+
+def stop_queue_logging(logger: logging.Logger):
+	"""Write the records of the queue and give back its handlers to a logger.
+
+	Parameters
+	----------
+	logger : logging.Logger
+		The logger
+
+	Returns
+	-------
+	None
+	"""
+	if logger.name not in _listeners:
+		return
+	listener, handlers = _listeners.pop(logger.name)
+	listener.stop()
+	for handler in list(logger.handlers):
+		if isinstance(handler, QueueHandler):
+			logger.removeHandler(handler)
+	for handler in handlers:
+		logger.addHandler(handler)
+
+
+def send_logs_to_connection(logger: logging.Logger, connection, level: int):
+	"""Replace the handlers of a logger (in a worker process) by a queue handler which sends the records on a connection.
+	The main process passes the records received to its logger with `logger.handle`.
+
+	Parameters
+	----------
+	logger : logging.Logger
+		The logger of worker process
+	connection : multiprocessing.connection.Connection
+		The connection of worker with the main process
+	level : int
+		The level of logger in the main process
+
+	Returns
+	-------
+	None
+	"""
+	for handler in list(logger.handlers):
+		logger.removeHandler(handler)
+	logger.addHandler(QueueHandler(_ConnectionQueue(connection)))
+	logger.setLevel(level)
+	logger.propagate = False
@@ -0,0 +1,220 @@
+"""Measure the memory allocated by each stage of the pipeline and by each file with tracemalloc (like `--profile` for the imports).
+
+While a profile is recorded, each stage ('import', 'members', 'render'...) and each file is measured: its peak (the highest
+memory allocated during the stage, above the memory at its start) and the memory it retains at its end. A snapshot is taken
+around each stage to find the lines which allocated the memory retained by the stage (the top allocation sites).
+The snapshots are slow (they copy the traces of all memory blocks), this mode is for the profiling of runs.
+Only the memory of the current process is measured: the imports of the workers (`--workers`) are not measured.
+"""
+import tracemalloc
+from contextlib import contextmanager
+
+
+_profile = None  # the profile of the current run, the memory is not measured if it's None
+_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+NB_SITES_BY_STAGE = 10  # the number of allocation sites of each stage snapshot which are aggregated
+
+
+def _format_size(size: int) -> str:
+	# a size in KB under 1 MB, else in MB
+	return f"{size / 2**20:8.1f} MB" if abs(size) >= 2**20 else f"{size / 2**10:8.1f} KB"
+
+
+class MemoryProfile:
+	"""The memory allocated by each stage of the pipeline and by each file of a run.
+
+	Attributes
+	----------
+	stages : Dict[str, dict]
+		The memory of each stage: {'calls', 'peak' (the highest peak of a call, in bytes), 'retained' (the memory retained by all calls)}.
+	files : Dict[str, dict]
+		The memory of each file: {'peak', 'retained'} (in bytes).
+	sites : Dict[str, Dict[str, int]]
+		The memory retained by each allocation site ('path:line') of each stage, in bytes.
+	peak : int
+		The peak of memory traced during the run, in bytes.
+
+	Public methods
+	--------------
+	recording : ContextManager
+		Trace the memory allocations and record them in this profile.
+	top_sites : List[Tuple[str, int]]
+		Return the allocation sites which retained the most memory in a stage.
+	to_dict : dict
+		Return the profile as a dictionary (for a JSON file).
+	"""
+
+	def __init__(self):
+		self.stages = {}
+		self.files = {}
+		self.sites = {}
+		self.peak = 0
+		self._stack = []  # [memory at the start, peak] of the stages and files being measured
+
+	@contextmanager
+	def recording(self, nframes: int = 1):
+		"""Trace the memory allocations (tracemalloc is started if it's not already started) and record them in this profile.
+
+		Parameters
+		----------
+		OPTIONAL[nframes] : int
+			The number of frames of the traceback of allocations (the site of an allocation is its last frame)
+			Default: 1
+
+		Returns
+		-------
+		profile : ContextManager[MemoryProfile]
+			This profile
+		"""
+		global _profile
+		started = not tracemalloc.is_tracing()
+		if started:
+			tracemalloc.start(nframes)
+		previous, _profile = _profile, self
+		self._enter()
+		try:
+			yield self
+		finally:
+			self.peak = max(self.peak, self._exit()[0])
+			_profile = previous
+			if started:
+				tracemalloc.stop()
+
+	def _enter(self):
+		# start a measure, the peak of the measures in progress is saved before it's reset
+		current, peak = tracemalloc.get_traced_memory()
+		for frame in self._stack:
+			frame[1] = max(frame[1], peak)
+		tracemalloc.reset_peak()
+		self._stack.append([current, current])
+
+	def _exit(self) -> tuple:
+		# stop the last measure and return its peak and the memory it retains (above the memory at its start)
+		current, peak = tracemalloc.get_traced_memory()
+		start, frame_peak = self._stack.pop()
+		frame_peak = max(frame_peak, peak)
+		for frame in self._stack:
+			frame[1] = max(frame[1], frame_peak)
+		return frame_peak - start, current - start
+
+	@contextmanager
+	def _measure_stage(self, name: str):
+		start_snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+		self._enter()
+		try:
+			yield
+		finally:
+			peak, retained = self._exit()
+			stats = tracemalloc.take_snapshot().filter_traces(_FILTERS).compare_to(start_snapshot, 'lineno')
+			del start_snapshot
+			stage = self.stages.setdefault(name, {'calls': 0, 'peak': 0, 'retained': 0})
+			stage['calls'] += 1
+			stage['peak'] = max(stage['peak'], peak)
+			stage['retained'] += retained
+			sites = self.sites.setdefault(name, {})
+			for stat in stats[:NB_SITES_BY_STAGE]:
+				if stat.size_diff > 0:
+					frame = stat.traceback[-1]
+					site = f"{frame.filename}:{frame.lineno}"
+					sites[site] = sites.get(site, 0) + stat.size_diff
+
+	@contextmanager
+	def _measure_file(self, path: str):
+		self._enter()
+		try:
+			yield
+		finally:
+			peak, retained = self._exit()
+			file = self.files.setdefault(path, {'peak': 0, 'retained': 0})
+			file['peak'] = max(file['peak'], peak)
+			file['retained'] += retained
+
+	def top_sites(self, stage: str, nb_sites: int = 5) -> list:
+		"""Return the allocation sites which retained the most memory in a stage.
+
+		Parameters
+		----------
+		stage : str
+			The name of stage
+		OPTIONAL[nb_sites] : int
+			The number of sites
+			Default: 5
+
+		Returns
+		-------
+		sites : List[Tuple[str, int]]
+			The sites ('path:line') and the memory they retained (in bytes), the largest first
+		"""
+		return sorted(self.sites.get(stage, {}).items(), key=lambda item: item[1], reverse=True)[:nb_sites]
+
+	def to_dict(self) -> dict:
+		"""Return the profile as a dictionary (for a JSON file).
+
+		Returns
+		-------
+		profile : dict
+			{'peak': peak of run, 'stages': {stage: {'calls', 'peak', 'retained', 'top_sites': [{'site', 'retained'}]}},
+			'files': {file: {'peak', 'retained'}}}, the memory is in bytes and the stages and files with the highest peak are first
+		"""
+		stages = sorted(self.stages.items(), key=lambda item: item[1]['peak'], reverse=True)
+		return {
+			'peak': self.peak,
+			'stages': {name: dict(stage, top_sites=[{'site': site, 'retained': size} for site, size in self.top_sites(name, NB_SITES_BY_STAGE)])
+						for name, stage in stages},
+			'files': dict(sorted(self.files.items(), key=lambda item: item[1]['peak'], reverse=True)),
+		}
+
+	def __len__(self):
+		return len(self.stages)
+
+	def __str__(self):
+		lines = [f"peak of memory: {_format_size(self.peak)}"]
+		for name, stage in sorted(self.stages.items(), key=lambda item: item[1]['peak'], reverse=True):
+			lines.append(f"{_format_size(stage['peak'])} peak, {_format_size(stage['retained'])} retained  {name} ({stage['calls']} calls)")
+			lines.extend(f"{'':>16}{_format_size(size)}  {site}" for site, size in self.top_sites(name, 3))
+		return "\n".join(lines)
+
+	def __repr__(self):
+		return f"<MemoryProfile {len(self.stages)} stages, {len(self.files)} files>"
+
+
+@contextmanager
+def stage(name: str):
+	"""Measure a stage of the pipeline in the profile of the current run (nothing is done without profile).
+
+	Parameters
+	----------
+	name : str
+		The name of stage ('import', 'members', 'render'...)
+
+	Returns
+	-------
+	None
+	"""
+	profile = _profile
+	if profile is None:
+		yield
+		return
+	with profile._measure_stage(name):
+		yield
+
+
+@contextmanager
+def file(path: str):
+	"""Measure the documentation of a file in the profile of the current run (nothing is done without profile).
+
+	Parameters
+	----------
+	path : str
+		The path of file
+
+	Returns
+	-------
+	None
+	"""
+	profile = _profile
+	if profile is None:
+		yield
+		return
+	with profile._measure_file(path):
+		yield
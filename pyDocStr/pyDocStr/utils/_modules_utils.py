@@ -1,8 +1,11 @@
 import os
+import sys
 from importlib import import_module
 from importlib.util import spec_from_file_location, module_from_spec
 from inspect import getmembers
 
+from . import _import_timer
+
 
 def _import_from_path(path: str):
 	"""A function to load a module from a path.
@@ -25,7 +28,8 @@ def _import_from_path(path: str):
 			path = os.path.join(path, '__init__.py')
 		spec = spec_from_file_location(module_name, path)
 		module = module_from_spec(spec)
-		spec.loader.exec_module(module)
+		with _import_timer.measure(module_name, path):
+			spec.loader.exec_module(module)
 
 		return module
 	except ImportError as e:
@@ -51,3 +55,125 @@ def _is_subpackage_of(package, parent):
 	package_path = os.path.abspath(package.__file__)
 	parent_path = os.path.abspath(parent.__file__)
 	return os.path.commonpath([package_path, parent_path]) == os.path.dirname(parent_path)
+
+
+def _module_name_from_path(path: str) -> tuple:
+	"""A function to get the full name of a module from its path, with the names of its parent packages.
+	
+	Parameters
+	----------
+	path : str
+		The path of python file.
+	
+	Returns
+	-------
+	folder : str
+		The folder which contains the top-level package (to add in sys.path).
+	name : str
+		The full name of module ('package.subpackage.module').
+	"""
+	folder, filename = os.path.split(os.path.abspath(path))
+	names = [] if filename == '__init__.py' else [os.path.splitext(filename)[0]]
+	while os.path.isfile(os.path.join(folder, '__init__.py')):
+		folder, name = os.path.split(folder)
+		names.insert(0, name)
+	return folder, '.'.join(names)
+
+
+def _import_from_package(path: str, package_dir: str, package_name: str):
+	"""A function to import a python file of a package folder as a submodule of this package, so the relative imports work.
+	A module already imported is not imported again. sys.path is restored after the import.
+	
+	Parameters
+	----------
+	path : str
+		The path of python file to import.
+	package_dir : str
+		The folder of package.
+	package_name : str
+		The name of package.
+	
+	Returns
+	-------
+	module : Module
+		The module imported.
+	"""
+	names = os.path.splitext(os.path.relpath(path, package_dir))[0].split(os.sep)
+	if names[-1] == '__init__':
+		names = names[:-1]
+	saved_path = list(sys.path)
+	if package_name not in sys.modules and os.path.dirname(package_dir) not in sys.path:
+		sys.path.insert(0, os.path.dirname(package_dir))
+	try:
+		return import_module('.'.join([package_name] + names))
+	finally:
+		sys.path[:] = saved_path
+
+
+def _forget_other_modules(folder: str, name: str) -> tuple:
+	# remove from sys.modules the modules with the name (or a parent package name) of a module loaded from another file
+	# (another root or the modules of caller), else 'import_module' would return the module of the other file.
+	# Return the name of package removed and the modules removed, to restore them after the import (None, {}) if nothing was removed
+	parts = name.split('.')
+	for i in range(1, len(parts) + 1):
+		prefix = '.'.join(parts[:i])
+		module = sys.modules.get(prefix)
+		if module is None:
+			continue
+		expected = os.path.realpath(os.path.join(folder, *parts[:i]))
+		file = getattr(module, '__file__', None)
+		if file is None or os.path.splitext(os.path.realpath(file))[0] not in (expected, os.path.join(expected, '__init__')):
+			return prefix, {loaded: sys.modules.pop(loaded) for loaded in _package_modules(prefix)}
+	return None, {}
+
+
+def _package_modules(prefix: str) -> list:
+	# the names of a package and of its submodules in sys.modules
+	return [loaded for loaded in sys.modules if loaded == prefix or loaded.startswith(prefix + '.')]
+
+
+def _restore_modules(prefix: str, forgotten: dict):
+	# remove the modules of package 'prefix' added by an import and put back the modules removed by '_forget_other_modules'
+	if prefix is None:
+		return
+	for loaded in _package_modules(prefix):
+		del sys.modules[loaded]
+	sys.modules.update(forgotten)
+
+
+def _import_from_file(path: str):
+	"""A function to import a python file with the names of its parent packages, so the relative imports work.
+	A file outside of a package is loaded from its path and not kept in sys.modules (two roots can have a 'util.py').
+	The folder of the top-level package is moved first in sys.path during the import: a module of this folder wins over
+	a module with the same name of another root. sys.path is restored after the import, and the modules of another file
+	with the same name (another root, or the modules of caller) are put back in sys.modules.
+	
+	Parameters
+	----------
+	path : str
+		The path of python file (or of package folder) to import.
+	
+	Returns
+	-------
+	module : Module
+		The module imported.
+	"""
+	path = os.path.abspath(path)
+	if os.path.isdir(path):
+		path = os.path.join(path, '__init__.py')
+	folder, name = _module_name_from_path(path)
+	saved_path = list(sys.path)
+	if folder in sys.path:
+		sys.path.remove(folder)
+	sys.path.insert(0, folder)
+	try:
+		if '.' not in name and os.path.basename(path) != '__init__.py':
+			return _import_from_path(path)
+		prefix, forgotten = _forget_other_modules(folder, name)
+		try:
+			return import_module(name)
+		finally:
+			# the module imported keeps its source: the classes and functions are analysed when they are decorated
+			_restore_modules(prefix, forgotten)
+	finally:
+		sys.path[:] = saved_path
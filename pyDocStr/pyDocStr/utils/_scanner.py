@@ -0,0 +1,221 @@
+"""A scanner of the signatures of functions and class, in linear time.
+
+The source code is read once: the strings and the comments are skipped, and each header ('def', 'async def', 'class')
+at the start of a line is followed to the ':' which ends its signature (the brackets, the strings and the comments
+of the signature are skipped, so the defaults can contain parentheses, colons or strings).
+Each character is read by one regex token at most once, there is no backtracking over the rest of the file.
+The source code must be valid python code: the scan stops at a signature which is not closed.
+"""
+import re
+
+
+_STRING = (
+	r"[rRbBuUfF]{0,2}(?:"
+	r"'''(?:[^'\\]|\\.|'(?!''))*(?:'''|\Z)"
+	r'|"""(?:[^"\\]|\\.|"(?!""))*(?:"""|\Z)'
+	r"|'(?:[^'\\\n]|\\.)*(?:'|(?=\n)|\Z)"
+	r'|"(?:[^"\\\n]|\\.)*(?:"|(?=\n)|\Z)'
+	r")"
+)  # an unterminated string ends at the end of line (or of file), so a string can't fail and be read again
+_COMMENT = r"#[^\n]*"
+
+# the tokens of the source code: the strings, the comments and the headers
+_HEADER_RE = re.compile(
+	rf"(?P<string>{_STRING})|{_COMMENT}|^(?P<indent>[ \t]*)(?P<async>async[ \t]+)?(?P<kind>def|class)[ \t]+(?P<name>\w+)",
+	re.MULTILINE | re.DOTALL)
+# the tokens of a signature: the strings, the comments, the brackets, ':' and the newlines
+_SIGNATURE_RE = re.compile(rf"{_STRING}|{_COMMENT}|\\\n|[()\[\]{{}}:\n]", re.DOTALL)
+
+_OPENING, _CLOSING = '([{', ')]}'
+
+
+class Header:
+	"""The header of a function or a class found by the scanner.
+
+	Attributes
+	----------
+	kind : str
+		'def' (function or method, 'async def' included) or 'class'.
+	name : str
+		The name of function or class.
+	indent : str
+		The indentation of header.
+	start : int
+		The position of the start of header ('def', 'async' or 'class').
+	end : int
+		The position of ':' at the end of signature.
+	qualname : str
+		The qualified name, found with the indentation of the headers ('Class.method', 'function.<locals>.nested').
+	"""
+
+	__slots__ = ('kind', 'name', 'indent', 'start', 'end', 'qualname')
+
+	def __init__(self, kind: str, name: str, indent: str, start: int, end: int, qualname: str = None):
+		self.kind = kind
+		self.name = name
+		self.indent = indent
+		self.start = start
+		self.end = end
+		self.qualname = qualname if qualname is not None else name
+
+	def __repr__(self):
+		return f"<Header {self.kind} {self.name} ({self.start}, {self.end})>"
+
+
+def _signature_end(source_code: str, start: int) -> tuple:
+	# return the position of ':' which ends a signature (the search starts after the name), -1 if the signature is not closed,
+	# and the position where the scan stopped
+	depth = 0
+	for token in _SIGNATURE_RE.finditer(source_code, start):
+		char = token.group()
+		if char in _OPENING:
+			depth += 1
+		elif char in _CLOSING:
+			depth = max(depth - 1, 0)
+		elif char == ':' and depth == 0:
+			return token.start(), token.end()
+		elif char == '\n' and depth == 0:  # a new logical line without ':'
+			return -1, token.end()
+	return -1, len(source_code)
+
+
+def scan_headers(source_code: str) -> list:
+	"""Find the headers of functions and class of a source code, in linear time.
+
+	Parameters
+	----------
+	source_code : str
+		The source code
+
+	Returns
+	-------
+	headers : List[Header]
+		The headers in the order of the source code, with their qualified name
+	"""
+	headers = []
+	parents = []  # the headers which contain the current header (a header contains the next headers more indented)
+	position = 0
+	while True:
+		token = _HEADER_RE.search(source_code, position)
+		if token is None:
+			return headers
+		position = token.end()
+		if token.group('kind') is None:  # a string or a comment
+			continue
+		start = token.start('async') if token.group('async') is not None else token.start('kind')
+		end, position = _signature_end(source_code, position)
+		if end == -1:
+			continue
+		header = Header(token.group('kind'), token.group('name'), token.group('indent'), start, end)
+		while parents and len(parents[-1].indent) >= len(header.indent):
+			parents.pop()
+		if parents:
+			parent = parents[-1]
+			header.qualname = parent.qualname + ('.<locals>.' if parent.kind == 'def' else '.') + header.name
+		parents.append(header)
+		headers.append(header)
+
+
+class SignatureScanner:
+	"""The signatures of functions and class of a source code, found with one linear scan.
+
+	Attributes
+	----------
+	source_code : str
+		The source code scanned.
+	headers : List[Header]
+		The headers of functions and class in the order of the source code.
+
+	Public methods
+	--------------
+	function_positions : Tuple[int, int]
+		Return the positions of the first signature of a function.
+	class_positions : Tuple[int, int]
+		Return the positions of the first signature of a class.
+	positions : Tuple[int, int]
+		Return the positions of the signature of a function or a class with its qualified name.
+	"""
+
+	def __init__(self, source_code: str):
+		self.source_code = source_code
+		self.headers = scan_headers(source_code)
+		self._first, self._qualnames = {}, {}
+		for header in self.headers:
+			self._first.setdefault((header.kind, header.name), header)
+			self._qualnames.setdefault((header.kind, header.qualname), header)
+
+	def _positions(self, kind: str, name: str) -> tuple:
+		header = self._first.get((kind, name))
+		return (header.start, header.end) if header is not None else None
+
+	def positions(self, kind: str, qualname: str) -> tuple:
+		"""Return the positions of the signature of a function or a class with its qualified name
+		(a method is only searched in its class).
+
+		Parameters
+		----------
+		kind : str
+			'def' or 'class'
+		qualname : str
+			The qualified name ('function', 'Class', 'Class.method'...)
+
+		Returns
+		-------
+		positions : Tuple[int, int]
+			The start of signature and the position of ':' at the end of signature, None if the qualified name was not found
+		"""
+		header = self._qualnames.get((kind, qualname))
+		return (header.start, header.end) if header is not None else None
+
+	def function_positions(self, name: str) -> tuple:
+		"""Return the positions of the first signature of a function ('def' or 'async def').
+
+		Parameters
+		----------
+		name : str
+			The name of function
+
+		Returns
+		-------
+		positions : Tuple[int, int]
+			The start of signature and the position of ':' at the end of signature, None if the function was not found
+		"""
+		return self._positions('def', name)
+
+	def class_positions(self, name: str) -> tuple:
+		"""Return the positions of the first signature of a class.
+
+		Parameters
+		----------
+		name : str
+			The name of class
+
+		Returns
+		-------
+		positions : Tuple[int, int]
+			The start of signature and the position of ':' at the end of signature, None if the class was not found
+		"""
+		return self._positions('class', name)
+
+
+_last_scanner = None  # the scanner of the last source code, a module is scanned once for all its symbols
+
+
+def get_scanner(source_code: str) -> SignatureScanner:
+	"""Return the scanner of a source code, the scanner of the last source code is reused.
+
+	Parameters
+	----------
+	source_code : str
+		The source code
+
+	Returns
+	-------
+	scanner : SignatureScanner
+		The scanner of source code
+	"""
+	global _last_scanner
+	scanner = _last_scanner
+	if scanner is None or scanner.source_code is not source_code:
+		scanner = _last_scanner = SignatureScanner(source_code)
+	return scanner
@@ -0,0 +1,131 @@
+"""Read and write python files like the interpreter reads them, without changing the bytes which are not documented.
+
+A file is decoded with its encoding (the BOM or the PEP 263 cookie: '# -*- coding: latin-1 -*-') and its newlines are
+normalized to '\n' for the analysis. A new source code is encoded with the encoding and the newline of the original file:
+the lines which didn't change keep their original bytes (a file with mixed newlines keeps them), only the new lines
+(docstrings) use the newline of the file.
+"""
+import io
+import re
+from difflib import SequenceMatcher
+from tokenize import detect_encoding
+
+
+_LINE = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')  # a line of the original text with its newline
+_NORMALIZED_LINE = re.compile(r'[^\n]*\n|[^\n]+')
+_NEWLINE = re.compile(r'\r\n|\r|\n')
+
+
+def _encoding(raw: bytes) -> str:
+	# the encoding of a python file: 'utf-8-sig' with a BOM, the encoding of the cookie, else 'utf-8'
+	return detect_encoding(io.BytesIO(raw).readline)[0]
+
+
+def _normalize(text: str) -> str:
+	return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def decode_source(raw: bytes) -> str:
+	"""Return the source code of a python file with its encoding and the newlines normalized to '\n'.
+
+	Parameters
+	----------
+	raw : bytes
+		The content of file
+
+	Returns
+	-------
+	source_code : str
+		The source code
+	"""
+	return _normalize(raw.decode(_encoding(raw)))
+
+
+def read_source(path: str) -> str:
+	"""Return the source code of a python file with its encoding and the newlines normalized to '\n'.
+
+	Parameters
+	----------
+	path : str
+		The path of file
+
+	Returns
+	-------
+	source_code : str
+		The source code
+	"""
+	with open(path, 'rb') as f:
+		return decode_source(f.read())
+
+
+def _splice(text: str, newline: str, source_code: str, new_source_code: str) -> str:
+	# return the new source code with the original lines (and their newlines) for the lines which didn't change
+	lines = _LINE.findall(text)
+	normalized_lines = _NORMALIZED_LINE.findall(source_code)
+	new_lines = _NORMALIZED_LINE.findall(new_source_code)
+	spliced = []
+	for tag, i1, i2, j1, j2 in SequenceMatcher(None, normalized_lines, new_lines, autojunk=False).get_opcodes():
+		if tag == 'equal':
+			spliced.extend(lines[i1:i2])
+		else:
+			spliced.extend(line[:-1] + newline if line.endswith('\n') else line for line in new_lines[j1:j2])
+	return ''.join(spliced)
+
+
+def encode_source(raw: bytes, source_code: str, new_source_code: str) -> bytes:
+	"""Return the bytes of a new source code with the encoding and the newlines of the original file.
+
+	Parameters
+	----------
+	raw : bytes
+		The content of original file
+	source_code : str
+		The source code read in the original file (newlines normalized)
+	new_source_code : str
+		The new source code (newlines normalized)
+
+	Returns
+	-------
+	data : bytes
+		The new content of file. If the new source code is the source code, it's the original content.
+
+	Raises
+	------
+	UnicodeEncodeError
+		If the new source code has a character which can't be encoded with the encoding of file.
+	"""
+	encoding = _encoding(raw)
+	text = raw.decode(encoding)
+	match = _NEWLINE.search(text)
+	newline = match.group() if match is not None else '\n'
+	if new_source_code == source_code and _normalize(text) == source_code:
+		return raw
+	if source_code.replace('\n', newline) == text or _normalize(text) != source_code:
+		# one newline in the file (or the file changed since it was read): the newlines are replaced
+		return new_source_code.replace('\n', newline).encode(encoding)
+	return _splice(text, newline, source_code, new_source_code).encode(encoding)
+
+
+def encode_like(path: str, source_code: str, new_source_code: str) -> bytes:
+	"""Return the bytes of a new source code with the encoding and the newlines of an original file.
+
+	Parameters
+	----------
+	path : str
+		The path of original file
+	source_code : str
+		The source code read in the original file (newlines normalized)
+	new_source_code : str
+		The new source code (newlines normalized)
+
+	Returns
+	-------
+	data : bytes
+		The new content of file, encoded in utf-8 if the original file can't be read.
+	"""
+	try:
+		with open(path, 'rb') as f:
+			raw = f.read()
+	except OSError:
+		return new_source_code.encode('utf-8')
+	return encode_source(raw, source_code, new_source_code)
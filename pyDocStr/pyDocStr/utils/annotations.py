@@ -0,0 +1,153 @@
+"""Functions to render annotations in docstrings without evaluating them."""
+import ast
+import sys
+import textwrap
+from functools import lru_cache
+from inspect import _empty
+
+from ._body import analyse_body
+
+
+ANNOTATIONS_CACHE_SIZE = 4096  # the number of rendered annotations kept (the least recently used are dropped)
+
+
+def _render_expression(node) -> str:
+	# render an annotation expression, the quoted annotations (forward references) are rendered without quotes
+	if isinstance(node, ast.Constant) and isinstance(node.value, str):
+		try:
+			return _render_expression(ast.parse(node.value, mode='eval').body)
+		except SyntaxError:
+			return node.value
+	return ast.unparse(node).replace('typing.', '')
+
+
+def _render(annotation) -> str:
+	# render an annotation without cache
+	if isinstance(annotation, str):  # source text of the annotation
+		try:
+			return _render_expression(ast.parse(annotation.strip(), mode='eval').body)
+		except SyntaxError:
+			return annotation.replace('typing.', '')
+	elif isinstance(annotation, type):
+		return annotation.__name__
+	return str(annotation).replace('typing.', '')
+
+
+@lru_cache(maxsize=ANNOTATIONS_CACHE_SIZE, typed=True)
+def _rendered_annotation(annotation) -> str:
+	# process-wide cache of rendered annotations, bounded so a long-running server doesn't keep all the annotations it saw
+	return sys.intern(_render(annotation))
+
+
+def render_annotation(annotation) -> str:
+	"""Return the string of an annotation to use in a docstring.
+	The annotation can be the source text of annotation (not evaluated) or an annotation object.
+	The rendered strings are interned and cached for the process.
+
+	Parameters
+	----------
+	annotation : Union[str, type, object]
+		The annotation to render. If it's a str, it's the source text of annotation.
+
+	Returns
+	-------
+	result : str
+		The annotation rendered, '{TYPE}' if there is no annotation.
+	"""
+	if annotation is _empty:
+		return '{TYPE}'
+	try:
+		return _rendered_annotation(annotation)
+	except TypeError:  # annotation not hashable
+		return sys.intern(_render(annotation))
+
+
+def clear_annotations_cache():
+	"""Clear the cache of rendered annotations.
+
+	Returns
+	-------
+	None
+	"""
+	_rendered_annotation.cache_clear()
+
+
+def _source_segment(lines: list, node) -> str:
+	# return the source text of a node, like ast.get_source_segment without splitting the source for each node
+	# lines are the lines of source code without line endings (source.split('\n'))
+	if node.lineno == node.end_lineno:
+		line = lines[node.lineno - 1]
+		if line.isascii():
+			return line[node.col_offset:node.end_col_offset]
+		return line.encode()[node.col_offset:node.end_col_offset].decode()
+	segment = [line.encode() for line in lines[node.lineno - 1:node.end_lineno]]
+	segment[0] = segment[0][node.col_offset:]
+	segment[-1] = segment[-1][:node.end_col_offset]
+	return b'\n'.join(segment).decode()
+
+
+def _function_node(source: str) -> tuple:
+	# return the node of the first function defined in a source code and the lines of the dedented source, (None, None) if there is none
+	source = textwrap.dedent(source)
+	try:
+		tree = ast.parse(source)
+	except SyntaxError:
+		return None, None
+	for node in ast.walk(tree):
+		if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+			return node, source.split('\n')
+	return None, None
+
+
+def _annotations(node, lines: list) -> tuple:
+	# return the source text of the annotations of the parameters and the return annotation of a function node
+	args = node.args
+	parameters = {arg.arg: _source_segment(lines, arg.annotation)
+					for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]
+					if arg is not None and arg.annotation is not None}
+	returns = _source_segment(lines, node.returns) if node.returns is not None else None
+	return parameters, returns
+
+
+def annotations_from_source(source: str) -> tuple:
+	"""Return the source text of the annotations of the first function defined in a source code.
+
+	Parameters
+	----------
+	source : str
+		The source code of the function (can be indented)
+
+	Returns
+	-------
+	parameters : Dict[str, str]
+		The source text of annotation for each annotated parameter.
+	returns : str
+		The source text of return annotation, None if there is no return annotation.
+	"""
+	node, lines = _function_node(source)
+	return _annotations(node, lines) if node is not None else ({}, None)
+
+
+def function_from_source(source: str) -> tuple:
+	"""Return the source text of the annotations and the fields inferred from the body of the first function
+	defined in a source code, with one parse of the source code.
+
+	Parameters
+	----------
+	source : str
+		The source code of the function (can be indented)
+
+	Returns
+	-------
+	parameters : Dict[str, str]
+		The source text of annotation for each annotated parameter.
+	returns : str
+		The source text of return annotation, None if there is no return annotation.
+	body : BodyFields
+		The fields inferred from the body of function (raises, yields, names of returned values), None if the source can't be parsed.
+	"""
+	node, lines = _function_node(source)
+	if node is None:
+		return {}, None, None
+	parameters, returns = _annotations(node, lines)
+	return parameters, returns, analyse_body(node, lambda expression: _source_segment(lines, expression))
@@ -23,6 +23,8 @@ DEFAULT_STYLES = {
 class ColoredFormatter(logging.Formatter):
     """A formatter that can colour the levelname.
     It's a subclass of logging.Formatter.
+    The colored levelnames are built once in the format of each level, so the records are not changed,
+    and the time is formatted once per second.
 
     Attributes
     ----------
@@ -54,11 +56,21 @@ class ColoredFormatter(logging.Formatter):
         self.level_colored = level_colored
         self.fg_colors = fg_colors
         self.styles = styles
+        self._level_styles = {}
+        self._last_time = (None, None)  # (second, formatted time)
+        if level_colored and isinstance(self._style, logging.PercentStyle):
+            for levelname in set(fg_colors) | set(styles):
+                colored = styles.get(levelname, "") + fg_colors.get(levelname, "") + levelname + Style.RESET_ALL
+                self._level_styles[levelname] = logging.PercentStyle(self._fmt.replace('%(levelname)s', colored.replace('%', '%%')))
 
-    def format(self, record):
-        levelname = record.levelname
-        if self.level_colored:
-            style = self.styles[levelname] if levelname in self.styles else ""
-            fg_color = self.fg_colors[levelname] if levelname in self.fg_colors else ""
-            record.levelname = style + fg_color + levelname + Style.RESET_ALL
-        return logging.Formatter.format(self, record)
+    def formatTime(self, record, datefmt=None):
+        if datefmt is None:  # the default format has the milliseconds
+            return logging.Formatter.formatTime(self, record, datefmt)
+        second, formatted = self._last_time
+        if second != int(record.created):
+            second, formatted = int(record.created), logging.Formatter.formatTime(self, record, datefmt)
+            self._last_time = (second, formatted)
+        return formatted
+
+    def formatMessage(self, record):
+        return self._level_styles.get(record.levelname, self._style).format(record)
@@ -1,5 +1,7 @@
 """Class to define formaters for docstring"""
+import re
 from inspect import _empty
+from .annotations import render_annotation
 try:
 	import yaml
 	yaml_imported = True
@@ -9,7 +11,79 @@ finally:
 	import json
 
 
-class Formatter:
+class BaseFormatter:
+	"""The protocol of formatters.
+	A formatter must implement 'format_docstring'.
+	The docstrings of all symbols (FunctionToDocument and ClassToDocument) of a module are built with one call of 'format_many'.
+	By default, 'format_many' calls 'format_symbol' for each symbol, a formatter can override it
+	to render the symbols in bulk and to share a context between the symbols of a module (common descriptions of parameters...).
+
+	Public methods
+	--------------
+	format_docstring : str
+		Return the docstring with the description and fields specified.
+	format_symbol : str
+		Return the docstring of a symbol.
+	format_many : List[str]
+		Return the docstrings of a list of symbols.
+	"""
+
+	def format_docstring(self, nb_base_tab: int = 0, description: str = "{DESCRIPTION}", fields: dict = {}) -> str:
+		"""Return the docstring with the description and fields specified.
+		
+		Parameters
+		----------
+		OPTIONAL[nb_base_tab] : int
+			The number of indentation of the signature function/class
+			Default: 0
+		OPTIONAL[description] : str
+			The description of the docstring
+			Default: "{DESCRIPTION}"
+		OPTIONAL[fields] : dict
+			Fields to format. It's a dictionary with name of fields in key and in value a dictionary of items
+			Default: {}
+		
+		Returns
+		-------
+		result : str
+			The docstring created.
+		"""
+		raise NotImplementedError
+
+	def format_symbol(self, symbol) -> str:
+		"""Return the docstring of a symbol.
+		
+		Parameters
+		----------
+		symbol : Union[FunctionToDocument, ClassToDocument]
+			The symbol to document
+		
+		Returns
+		-------
+		result : str
+			The docstring created.
+		"""
+		return self.format_docstring(nb_base_tab=symbol.nb_base_tab,
+									description=symbol.description,
+									fields=symbol.get_docstring_fields())
+
+	def format_many(self, symbols: list) -> list:
+		"""Return the docstrings of a list of symbols, in the same order.
+		
+		Parameters
+		----------
+		symbols : List[Union[FunctionToDocument, ClassToDocument]]
+			All symbols to document of a module
+		
+		Returns
+		-------
+		result : List[str]
+			The docstrings created.
+		"""
+		return [self.format_symbol(symbol) for symbol in symbols]
+
+
+class Formatter(BaseFormatter):
 	"""Class to format docstrings.
 	
 	Attributes
@@ -24,11 +98,15 @@ class Formatter:
 		The prefix to add before names field.
 	suffix_field : str
 		The suffix to add after names field.
+	untyped_fields : Tuple[str]
+		The fields whose items have no type (the exceptions of 'Raises'), their items are formatted without '{type}'.
 	
 	Public methods
 	--------------
 	format_docstring : str
 		A method to format a docstring.
+	format_many : List[str]
+		A method to format the docstrings of a list of symbols.
 	from_config : Formatter
 		A static method to get a Formatter with a config file.
 	numpy_format : Formatter
@@ -43,6 +121,7 @@ class Formatter:
 	_format_items : str
 		A method to format items of a field.
 	"""
+	untyped_fields = ('Raises',)
 
 	def __init__(self, description_fmt: str = "{description}\n",
 				field_fmt: str = "{prefix}\n{name}\n{suffix}\n{items}",
@@ -55,6 +134,64 @@ class Formatter:
 		self.prefix_field = prefix_field
 		self.suffix_field = suffix_field
 
+	def _render_item(self, name: str, value: tuple, keys: tuple, items_fmt: str) -> str:
+		# format an item with the keywords 'keys' used in 'items_fmt'
+		type_, default = value
+		name = name if default is _empty else f'OPTIONAL[{name}]'
+		kwargs_format = {
+			'name': name,
+			'type': render_annotation(type_),
+			'default': f'Default: {default}' if default is not _empty else '',
+			'description': "{DESCRIPTION}"
+		}
+		return items_fmt.format(**{k: kwargs_format[k] for k in keys}).rstrip()
+
+	def _render_items(self, items: dict, cache: dict, untyped: bool = False) -> str:
+		# format items of a field, the items already formatted are in 'cache'. The items of an untyped field
+		# are formatted without the type: "{name} : {type}" -> "{name}", "{name} ({type}): " -> "{name}: "
+		fmt_key = 'untyped_items' if untyped else 'items'
+		items_fmt, keys = cache.get(fmt_key, (None, None))
+		if keys is None:
+			items_fmt = re.sub(r'[ \t]*(?::[ \t]*\{type\}|\(\{type\}\)|\{type\})', '', self.items_fmt) if untyped else self.items_fmt
+			keys = tuple(k for k in ('name', 'type', 'default', 'description') if k in items_fmt)
+			cache[fmt_key] = items_fmt, keys
+		items_string = []
+		for name, value in items.items():
+			try:
+				# the default is compared by its repr: equal defaults like (1, True) and (1, 1) are not rendered the same way
+				key = (name, value[0], repr(value[1]), untyped)
+				item = cache.get(key)
+			except TypeError:  # an unhashable annotation
+				key, item = None, None
+			if item is None:
+				item = self._render_item(name, value, keys, items_fmt)
+				if key is not None:
+					cache[key] = item
+			items_string.append(item)
+		return "\n".join(items_string) if len(items_string) > 0 else None
+
+	def _render_fields(self, fields, cache: dict) -> str:
+		# format fields (an iterable of (name, items)), the parts already formatted are in 'cache'
+		keys = cache.get('field_keys')
+		if keys is None:
+			keys = cache['field_keys'] = tuple(k for k in ('prefix', 'name', 'suffix', 'items') if k in self.field_fmt)
+		fields_string = []
+		for name, items in fields:
+			kwargs_format = {
+				'prefix': self.prefix_field*len(name),
+				'name': name,
+				'suffix': self.suffix_field*len(name),
+				'items': self._render_items(items, cache, name in self.untyped_fields)
+			}
+			fields_string.append(self.field_fmt.format(**{k: kwargs_format[k] for k in keys}))
+		return "\n".join(fields_string).strip()
+
+	def _render_docstring(self, nb_base_tab: int, description: str, fields, cache: dict) -> str:
+		# format a docstring, fields is an iterable of (name, items)
+		base_tab = '\t'*nb_base_tab
+		docstring = f"{base_tab}\"\"\"{self.description_fmt.format(description=description)}\n{self._render_fields(fields, cache)}\n\"\"\"\n"
+		return docstring.replace('\n', f'\n{base_tab}').rstrip('\t')
+
 	def _format_items(self, **items_) -> str:
 		"""Return a str with items {name: (type, value)} with the format specify by 'self.items_fmt'.
 		
@@ -69,20 +206,7 @@ class Formatter:
 		result : str
 			Items formatted.
 		"""
-		items_string = []
-		for name, value in items_.items():
-			name = name if value[1] == _empty else f'OPTIONAL[{name}]'
-			if value[0] == _empty:
-				type_ = '{TYPE}'
-			elif isinstance(value[0], type):
-				type_ = value[0].__name__
-			else:
-				type_ = str(value[0]).replace('typing.', '')
-			default=f'Default: {value[1]}' if value[1] != _empty else ''
-			kwargs_format = {'name': name, 'type': type_, 'default': default, 'description': "{DESCRIPTION}"}
-			items_string.append(self.items_fmt.format(**{k: v for k, v in kwargs_format.items() if k in self.items_fmt}).rstrip())
-
-		return f"\n".join(items_string) if len(items_string) > 0 else None
+		return self._render_items(items_, {})
 
 	def _format_fields(self, fields: dict = {}) -> str:
 		"""Return a str with fields {name: items} with the format specify by 'self.field_fmt'.
@@ -99,16 +223,7 @@ class Formatter:
 		result : str
 			Fields formatted
 		"""
-		kwargs_format = [{
-							'prefix': self.prefix_field*len(name),
-							'name': name,
-							'suffix': self.suffix_field*len(name),
-							'items': self._format_items(**items)}
-						for name, items in fields.items()]
-		fields_string = [self.field_fmt.format(**{k: v for k, v in kw.items() if k in self.field_fmt})
-						for kw in kwargs_format]
-
-		return f"\n".join(fields_string).strip()
+		return self._render_fields(fields.items(), {})
 
 	def format_docstring(self, nb_base_tab: int = 0, description: str = "{DESCRIPTION}", fields: dict = {}) -> str:
 		"""Return the docstring with the description and fields specified.
@@ -130,9 +245,30 @@ class Formatter:
 		result : str
 			The docstring created.
 		"""
-		base_tab = '\t'*nb_base_tab
-		docstring = f"{base_tab}\"\"\"{self.description_fmt.format(description=description)}\n{self._format_fields(fields)}\n\"\"\"\n"
-		return f"\n{base_tab}".join(docstring.split('\n')).rstrip('\t')
+		return self._render_docstring(nb_base_tab, description, fields.items(), {})
+
+	def format_many(self, symbols: list) -> list:
+		"""Return the docstrings of a list of symbols, in the same order.
+		The items and parts of fields shared by several symbols are formatted once.
+		
+		Parameters
+		----------
+		symbols : List[Union[FunctionToDocument, ClassToDocument]]
+			All symbols to document of a module
+		
+		Returns
+		-------
+		result : List[str]
+			The docstrings created.
+		"""
+		if type(self).format_docstring is not Formatter.format_docstring:
+			# a subclass with its own format_docstring: render each symbol with it
+			return BaseFormatter.format_many(self, symbols)
+		cache = {}
+		return [self._render_docstring(symbol.nb_base_tab, symbol.description,
+										((name, getattr(symbol, attribute)) for name, attribute in symbol.docstring_fields),
+										cache)
+				for symbol in symbols]
 
 	@staticmethod
 	def simple_format():
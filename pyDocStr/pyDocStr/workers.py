@@ -0,0 +1,302 @@
+"""A pool of worker processes to import the modules to document in isolation.
+The workers import the modules, find the functions and class to document and return only their metadata
+(names, descriptions, rendered annotations and defaults), so the imported modules never live in the main process."""
+import os
+import traceback
+import multiprocessing
+from time import monotonic
+from inspect import _empty
+from multiprocessing.connection import wait
+try:
+	import resource
+except ImportError:  # Windows
+	resource = None
+
+from .documented import FunctionToDocument, ClassToDocument
+from .utils import render_annotation, _modules_utils, _log_utils, _import_timer
+from . import _logger
+
+
+class WorkerError(Exception):
+	"""An error raised when a worker can't analyse a module (import error, timeout, memory limit...)."""
+	pass
+
+
+def _record_items(items: dict) -> list:
+	# return the items of a field without objects: [(name, rendered annotation or None, str of default or None)]
+	return [(name, None if type_ is _empty else render_annotation(type_), None if default is _empty else str(default))
+			for name, (type_, default) in items.items()]
+
+
+def _items_from_record(record: list) -> dict:
+	return {name: (_empty if type_ is None else type_, _empty if default is None else default) for name, type_, default in record}
+
+
+def _record_symbol(symbol) -> dict:
+	# return the metadata of a FunctionToDocument or a ClassToDocument
+	record = {
+		'name': symbol.name,
+		'qualname': getattr(symbol, 'qualname', symbol.name),
+		'description': symbol.description,
+		'nb_base_tab': symbol.nb_base_tab,
+		'fields': [(name, attribute, _record_items(getattr(symbol, attribute))) for name, attribute in symbol.docstring_fields],
+	}
+	if isinstance(symbol, ClassToDocument):
+		record['methods'] = [_record_symbol(method) for method in symbol.methods_to_document]
+	return record
+
+
+def _analyse_module(path: str) -> tuple:
+	# import a module and return the metadata of its functions and class to document, and the import time of modules
+	from .build_docstrings import _get_members_to_document
+	profile = _import_timer.ImportProfile()
+	with profile.recording(), _import_timer.importing(path):
+		module = _modules_utils._import_from_file(path)
+	list_func, list_class = _get_members_to_document(module)
+	return [_record_symbol(func) for func in list_func], [_record_symbol(class_) for class_ in list_class], profile.records
+
+
+def _worker_main(connection, max_memory: int, level: int):
+	# the loop of a worker: receive a path, send ('ok', (metadata, import times)) or ('error', message), stop when it receives None.
+	# the logs are sent as ('log', record) before the result
+	_log_utils.send_logs_to_connection(_logger, connection, level)
+	if max_memory is not None and resource is not None:
+		limit = max_memory * 2**20
+		resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+	while True:
+		try:
+			path = connection.recv()
+		except (EOFError, KeyboardInterrupt):
+			return
+		if path is None:
+			return
+		try:
+			result = ('ok', _analyse_module(path))
+		except MemoryError:
+			result = ('error', f"the memory limit ({max_memory} MB) was exceeded")
+		except BaseException as e:
+			_logger.debug(traceback.format_exc())
+			result = ('error', f"{type(e).__name__}: {e}")
+		try:
+			connection.send(result)
+		except Exception as e:  # the result can't be pickled
+			connection.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class RecordedFunctionToDocument(FunctionToDocument):
+	"""A function to document analysed by a worker, it's built with the metadata sent by the worker ('obj' is None).
+	The annotations are already rendered and the defaults are strings.
+	"""
+
+	def __init__(self, record: dict):
+		self.obj = None
+		self.name = record['name']
+		self.qualname = record.get('qualname', record['name'])
+		self.description = record['description']
+		self.nb_base_tab = record['nb_base_tab']
+		for name, attribute, items in record['fields']:
+			setattr(self, attribute, _items_from_record(items))
+		self.docstring_fields = tuple((name, attribute) for name, attribute, _ in record['fields'])  # the fields depend on the symbol (Yields, Raises)
+
+
+class RecordedClassToDocument(ClassToDocument):
+	"""A class to document analysed by a worker, it's built with the metadata sent by the worker ('obj' is None).
+	The annotations are already rendered and the defaults are strings.
+	"""
+
+	def __init__(self, record: dict):
+		self.obj = None
+		self.name = record['name']
+		self.qualname = record.get('qualname', record['name'])
+		self.description = record['description']
+		self.nb_base_tab = record['nb_base_tab']
+		for name, attribute, items in record['fields']:
+			setattr(self, attribute, _items_from_record(items))
+		self.docstring_fields = tuple((name, attribute) for name, attribute, _ in record['fields'])  # the fields depend on the symbol (Yields, Raises)
+		self.methods_to_document = [RecordedFunctionToDocument(method) for method in record['methods']]
+
+
+class _Worker:
+	# a worker process with the connection to send the paths and receive the results
+
+	def __init__(self, context, max_memory: int):
+		self.connection, child_connection = context.Pipe()
+		self.process = context.Process(target=_worker_main, args=(child_connection, max_memory, _logger.level), daemon=True)
+		self.process.start()
+		child_connection.close()
+		self.nb_modules = 0
+		self.path = None
+		self.deadline = None
+
+	def stop(self, kill: bool = False):
+		if not kill:
+			try:
+				self.connection.send(None)
+				self.process.join(1)
+			except (OSError, ValueError):
+				pass
+		if self.process.is_alive():
+			self.process.kill()
+			self.process.join()
+		self.connection.close()
+
+
+class ImportWorkerPool:
+	"""A pool of reusable worker processes to import the modules to document in isolation.
+	A module which takes too long to import or uses too much memory only fails this module,
+	its worker is killed and replaced. The workers are recycled after 'max_modules' modules
+	to free the memory of imported modules.
+
+	Attributes
+	----------
+	nb_workers : int
+		The number of worker processes.
+	timeout : float
+		The maximum duration of the analysis of one module, in seconds.
+	max_memory : int
+		The maximum memory (address space) of a worker, in MB. None for no limit.
+	max_modules : int
+		The number of modules analysed by a worker before it is replaced.
+
+	Public methods
+	--------------
+	analyse : Tuple[List[RecordedFunctionToDocument], List[RecordedClassToDocument]]
+		Import a module in a worker and return the functions and class to document.
+	analyse_many : Iterator[Tuple[str, Union[tuple, WorkerError]]]
+		Import modules in parallel and yield the result of each module.
+	close : None
+		Stop all workers.
+	"""
+
+	def __init__(self, nb_workers: int = None, timeout: float = 60., max_memory: int = None, max_modules: int = 100):
+		self.nb_workers = nb_workers if nb_workers is not None else os.cpu_count() or 1
+		self.timeout = timeout
+		self.max_memory = max_memory
+		self.max_modules = max_modules
+		# 'spawn': the workers don't inherit the modules imported in the main process
+		self._context = multiprocessing.get_context('spawn')
+		self._workers = []
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, tb):
+		self.close()
+
+	def _get_idle_worker(self) -> _Worker:
+		# return an idle worker, a new worker is started if needed (the recycled workers are replaced)
+		for worker in list(self._workers):
+			if worker.path is None and worker.nb_modules >= self.max_modules:
+				worker.stop()
+				self._workers.remove(worker)
+		for worker in self._workers:
+			if worker.path is None:
+				return worker
+		worker = _Worker(self._context, self.max_memory)
+		self._workers.append(worker)
+		return worker
+
+	def _submit(self, path: str):
+		worker = self._get_idle_worker()
+		worker.connection.send(path)
+		worker.path = path
+		worker.deadline = monotonic() + self.timeout if self.timeout is not None else None
+		worker.nb_modules += 1
+
+	def _collect(self, worker: _Worker, killed: str = None):
+		# return the path and the result of a worker, the worker is replaced if it was killed or if it crashed.
+		# None is returned if the worker only sent a log record (the record is passed to the logger of main process)
+		if killed is None:
+			try:
+				status, result = worker.connection.recv()
+			except (EOFError, OSError):
+				status, result = 'error', "the worker stopped unexpectedly (memory limit exceeded or crash)"
+				killed = result
+			if status == 'log':
+				_logger.handle(result)
+				return None
+		else:
+			status, result = 'error', killed
+		path, worker.path = worker.path, None
+		if killed is not None:
+			worker.stop(kill=True)
+			self._workers.remove(worker)
+		if status == 'ok':
+			list_func, list_class, imports = result
+			_import_timer.add_records(imports)  # added to the profile of the run
+			return path, ([RecordedFunctionToDocument(record) for record in list_func], [RecordedClassToDocument(record) for record in list_class])
+		return path, WorkerError(f"The module '{path}' can't be analysed: {result}")
+
+	def analyse_many(self, paths: list):
+		"""Import modules in parallel and yield the result of each module, in the order of completion.
+
+		Parameters
+		----------
+		paths : List[str]
+			The paths of python files to analyse
+
+		Returns
+		-------
+		results : Iterator[Tuple[str, Union[tuple, WorkerError]]]
+			The absolute path of each module with the lists of functions and class to document (list_func, list_class)
+			or the WorkerError if the module can't be analysed.
+		"""
+		pending = [os.path.abspath(path) for path in reversed(paths)]
+		running = []
+		try:
+			while pending or running:
+				while pending and len(running) < self.nb_workers:
+					self._submit(pending.pop())
+					running = [worker for worker in self._workers if worker.path is not None]
+				deadlines = [worker.deadline for worker in running if worker.deadline is not None]
+				ready = wait([worker.connection for worker in running],
+							timeout=max(0., min(deadlines) - monotonic()) if deadlines else None)
+				for worker in list(running):
+					if worker.connection in ready:
+						collected = self._collect(worker)
+						if collected is not None:
+							yield collected
+					elif worker.deadline is not None and monotonic() >= worker.deadline:
+						yield self._collect(worker, killed=f"the timeout ({self.timeout} s) was exceeded")
+				running = [worker for worker in self._workers if worker.path is not None]
+		finally:
+			# the iteration was stopped by the caller: the busy workers are replaced, their results would be sent to the next analysis
+			for worker in [worker for worker in self._workers if worker.path is not None]:
+				self._collect(worker, killed="the analysis was stopped")
+
+	def analyse(self, path: str) -> tuple:
+		"""Import a module in a worker and return the functions and class to document.
+
+		Parameters
+		----------
+		path : str
+			The path of python file to analyse
+
+		Returns
+		-------
+		list_func : List[RecordedFunctionToDocument]
+			The functions to document
+		list_class : List[RecordedClassToDocument]
+			The class to document
+
+		Raises
+		------
+		WorkerError
+			If the module can't be imported in the time or memory limits.
+		"""
+		for _, result in self.analyse_many([path]):
+			if isinstance(result, WorkerError):
+				raise result
+			return result
+
+	def close(self):
+		"""Stop all workers.
+
+		Returns
+		-------
+		None
+		"""
+		for worker in self._workers:
+			worker.stop(kill=worker.path is not None)
+		self._workers = []
+
@@ -0,0 +1,80 @@
+"""Tests of the command line: python -m pyDocStr is run on a small package with a pyproject.toml."""
+import os
+import sys
+import subprocess
+
+import pytest
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # the folder where 'python -m pyDocStr' is run
+
+MODULE = '''from pyDocStr import to_document
+
+
+@to_document(description="Add two numbers")
+def addition(a: int, b: int = 1) -> int:
+	return a + b
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+	# a project with a package 'pkg' (a module and a subpackage) and the settings of [tool.pydocstr]
+	for folder in ('pkg', os.path.join('pkg', 'sub')):
+		os.makedirs(tmp_path / folder)
+		(tmp_path / folder / '__init__.py').write_text('')
+		(tmp_path / folder / 'module.py').write_text(MODULE)
+	(tmp_path / 'pyproject.toml').write_text('[tool.pydocstr]\nformatter = "numpy"\n')
+	return tmp_path
+
+
+def run_cli(*args) -> subprocess.CompletedProcess:
+	return subprocess.run([sys.executable, '-m', 'pyDocStr', *args], cwd=ROOT_PATH, capture_output=True, text=True)
+
+
+@pytest.mark.parametrize('option, value, expected', [
+	('--include', 'sub/*.py', ['sub/module.py']),
+	('--exclude', 'sub', ['module.py']),
+])
+def test_append_option(project, option, value, expected):
+	result = run_cli(str(project / 'pkg'), '--static', '--check', option, value, '--level-logger', 'error')
+	assert 'Traceback' not in result.stderr, result.stderr
+	assert result.returncode == 1  # --check: some files would be documented
+	assert sorted(line.split()[-1] for line in result.stdout.splitlines() if line.startswith('would document')) == expected
+
+
+def test_also_output_option(project):
+	result = run_cli('-p', str(project / 'pkg'), '--static', '--formatter', 'simple', '-o', str(project / 'simple'),
+					'--also-output', 'numpy', str(project / 'numpy'), '--level-logger', 'error')
+	assert result.returncode == 0, result.stderr
+	assert '----------' not in (project / 'simple' / 'module.py').read_text()
+	assert '----------' in (project / 'numpy' / 'module.py').read_text()
+
+
+@pytest.mark.parametrize('option, value, expected', [
+	('--include', 'sub/*.py', "1 decorators 'to_document' in 1/2 python files"),
+	('--exclude', 'sub', "1 decorators 'to_document' in 1/2 python files"),
+])
+def test_stats_append_option(project, option, value, expected):
+	result = run_cli('stats', str(project / 'pkg'), option, value)
+	assert result.returncode == 0, result.stderr
+	assert expected in result.stdout
+
+
+@pytest.mark.parametrize('formatter, numpy', [(None, True), ('simple', False)])
+def test_explicit_option_wins_over_project(project, formatter, numpy):
+	args = ['--formatter', formatter] if formatter is not None else []
+	result = run_cli('-p', str(project / 'pkg'), '--static', '-o', str(project / 'out'), '--level-logger', 'error', *args)
+	assert result.returncode == 0, result.stderr
+	assert ('----------' in (project / 'out' / 'module.py').read_text()) is numpy
+
+
+def test_patch_sink_keeps_bytes(project):
+	# the patch of a file with '\r\n' and of a file in latin-1 has the bytes of files, so it applies to them
+	(project / 'pkg' / 'module.py').write_bytes(MODULE.replace('\n', '\r\n').encode('utf-8'))
+	(project / 'pkg' / 'sub' / 'module.py').write_bytes(('# -*- coding: latin-1 -*-\n' + MODULE.replace('\n@', '\n# é\n@')).encode('latin-1'))
+	result = run_cli(str(project / 'pkg'), '--static', '--sink', str(project / 'docs.patch'), '--level-logger', 'error')
+	assert result.returncode == 0, result.stderr
+	patch = (project / 'docs.patch').read_bytes()
+	assert b' from pyDocStr import to_document\r\n' in patch
+	assert b'+\t"""Add two numbers\r\n' in patch
+	assert ' # é\n'.encode('latin-1') in patch